@@ -3,23 +3,59 @@
 from __future__ import annotations
 
 import logging
+import time
+
+import voluptuous as vol
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
-from homeassistant.core import HomeAssistant
-
-from .const import DOMAIN, CONF_CREATE_DASHBOARD, DASHBOARD_VIEW_CONFIG
-from .coordinator import WeiderWT16DataUpdateCoordinator
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import device_registry as dr, entity_registry as er
+from homeassistant.helpers.storage import Store
+
+from .const import (
+    DOMAIN,
+    CONF_CREATE_DASHBOARD,
+    SERVICE_PROFILE,
+    SERVICE_HISTORY,
+    SERVICE_DISCOVER,
+    CONF_UNSUPPORTED_REGISTERS,
+    ATTR_POLLS,
+    ATTR_KEY,
+    ATTR_HOURS,
+    ATTR_BUCKETS,
+    DEFAULT_PROFILE_POLLS,
+    LEGACY_DEVICE_IDENTIFIER,
+    LEGACY_UNIQUE_ID_PREFIX,
+)
+from .coordinator import WeiderWT16DataUpdateCoordinator, metrics_storage_key, snapshot_storage_key
+from .history import HISTORY_KEYS
 
 _LOGGER = logging.getLogger(__name__)
 
 PLATFORMS: list[Platform] = [Platform.SENSOR, Platform.BINARY_SENSOR, Platform.CLIMATE]
 
+PROFILE_SCHEMA = vol.Schema({vol.Optional(ATTR_POLLS, default=DEFAULT_PROFILE_POLLS): vol.All(vol.Coerce(int), vol.Range(min=1, max=100))})
+
+HISTORY_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_KEY): vol.In(HISTORY_KEYS),
+        vol.Optional(ATTR_HOURS, default=24): vol.All(vol.Coerce(float), vol.Range(min=0.1, max=168)),
+        vol.Optional(ATTR_BUCKETS, default=0): vol.All(vol.Coerce(int), vol.Range(min=0, max=2000)),
+    }
+)
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Weider WT16 from a config entry."""
     coordinator = WeiderWT16DataUpdateCoordinator(hass, entry)
-    await coordinator.async_config_entry_first_refresh()
+    await coordinator.async_load_metrics()
+    if await coordinator.async_restore_snapshot():
+        # Entities start from the stale snapshot, so a slow or offline heat pump does not hold up setup
+        entry.async_create_background_task(hass, coordinator.async_refresh(), f"{DOMAIN} first refresh {entry.entry_id}")
+    else:
+        await coordinator.async_config_entry_first_refresh()
 
     hass.data.setdefault(DOMAIN, {})[entry.entry_id] = coordinator
 
@@ -30,151 +66,118 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     # Create dashboard if requested
     if entry.data.get(CONF_CREATE_DASHBOARD, False):
-        await _create_dashboard(hass)
-
-    return True
-
-
-async def async_update_options(hass: HomeAssistant, entry: ConfigEntry) -> None:
-    """Update options for the config entry."""
-    coordinator = hass.data[DOMAIN][entry.entry_id]
-
-    # Update coordinator configuration
-    await coordinator.async_update_config(entry)
-
-    # Force a refresh with new settings
-    await coordinator.async_request_refresh()
+        # Imported and run outside setup, the lovelace helpers are not needed to poll the heat pump
+        from .dashboard import async_create_dashboard  # pylint: disable=import-outside-toplevel
 
+        entry.async_create_background_task(hass, async_create_dashboard(hass), f"{DOMAIN} dashboard {entry.entry_id}")
 
-async def _create_dashboard(hass: HomeAssistant) -> None:
-    """Automatically add the Weider WT16 view to the main dashboard."""
-    try:
-        lovelace = await _get_lovelace_system(hass)
-        if not lovelace:
-            return
+    if not hass.services.has_service(DOMAIN, SERVICE_PROFILE):
+        hass.services.async_register(DOMAIN, SERVICE_PROFILE, _async_handle_profile, schema=PROFILE_SCHEMA, supports_response=SupportsResponse.OPTIONAL)
+    if not hass.services.has_service(DOMAIN, SERVICE_HISTORY):
+        hass.services.async_register(DOMAIN, SERVICE_HISTORY, _async_handle_history, schema=HISTORY_SCHEMA, supports_response=SupportsResponse.ONLY)
+    if not hass.services.has_service(DOMAIN, SERVICE_DISCOVER):
+        hass.services.async_register(DOMAIN, SERVICE_DISCOVER, _async_handle_discover, supports_response=SupportsResponse.OPTIONAL)
 
-        dashboard_config, dashboard_id, dashboards = await _get_dashboard_config(lovelace)
-        if not dashboard_config:
-            await _create_dashboard_file_fallback(hass)
-            return
-
-        await _add_view_to_dashboard(hass, dashboard_config, dashboard_id, dashboards)
-
-    except Exception as err:
-        _LOGGER.error("Failed to automatically add dashboard view: %s", err)
-        await _create_dashboard_file_fallback(hass)
-
-
-async def _get_lovelace_system(hass: HomeAssistant):
-    """Get and validate the lovelace dashboard system."""
-    from homeassistant.components.lovelace import dashboard
-
-    lovelace = hass.data.get("lovelace")
-    if not lovelace:
-        _LOGGER.warning("Lovelace not found. Cannot automatically add view.")
-        await _create_dashboard_file_fallback(hass)
-        return None
-
-    dashboard_mode = getattr(lovelace, "mode", "yaml")
-    if dashboard_mode == "yaml":
-        _LOGGER.warning("Dashboard is in YAML mode. Cannot automatically add view.")
-        await _create_dashboard_file_fallback(hass)
-        return None
+    return True
 
-    return lovelace
 
+async def _async_handle_profile(call: ServiceCall) -> ServiceResponse:
+    """Profile the next polls of every configured heat pump."""
+    reports = [str(coordinator.async_start_profile(call.data[ATTR_POLLS])) for coordinator in call.hass.data.get(DOMAIN, {}).values()]
+    return {"reports": reports}
 
-async def _get_dashboard_config(lovelace):
-    """Get the dashboard configuration to modify."""
-    dashboards = getattr(lovelace, "dashboards", {})
-    dashboard_id = None
-    dashboard_config = None
 
-    # Try to find the overview dashboard
-    for dash_id, dash_obj in dashboards.items():
-        if dash_id == "overview" or getattr(dash_obj, "url_path", None) == "overview":
-            dashboard_id = dash_id
-            dashboard_config = await dash_obj.async_load(False)
-            break
+async def _async_handle_history(call: ServiceCall) -> ServiceResponse:
+    """Return the recent values of a key from the in-memory history of every heat pump."""
+    key, buckets = call.data[ATTR_KEY], call.data[ATTR_BUCKETS]
+    end = time.time()
+    start = end - call.data[ATTR_HOURS] * 3600
 
-    # Fallback: try to get any dashboard
-    if not dashboard_config:
-        dashboard_items = list(dashboards.items())
-        if dashboard_items:
-            dashboard_id, dash_obj = dashboard_items[0]
-            dashboard_config = await dash_obj.async_load(False)
+    entries = {}
+    for entry_id, coordinator in call.hass.data.get(DOMAIN, {}).items():
+        if buckets:
+            entries[entry_id] = coordinator.history.downsample(key, start, end, buckets)
+        else:
+            entries[entry_id] = [{"time": timestamp, "value": value} for timestamp, value in coordinator.history.range(key, start, end)]
+    return {"key": key, "entries": entries}
 
-    if not dashboard_config:
-        _LOGGER.warning("No dashboard found to add view to.")
 
-    return dashboard_config, dashboard_id, dashboards
+async def _async_handle_discover(call: ServiceCall) -> ServiceResponse:
+    """Scan the registers every heat pump answers and reload the entries whose capabilities changed."""
+    hass = call.hass
+    entries = {}
+    for entry_id, coordinator in list(hass.data.get(DOMAIN, {}).items()):
+        try:
+            unsupported = await coordinator.async_discover()
+        except Exception as err:
+            raise HomeAssistantError(f"Register discovery failed: {err}") from err
+        entries[entry_id] = unsupported
 
+        entry = hass.config_entries.async_get_entry(entry_id)
+        if entry is not None and entry.data.get(CONF_UNSUPPORTED_REGISTERS) != unsupported:
+            _LOGGER.info("Unit %s rejects %d registers: %s", entry.title, len(unsupported), ", ".join(unsupported) or "none")
+            hass.config_entries.async_update_entry(entry, data={**entry.data, CONF_UNSUPPORTED_REGISTERS: unsupported})
+            # The read plan and the entities are built from the capabilities at setup
+            hass.config_entries.async_schedule_reload(entry_id)
+    return {"unsupported": entries}
 
-async def _add_view_to_dashboard(hass: HomeAssistant, dashboard_config: dict, dashboard_id: str, dashboards: dict):
-    """Add our view to the dashboard if it doesn't exist."""
-    if "views" not in dashboard_config:
-        dashboard_config["views"] = []
 
-    # Check if our view already exists
-    view_exists = any(view.get("path") == "warmepumpe" for view in dashboard_config["views"])
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Delete the stored energy accumulators and snapshot of a removed entry."""
+    await Store(hass, 1, metrics_storage_key(entry.entry_id)).async_remove()
+    await Store(hass, 1, snapshot_storage_key(entry.entry_id)).async_remove()
 
-    if not view_exists:
-        dashboard_config["views"].append(DASHBOARD_VIEW_CONFIG)
 
-        # Save the updated dashboard
-        dash_obj = dashboards[dashboard_id]
-        await dash_obj.async_save(dashboard_config)
+async def async_migrate_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+    """Migrate the global unique IDs and device of older entries to per-unit ones."""
+    if entry.version < 4:
+        prefix = entry.unique_id or entry.entry_id
 
-        _LOGGER.info("Successfully added 'Wärmepumpe' view to dashboard")
+        @callback
+        def _migrate_unique_id(entity_entry: er.RegistryEntry) -> dict[str, str] | None:
+            """Replace the global prefix of an entity unique ID."""
+            if not entity_entry.unique_id.startswith(LEGACY_UNIQUE_ID_PREFIX):
+                return None
+            return {"new_unique_id": f"{prefix}_{entity_entry.unique_id.removeprefix(LEGACY_UNIQUE_ID_PREFIX)}"}
 
-        # Create success notification
-        await _create_success_notification(hass)
-    else:
-        _LOGGER.info("Wärmepumpe view already exists in dashboard")
+        await er.async_migrate_entries(hass, entry.entry_id, _migrate_unique_id)
 
+        device_registry = dr.async_get(hass)
+        if device := device_registry.async_get_device(identifiers={(DOMAIN, LEGACY_DEVICE_IDENTIFIER)}):
+            device_registry.async_update_device(device.id, new_identifiers={(DOMAIN, prefix)})
 
-async def _create_success_notification(hass: HomeAssistant):
-    """Create a success notification for dashboard creation."""
-    await hass.services.async_call(
-        "persistent_notification",
-        "create",
-        {
-            "title": "Weider WT16 Dashboard Added",
-            "message": "The 'Wärmepumpe' tab has been automatically added to your dashboard!",
-            "notification_id": "weider_wt16_success",
-        },
-    )
+        hass.config_entries.async_update_entry(entry, version=4)
+        _LOGGER.info("Migrated Weider WT16 entry %s to per-unit unique IDs", entry.title)
 
+    return True
 
-async def _create_dashboard_file_fallback(hass: HomeAssistant) -> None:
-    """Fallback: Create dashboard file when automatic addition fails."""
-    try:
-        import os
-        import yaml
 
-        config_dir = hass.config.config_dir
-        view_file = os.path.join(config_dir, "weider_wt16_view.yaml")
+async def async_update_options(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Update options for the config entry."""
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    had_power_sensor = coordinator.has_power_sensor
 
-        with open(view_file, "w", encoding="utf-8") as file:
-            yaml.dump(DASHBOARD_VIEW_CONFIG, file, default_flow_style=False, allow_unicode=True)
+    # Update coordinator configuration
+    await coordinator.async_update_config(entry)
 
-        await hass.services.async_call(
-            "persistent_notification",
-            "create",
-            {
-                "title": "Weider WT16 Dashboard View Ready",
-                "message": f"Could not automatically add view. Configuration saved to {view_file}. Add manually: Edit Dashboard → Add View → Show code editor → Copy content from the file.",
-                "notification_id": "weider_wt16_manual",
-            },
-        )
+    if coordinator.has_power_sensor != had_power_sensor:
+        # The COP sensors are only created with a power sensor configured
+        hass.config_entries.async_schedule_reload(entry.entry_id)
+        return
 
-    except Exception as err:
-        _LOGGER.error("Failed to create fallback dashboard file: %s", err)
+    # Force a refresh with new settings
+    await coordinator.async_request_refresh()
 
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
-        hass.data[DOMAIN].pop(entry.entry_id)
+        coordinator = hass.data[DOMAIN].pop(entry.entry_id)
+        await coordinator.async_close()
+
+        if not hass.data[DOMAIN]:
+            hass.services.async_remove(DOMAIN, SERVICE_PROFILE)
+            hass.services.async_remove(DOMAIN, SERVICE_HISTORY)
+            hass.services.async_remove(DOMAIN, SERVICE_DISCOVER)
 
     return unload_ok
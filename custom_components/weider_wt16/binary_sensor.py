@@ -7,11 +7,13 @@ from homeassistant.components.binary_sensor import (
     BinarySensorEntity,
 )
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.util import slugify
 
-from .const import DOMAIN, DEVICE_INFO
+from .const import DOMAIN
 from .coordinator import WeiderWT16DataUpdateCoordinator
 
 
@@ -38,7 +40,8 @@ async def async_setup_entry(
         WeiderWT16BinarySensor(coordinator, "sgready_2", "SGready 2", None),
     ]
 
-    async_add_entities(entities)
+    # Only registers the unit answered in the discovery scan
+    async_add_entities(coordinator.async_supported(Platform.BINARY_SENSOR, entities, lambda entity: (entity._data_key,)))  # pylint: disable=protected-access
 
 
 class WeiderWT16BinarySensor(CoordinatorEntity, BinarySensorEntity):
@@ -52,13 +55,13 @@ class WeiderWT16BinarySensor(CoordinatorEntity, BinarySensorEntity):
         device_class: BinarySensorDeviceClass | None,
     ) -> None:
         """Initialize the binary sensor."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, context=data_key)
         self._data_key = data_key
         self._attr_name = name
         self._attr_device_class = device_class
-        self._attr_unique_id = f"weider_wt16_{data_key}"
-        self._attr_entity_id = f"binary_sensor.{data_key}"
-        self._attr_device_info = DEVICE_INFO
+        self._attr_unique_id = coordinator.unique_id(data_key)
+        self.entity_id = f"binary_sensor.{coordinator.object_id(slugify(name))}"
+        self._attr_device_info = coordinator.device_info
 
     @property
     def is_on(self) -> bool | None:
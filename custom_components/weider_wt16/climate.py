@@ -8,12 +8,14 @@ from homeassistant.components.climate import (
     HVACMode,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import UnitOfTemperature
+from homeassistant.const import Platform, UnitOfTemperature
 from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.util import slugify
 
-from .const import DOMAIN, DEVICE_INFO
+from .const import DOMAIN
 from .coordinator import WeiderWT16DataUpdateCoordinator
 
 
@@ -32,7 +34,8 @@ async def async_setup_entry(
         WeiderWT16Climate(coordinator, "raum_soll_temperatur", "Raum Soll-Temperatur", "raum_ist_temperatur", "raum_soll_temperatur", 723, 5, 35, 0.5),
     ]
 
-    async_add_entities(entities)
+    # A setpoint the unit does not answer cannot be controlled
+    async_add_entities(coordinator.async_supported(Platform.CLIMATE, entities, lambda entity: (entity._temp_setpoint_key,)))  # pylint: disable=protected-access
 
 
 class WeiderWT16Climate(CoordinatorEntity, ClimateEntity):
@@ -51,15 +54,15 @@ class WeiderWT16Climate(CoordinatorEntity, ClimateEntity):
         temp_step: float,
     ) -> None:
         """Initialize the climate entity."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, context=(temp_sensor_key, temp_setpoint_key))
         self._entity_type = entity_type
         self._temp_sensor_key = temp_sensor_key
         self._temp_setpoint_key = temp_setpoint_key
         self._setpoint_register = setpoint_register
         self._attr_name = name
-        self._attr_unique_id = f"weider_wt16_climate_{entity_type}"
-        self._attr_entity_id = f"climate.{entity_type}"
-        self._attr_device_info = DEVICE_INFO
+        self._attr_unique_id = coordinator.unique_id(f"climate_{entity_type}")
+        self.entity_id = f"climate.{coordinator.object_id(slugify(name))}"
+        self._attr_device_info = coordinator.device_info
         self._attr_temperature_unit = UnitOfTemperature.CELSIUS
         self._attr_min_temp = min_temp
         self._attr_max_temp = max_temp
@@ -88,5 +91,6 @@ class WeiderWT16Climate(CoordinatorEntity, ClimateEntity):
             temp = kwargs["temperature"]
             # Convert to register value (multiply by 10 for 0.1 scale)
             register_value = int(temp * 10)
-            await self.coordinator.async_write_register(self._setpoint_register, register_value)
-            await self.coordinator.async_request_refresh()
+            # The coordinator shows the new setpoint right away and confirms it by read-back
+            if not await self.coordinator.async_write_register(self._setpoint_register, register_value):
+                raise HomeAssistantError(f"Failed to set {self.name} to {temp}")
@@ -2,28 +2,56 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
 from typing import Any
 
 import socket
 import voluptuous as vol
-from pymodbus.client import ModbusTcpClient
-from pymodbus.exceptions import ModbusException
 
 from homeassistant import config_entries
 from homeassistant.const import CONF_HOST, CONF_PORT
 from homeassistant.data_entry_flow import FlowResult
 import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers.importlib import async_import_module
+from homeassistant.helpers import selector
 
 from .const import (
     DOMAIN,
     CONF_SCAN_INTERVAL,
     CONF_CREATE_DASHBOARD,
     CONF_ERROR_TIMEOUT,
+    CONF_MAX_READ_GAP,
+    CONF_FAST_SCAN_INTERVAL,
+    CONF_SLOW_SCAN_INTERVAL,
+    CONF_MIN_SCAN_INTERVAL,
+    CONF_MAX_SCAN_INTERVAL,
+    CONF_POLL_DEADLINE,
+    CONF_SLAVE_ID,
+    CONF_PIPELINE_WINDOW,
+    CONF_POWER_SENSOR,
+    CONF_DEADBANDS,
+    CONF_LONG_TERM_STATISTICS,
+    CONF_UNSUPPORTED_REGISTERS,
+    CONF_MAX_STATE_INTERVAL,
     DEFAULT_PORT,
     DEFAULT_SCAN_INTERVAL,
     DEFAULT_ERROR_TIMEOUT,
+    DEFAULT_MAX_READ_GAP,
+    DEFAULT_FAST_SCAN_INTERVAL,
+    DEFAULT_SLOW_SCAN_INTERVAL,
+    DEFAULT_MIN_SCAN_INTERVAL,
+    DEFAULT_MAX_SCAN_INTERVAL,
+    DEFAULT_POLL_DEADLINE,
+    DEFAULT_SLAVE_ID,
+    DEFAULT_PIPELINE_WINDOW,
+    DEFAULT_DEADBANDS,
+    DEFAULT_LONG_TERM_STATISTICS,
+    DISCOVERY_TIMEOUT,
+    DEFAULT_MAX_STATE_INTERVAL,
 )
+from .deadband import parse_deadbands
+from .discovery import async_discover_unsupported
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -31,7 +59,7 @@ _LOGGER = logging.getLogger(__name__)
 class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle a config flow for Weider WT16 Heat Pump."""
 
-    VERSION = 3
+    VERSION = 4
 
     @staticmethod
     def async_get_options_flow(config_entry):
@@ -46,6 +74,8 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             connection_result = await self._test_user_connection(user_input)
             if connection_result == "success":
                 self._connection_data = user_input
+                if (unsupported := await self._discover_capabilities(user_input)) is not None:
+                    self._connection_data = {**user_input, CONF_UNSUPPORTED_REGISTERS: unsupported}
                 return await self.async_step_dashboard()
             errors["base"] = connection_result
 
@@ -59,7 +89,7 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         """Test connection with user input."""
         host = user_input[CONF_HOST]
         port = user_input.get(CONF_PORT, DEFAULT_PORT)
-        modbus_addr = 1  # Hardcoded to 1
+        modbus_addr = user_input.get(CONF_SLAVE_ID, DEFAULT_SLAVE_ID)
 
         try:
             return await self._test_connection(host, port, modbus_addr)
@@ -67,12 +97,32 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             _LOGGER.exception("Unexpected exception during connection test: %s", err)
             return "unknown"
 
+    async def _discover_capabilities(self, user_input: dict[str, Any]) -> list[str] | None:
+        """Scan which registers the unit answers, return None if the scan fails so all registers are polled."""
+        host = user_input[CONF_HOST]
+        port = user_input.get(CONF_PORT, DEFAULT_PORT)
+        modbus_addr = user_input.get(CONF_SLAVE_ID, DEFAULT_SLAVE_ID)
+
+        client_module = await async_import_module(self.hass, "pymodbus.client")
+        client = client_module.AsyncModbusTcpClient(host, port=port, timeout=5, retries=0, reconnect_delay=0)
+        try:
+            async with asyncio.timeout(DISCOVERY_TIMEOUT):
+                if not await client.connect():
+                    return None
+                return await async_discover_unsupported(client, modbus_addr, DEFAULT_MAX_READ_GAP)
+        except Exception as err:  # pylint: disable=broad-except
+            _LOGGER.warning("Register discovery failed, all registers will be polled: %s", err)
+            return None
+        finally:
+            client.close()
+
     def _get_user_schema(self) -> vol.Schema:
         """Get the user input schema."""
         return vol.Schema(
             {
                 vol.Required(CONF_HOST): str,
                 vol.Optional(CONF_PORT, default=DEFAULT_PORT): cv.port,
+                vol.Optional(CONF_SLAVE_ID, default=DEFAULT_SLAVE_ID): vol.All(vol.Coerce(int), vol.Range(min=1, max=247)),
                 vol.Optional(CONF_SCAN_INTERVAL, default=DEFAULT_SCAN_INTERVAL): vol.All(vol.Coerce(int), vol.Range(min=15, max=300)),
                 vol.Optional(CONF_ERROR_TIMEOUT, default=DEFAULT_ERROR_TIMEOUT): vol.All(vol.Coerce(int), vol.Range(min=60, max=600)),
             }
@@ -86,13 +136,13 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
             host = final_data[CONF_HOST]
             port = final_data[CONF_PORT]
-            modbus_addr = 1  # Hardcoded to 1
+            modbus_addr = final_data.get(CONF_SLAVE_ID, DEFAULT_SLAVE_ID)
 
             await self.async_set_unique_id(f"{host}_{port}_{modbus_addr}")
             self._abort_if_unique_id_configured()
 
             return self.async_create_entry(
-                title=f"Weider WT16 ({host})",
+                title=f"Weider WT16 ({host})" if modbus_addr == DEFAULT_SLAVE_ID else f"Weider WT16 ({host}, {modbus_addr})",
                 data=final_data,
             )
 
@@ -113,34 +163,39 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
     async def _test_connection(self, host: str, port: int, modbus_addr: int) -> str:
         """Test if we can connect to the device."""
-
-        def test_sync():
-            try:
-                client = ModbusTcpClient(host=host, port=port, timeout=5)
-                if not client.connect():
+        # Imported in the executor, loading the flow at startup does not need pymodbus
+        client_module = await async_import_module(self.hass, "pymodbus.client")
+        exceptions_module = await async_import_module(self.hass, "pymodbus.exceptions")
+        client = client_module.AsyncModbusTcpClient(host, port=port, timeout=5, retries=0, reconnect_delay=0)
+        try:
+            async with asyncio.timeout(10):
+                if not await client.connect():
                     return "cannot_connect"
 
                 # Simple register read test
-                result = client.read_input_registers(address=12, count=1)
-                client.close()
-
-                if hasattr(result, "isError") and result.isError():
-                    return "modbus_error"
-                elif hasattr(result, "registers"):
-                    return "success"
-                else:
-                    return "modbus_error"
-
-            except ConnectionRefusedError:
-                return "connection_refused"
-            except OSError as err:
-                if "timed out" in str(err).lower():
-                    return "timeout"
-                return "network_error"
-            except Exception:
-                return "unknown"
-
-        return await self.hass.async_add_executor_job(test_sync)
+                result = await client.read_input_registers(address=12, count=1, device_id=modbus_addr)
+
+            if hasattr(result, "isError") and result.isError():
+                return "modbus_error"
+            elif hasattr(result, "registers"):
+                return "success"
+            else:
+                return "modbus_error"
+
+        except ConnectionRefusedError:
+            return "connection_refused"
+        except TimeoutError:
+            return "timeout"
+        except exceptions_module.ModbusException:
+            return "modbus_error"
+        except OSError as err:
+            if "timed out" in str(err).lower():
+                return "timeout"
+            return "network_error"
+        except Exception:
+            return "unknown"
+        finally:
+            client.close()
 
 
 class OptionsFlowHandler(config_entries.OptionsFlow):
@@ -148,12 +203,29 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
 
     async def async_step_init(self, user_input: dict[str, Any] | None = None) -> FlowResult:
         """Manage the options."""
+        errors: dict[str, str] = {}
         if user_input is not None:
-            return self.async_create_entry(title="", data=user_input)
+            try:
+                parse_deadbands(user_input.get(CONF_DEADBANDS, DEFAULT_DEADBANDS))
+            except ValueError:
+                errors[CONF_DEADBANDS] = "invalid_deadbands"
+            else:
+                return self.async_create_entry(title="", data=user_input)
 
         # Get current values from config entry
         current_scan_interval = self.config_entry.data.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
         current_error_timeout = self.config_entry.data.get(CONF_ERROR_TIMEOUT, DEFAULT_ERROR_TIMEOUT)
+        current_max_read_gap = self.config_entry.options.get(CONF_MAX_READ_GAP, self.config_entry.data.get(CONF_MAX_READ_GAP, DEFAULT_MAX_READ_GAP))
+        current_fast_scan_interval = self.config_entry.options.get(CONF_FAST_SCAN_INTERVAL, DEFAULT_FAST_SCAN_INTERVAL)
+        current_slow_scan_interval = self.config_entry.options.get(CONF_SLOW_SCAN_INTERVAL, DEFAULT_SLOW_SCAN_INTERVAL)
+        current_min_scan_interval = self.config_entry.options.get(CONF_MIN_SCAN_INTERVAL, DEFAULT_MIN_SCAN_INTERVAL)
+        current_max_scan_interval = self.config_entry.options.get(CONF_MAX_SCAN_INTERVAL, DEFAULT_MAX_SCAN_INTERVAL)
+        current_poll_deadline = self.config_entry.options.get(CONF_POLL_DEADLINE, DEFAULT_POLL_DEADLINE)
+        current_pipeline_window = self.config_entry.options.get(CONF_PIPELINE_WINDOW, DEFAULT_PIPELINE_WINDOW)
+        current_power_sensor = self.config_entry.options.get(CONF_POWER_SENSOR)
+        current_max_state_interval = self.config_entry.options.get(CONF_MAX_STATE_INTERVAL, DEFAULT_MAX_STATE_INTERVAL)
+        current_deadbands = self.config_entry.options.get(CONF_DEADBANDS, DEFAULT_DEADBANDS)
+        current_long_term_statistics = self.config_entry.options.get(CONF_LONG_TERM_STATISTICS, DEFAULT_LONG_TERM_STATISTICS)
 
         return self.async_show_form(
             step_id="init",
@@ -161,7 +233,20 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
                 {
                     vol.Optional(CONF_SCAN_INTERVAL, default=current_scan_interval): vol.All(vol.Coerce(int), vol.Range(min=10, max=300)),
                     vol.Optional(CONF_ERROR_TIMEOUT, default=current_error_timeout): vol.All(vol.Coerce(int), vol.Range(min=60, max=3600)),
+                    vol.Optional(CONF_FAST_SCAN_INTERVAL, default=current_fast_scan_interval): vol.All(vol.Coerce(int), vol.Range(min=5, max=300)),
+                    vol.Optional(CONF_SLOW_SCAN_INTERVAL, default=current_slow_scan_interval): vol.All(vol.Coerce(int), vol.Range(min=60, max=3600)),
+                    vol.Optional(CONF_MIN_SCAN_INTERVAL, default=current_min_scan_interval): vol.All(vol.Coerce(int), vol.Range(min=5, max=300)),
+                    vol.Optional(CONF_MAX_SCAN_INTERVAL, default=current_max_scan_interval): vol.All(vol.Coerce(int), vol.Range(min=5, max=900)),
+                    vol.Optional(CONF_POLL_DEADLINE, default=current_poll_deadline): vol.All(vol.Coerce(int), vol.Range(min=0, max=300)),
+                    vol.Optional(CONF_MAX_READ_GAP, default=current_max_read_gap): vol.All(vol.Coerce(int), vol.Range(min=0, max=100)),
+                    vol.Optional(CONF_PIPELINE_WINDOW, default=current_pipeline_window): vol.All(vol.Coerce(int), vol.Range(min=1, max=16)),
+                    vol.Optional(CONF_POWER_SENSOR, description={"suggested_value": current_power_sensor}): selector.EntitySelector(
+                        selector.EntitySelectorConfig(domain="sensor", device_class="power")
+                    ),
+                    vol.Optional(CONF_MAX_STATE_INTERVAL, default=current_max_state_interval): vol.All(vol.Coerce(int), vol.Range(min=0, max=3600)),
+                    vol.Optional(CONF_DEADBANDS, default=current_deadbands): selector.TextSelector(selector.TextSelectorConfig(multiline=True)),
+                    vol.Optional(CONF_LONG_TERM_STATISTICS, default=current_long_term_statistics): bool,
                 }
             ),
-            errors={},
+            errors=errors,
         )
@@ -0,0 +1,289 @@
+"""Persistent Modbus TCP connection for Weider WT16 Heat Pump."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from functools import cache
+from typing import TYPE_CHECKING
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.importlib import async_import_module
+
+from .const import DOMAIN, GATEWAY_EXCEPTION_CODES
+from .pipeline import PipelinedModbusTcpClient
+from .registers import REGISTER_FIELDS
+
+if TYPE_CHECKING:
+    from pymodbus.client import AsyncModbusTcpClient
+
+_LOGGER = logging.getLogger(__name__)
+
+# Register used for health checks and keep-alive reads (first room temperature register)
+HEALTH_CHECK_REGISTER = next(field.address for field in REGISTER_FIELDS if field.reg_type == "input")
+
+# hass.data key of the connections shared per host and port
+DATA_CONNECTIONS = f"{DOMAIN}_connections"
+
+# A pipelined batch whose last response took this share of one round trip per request was serialized
+PIPELINE_SERIAL_RATIO = 0.75
+
+# Consecutive serialized batches after which pipelining is switched off
+PIPELINE_SERIAL_BATCHES = 3
+
+# Consecutive batches lost with the connection after which pipelining is switched off
+PIPELINE_DROPPED_BATCHES = 3
+
+# Seconds before pipelining is tried again after a fallback, doubled on every fallback in a row
+PIPELINE_RETRY_BASE_DELAY = 600
+PIPELINE_RETRY_MAX_DELAY = 86400
+
+
+@cache
+def modbus_errors() -> tuple[type[Exception], ...]:
+    """Return the exceptions of a failed Modbus request.
+
+    pymodbus takes tens of milliseconds to import, so it is only loaded, in
+    the executor, when the first client is created. Except clauses are
+    evaluated when an exception is raised, by then it has been imported.
+    """
+    from pymodbus.exceptions import ModbusException  # pylint: disable=import-outside-toplevel
+
+    return (OSError, ConnectionError, ModbusException)
+
+
+@callback
+def async_acquire_connection(hass: HomeAssistant, host: str, port: int) -> WeiderWT16Connection:
+    """Return the connection to host:port, shared by every unit behind the same gateway."""
+    connections: dict[tuple[str, int], WeiderWT16Connection] = hass.data.setdefault(DATA_CONNECTIONS, {})
+    connection = connections.get((host, port))
+    if connection is None:
+        connection = connections[(host, port)] = WeiderWT16Connection(hass, host, port)
+    connection.users += 1
+    return connection
+
+
+async def async_release_connection(hass: HomeAssistant, connection: WeiderWT16Connection, device_id: int) -> None:
+    """Drop one user of a shared connection and close it when the last unit is gone."""
+    connection.users -= 1
+    connection.set_pipeline_window(device_id, None)
+    if connection.users > 0:
+        return
+    hass.data.get(DATA_CONNECTIONS, {}).pop((connection.host, connection.port), None)
+    await connection.async_close()
+
+
+class WeiderWT16Connection:
+    """Long-lived asyncio Modbus TCP connection shared by polls and writes.
+
+    Callers hold lock for the duration of a poll or write so requests from
+    different tasks never interleave on the socket. Several units (Modbus
+    slave IDs) behind one gateway share a connection, so the lock also
+    queues their polls one after another.
+    """
+
+    def __init__(self, hass: HomeAssistant, host: str, port: int, timeout: float = 10) -> None:
+        """Initialize the connection."""
+        self.hass = hass
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.lock = asyncio.Lock()
+        self.connect_count = 0
+        self.users = 0
+        self.last_activity: float | None = None
+        self._pipeline_windows: dict[int, int] = {}
+        self._serialized_batches = 0
+        self._dropped_batches = 0
+        # Monotonic time until which requests are sent one at a time, and the backoff that set it
+        self._fallback_until: float | None = None
+        self._fallback_delay = 0.0
+        self._client: AsyncModbusTcpClient | PipelinedModbusTcpClient | None = None
+        self._client_outdated = False
+
+    @property
+    def connected(self) -> bool:
+        """Return true if the socket is currently open."""
+        return self._client is not None and self._client.connected
+
+    @property
+    def pipeline_window(self) -> int:
+        """Return the number of requests kept in flight, the largest window any unit asks for."""
+        return max(self._pipeline_windows.values(), default=1)
+
+    @property
+    def pipeline_fallback(self) -> bool:
+        """Return true while requests are sent one at a time after pipelining failed."""
+        return self._fallback_until is not None
+
+    @property
+    def pipelining(self) -> bool:
+        """Return true if requests may be pipelined on this connection."""
+        return self.pipeline_window > 1 and not self.pipeline_fallback
+
+    def set_pipeline_window(self, device_id: int, window: int | None) -> None:
+        """Set the requests a unit wants in flight, 1 disables pipelining and None drops the unit.
+
+        The window is a gateway setting, so the connection uses the largest
+        one of all units. A changed window replaces the client on its next
+        use, under the lock, so a poll of another unit keeps its socket.
+        """
+        previous = self.pipeline_window
+        if window is None:
+            self._pipeline_windows.pop(device_id, None)
+        else:
+            self._pipeline_windows[device_id] = window
+        if self.pipeline_window == previous:
+            return
+        self._fallback_until = None
+        self._fallback_delay = 0.0
+        self._serialized_batches = 0
+        self._dropped_batches = 0
+        self._client_outdated = True
+
+    def pipeline_failed(self, reason: str) -> None:
+        """Fall back to one request at a time, trying pipelining again after a growing backoff."""
+        self._fallback_delay = min(PIPELINE_RETRY_MAX_DELAY, self._fallback_delay * 2) if self._fallback_delay else PIPELINE_RETRY_BASE_DELAY
+        self._fallback_until = time.monotonic() + self._fallback_delay
+        self._serialized_batches = 0
+        self._dropped_batches = 0
+        _LOGGER.warning("Disabling pipelined requests to %s:%d for %d seconds: %s", self.host, self.port, self._fallback_delay, reason)
+        self.close()
+        self._client = None
+
+    def pipeline_dropped(self, requests: int) -> None:
+        """Record a pipelined batch lost with the connection, falling back once it keeps happening.
+
+        A single lost connection, e.g. a blip of the VPN to the gateway, only
+        reconnects, so the next poll is pipelined again.
+        """
+        self._dropped_batches += 1
+        if self._dropped_batches >= PIPELINE_DROPPED_BATCHES:
+            self.pipeline_failed(f"connection lost with {requests} requests in flight, {self._dropped_batches} batches in a row")
+            return
+        _LOGGER.debug("Connection to %s:%d lost with %d requests in flight", self.host, self.port, requests)
+        self.close()
+        self._client = None
+
+    def record_pipeline_batch(self, requests: int, first_response: float, last_response: float) -> None:
+        """Fall back when responses of pipelined batches keep arriving one round trip apart."""
+        self._dropped_batches = 0
+        if requests < 3 or first_response <= 0:
+            return
+        if last_response < PIPELINE_SERIAL_RATIO * requests * first_response:
+            # Answered concurrently, a later fallback starts again from the base delay
+            self._serialized_batches = 0
+            self._fallback_delay = 0.0
+            return
+        self._serialized_batches += 1
+        if self._serialized_batches >= PIPELINE_SERIAL_BATCHES:
+            self.pipeline_failed(f"gateway answers one request at a time ({requests} requests took {last_response:.2f} seconds)")
+
+    async def async_get_client(self) -> AsyncModbusTcpClient | PipelinedModbusTcpClient:
+        """Return a connected client, opening a new socket if the old one was lost; caller must hold lock."""
+        if self._client_outdated:
+            # The pipeline window changed, open a socket with the matching client
+            self._client_outdated = False
+            self.close()
+            self._client = None
+
+        if self._fallback_until is not None and time.monotonic() >= self._fallback_until:
+            # Probe pipelining again, a serialized or dropped batch falls back with a longer delay
+            _LOGGER.debug("Trying pipelined requests to %s:%d again", self.host, self.port)
+            self._fallback_until = None
+            self.close()
+            self._client = None
+
+        if self._client is None:
+            # Loaded in the executor on first use, the pipelined client raises pymodbus exceptions too
+            client_module = await async_import_module(self.hass, "pymodbus.client")
+            if self.pipelining:
+                self._client = PipelinedModbusTcpClient(self.host, self.port, self.timeout, self.pipeline_window)
+            else:
+                # Retries and reconnects are handled here and in the coordinator, not by pymodbus
+                self._client = client_module.AsyncModbusTcpClient(self.host, port=self.port, timeout=self.timeout, retries=0, reconnect_delay=0)
+
+        if not self._client.connected:
+            async with asyncio.timeout(self.timeout):
+                connected = await self._client.connect()
+            if not connected:
+                raise ConnectionError(f"Connection to {self.host}:{self.port} failed")
+            self.connect_count += 1
+            self.last_activity = time.monotonic()
+            _LOGGER.debug("Opened Modbus connection to %s:%d (connect #%d)", self.host, self.port, self.connect_count)
+
+        return self._client
+
+    async def async_reconnect(self) -> bool:
+        """Drop the current socket and open a new one; caller must hold lock."""
+        self.close()
+        try:
+            await self.async_get_client()
+        except modbus_errors() as err:
+            _LOGGER.debug("Reconnection to %s:%d failed: %s", self.host, self.port, err)
+            return False
+        return True
+
+    def touch(self) -> None:
+        """Record traffic on the connection."""
+        self.last_activity = time.monotonic()
+
+    def idle_time(self) -> float | None:
+        """Return seconds since the last traffic, or None if never used."""
+        if self.last_activity is None:
+            return None
+        return time.monotonic() - self.last_activity
+
+    async def async_keepalive(self, idle_timeout: float, device_id: int) -> None:
+        """Send a cheap read if the open connection has been idle for idle_timeout seconds."""
+        if self.lock.locked():
+            # A poll or write is in progress, so the connection is not idle
+            return
+
+        async with self.lock:
+            idle = self.idle_time()
+            if not self.connected or idle is None or idle < idle_timeout:
+                return
+
+            try:
+                result = await self._client.read_input_registers(address=HEALTH_CHECK_REGISTER, count=1, device_id=device_id)
+                if result.isError():
+                    _LOGGER.debug("Keep-alive read returned error: %s", result)
+                self.touch()
+            except modbus_errors() as err:
+                _LOGGER.debug("Keep-alive failed, closing connection: %s", err)
+                self.close()
+
+    async def async_probe(self, device_id: int) -> None:
+        """Read the health check register of a unit once, raising if it is unreachable.
+
+        An exception response proves the unit is answering, unless a gateway
+        sends it on behalf of a unit behind it that does not answer.
+        """
+        async with self.lock:
+            try:
+                client = await self.async_get_client()
+                result = await client.read_input_registers(address=HEALTH_CHECK_REGISTER, count=1, device_id=device_id)
+            except Exception:
+                self.close()
+                raise
+            self.touch()
+
+        if result.isError():
+            if result.exception_code in GATEWAY_EXCEPTION_CODES:
+                raise ConnectionError(f"Unit {device_id} behind {self.host}:{self.port} does not answer: {result}")
+            _LOGGER.debug("Probe read returned error: %s", result)
+
+    def close(self) -> None:
+        """Close the socket; the next use reconnects."""
+        if self._client is not None:
+            try:
+                self._client.close()
+            except Exception:  # pylint: disable=broad-except
+                pass
+
+    async def async_close(self) -> None:
+        """Wait for any running poll or write, then close the socket."""
+        async with self.lock:
+            self.close()
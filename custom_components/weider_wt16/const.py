@@ -7,13 +7,80 @@ CONF_PORT = "port"
 CONF_SCAN_INTERVAL = "scan_interval"
 CONF_CREATE_DASHBOARD = "create_dashboard"
 CONF_ERROR_TIMEOUT = "error_timeout"
+CONF_MAX_READ_GAP = "max_read_gap"
+CONF_FAST_SCAN_INTERVAL = "fast_scan_interval"
+CONF_SLOW_SCAN_INTERVAL = "slow_scan_interval"
+CONF_MIN_SCAN_INTERVAL = "min_scan_interval"
+CONF_MAX_SCAN_INTERVAL = "max_scan_interval"
+CONF_POLL_DEADLINE = "poll_deadline"
+CONF_SLAVE_ID = "slave_id"
+CONF_PIPELINE_WINDOW = "pipeline_window"
+CONF_POWER_SENSOR = "power_sensor"
+CONF_DEADBANDS = "deadbands"
+CONF_MAX_STATE_INTERVAL = "max_state_interval"
+CONF_LONG_TERM_STATISTICS = "long_term_statistics"
+CONF_UNSUPPORTED_REGISTERS = "unsupported_registers"
 
 DEFAULT_PORT = 502
 DEFAULT_SCAN_INTERVAL = 60
 DEFAULT_ERROR_TIMEOUT = 600
+DEFAULT_MAX_READ_GAP = 10
+DEFAULT_FAST_SCAN_INTERVAL = 20
+DEFAULT_SLOW_SCAN_INTERVAL = 600
+DEFAULT_MIN_SCAN_INTERVAL = 10
+DEFAULT_MAX_SCAN_INTERVAL = 120
+DEFAULT_POLL_DEADLINE = 0
+DEFAULT_SLAVE_ID = 1
+DEFAULT_PIPELINE_WINDOW = 1
+DEFAULT_DEADBANDS = ""
+DEFAULT_MAX_STATE_INTERVAL = 900
+DEFAULT_LONG_TERM_STATISTICS = False
 
+# Seconds of idle time after which the open Modbus connection is kept alive with a read
+KEEPALIVE_INTERVAL = 30
+
+# Lower bound in seconds for the poll budget derived from the poll interval
+MIN_POLL_BUDGET = 5
+
+# Modbus exception responses a retry cannot change: illegal function and illegal data address
+PERMANENT_EXCEPTION_CODES = (1, 2)
+
+# Modbus exception responses of a gateway whose target unit does not answer: path unavailable and no response
+GATEWAY_EXCEPTION_CODES = (0x0A, 0x0B)
+
+# Seconds setpoint writes are collected before they are sent together
+WRITE_DEBOUNCE_DELAY = 1.0
+
+# Seconds after which the error text is read even though fernstoerung did not change
+ERROR_MESSAGE_INTERVAL = 3600
+
+# Polls kept in the in-memory history, 24 hours at the shortest default fast interval
+HISTORY_SAMPLES = 8640
+
+# Seconds between saves of the derived energy accumulators and the last snapshot
+STORAGE_SAVE_INTERVAL = 300
+
+# Profiling service and its number of captured polls
+SERVICE_PROFILE = "profile"
+ATTR_POLLS = "polls"
+DEFAULT_PROFILE_POLLS = 5
+
+# History query service
+SERVICE_HISTORY = "history"
+ATTR_KEY = "key"
+ATTR_HOURS = "hours"
+ATTR_BUCKETS = "buckets"
+
+# Register discovery service and the time a scan may take (seconds)
+SERVICE_DISCOVER = "discover"
+DISCOVERY_TIMEOUT = 60
+
+# Device identifier and unique ID prefix used before several units were supported
+LEGACY_DEVICE_IDENTIFIER = "weider_wt16_heatpump"
+LEGACY_UNIQUE_ID_PREFIX = "weider_wt16_"
+
+# Common device details, identifiers are added per unit
 DEVICE_INFO = {
-    "identifiers": {(DOMAIN, "weider_wt16_heatpump")},
     "name": "Weider WT16 Heat Pump",
     "manufacturer": "Weider",
     "model": "WT16",
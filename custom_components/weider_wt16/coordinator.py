@@ -4,21 +4,111 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import math
 import time
-from datetime import timedelta
-from typing import Any
-
-from pymodbus.client import ModbusTcpClient
-from pymodbus.exceptions import ModbusException
+from collections.abc import Callable, Iterable
+from contextlib import AbstractContextManager, nullcontext
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, TypeVar
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.const import ATTR_UNIT_OF_MEASUREMENT, UnitOfPower
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.event import async_call_later, async_track_time_interval
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
-
-from .const import CONF_HOST, CONF_PORT, CONF_SCAN_INTERVAL, CONF_ERROR_TIMEOUT, DEFAULT_SCAN_INTERVAL, DEFAULT_ERROR_TIMEOUT
+from homeassistant.util import dt as dt_util, slugify
+from homeassistant.util.unit_conversion import PowerConverter
+
+from .const import (
+    DOMAIN,
+    CONF_HOST,
+    CONF_PORT,
+    CONF_SCAN_INTERVAL,
+    CONF_ERROR_TIMEOUT,
+    CONF_MAX_READ_GAP,
+    CONF_FAST_SCAN_INTERVAL,
+    CONF_SLOW_SCAN_INTERVAL,
+    CONF_MIN_SCAN_INTERVAL,
+    CONF_MAX_SCAN_INTERVAL,
+    CONF_POLL_DEADLINE,
+    CONF_SLAVE_ID,
+    CONF_PIPELINE_WINDOW,
+    CONF_POWER_SENSOR,
+    CONF_DEADBANDS,
+    CONF_MAX_STATE_INTERVAL,
+    CONF_LONG_TERM_STATISTICS,
+    CONF_UNSUPPORTED_REGISTERS,
+    DEFAULT_SCAN_INTERVAL,
+    DEFAULT_ERROR_TIMEOUT,
+    DEFAULT_MAX_READ_GAP,
+    DEFAULT_FAST_SCAN_INTERVAL,
+    DEFAULT_SLOW_SCAN_INTERVAL,
+    DEFAULT_MIN_SCAN_INTERVAL,
+    DEFAULT_MAX_SCAN_INTERVAL,
+    DEFAULT_POLL_DEADLINE,
+    DEFAULT_SLAVE_ID,
+    DEFAULT_PIPELINE_WINDOW,
+    DEFAULT_DEADBANDS,
+    DEFAULT_MAX_STATE_INTERVAL,
+    DEFAULT_LONG_TERM_STATISTICS,
+    DEVICE_INFO,
+    DISCOVERY_TIMEOUT,
+    ERROR_MESSAGE_INTERVAL,
+    HISTORY_SAMPLES,
+    KEEPALIVE_INTERVAL,
+    STORAGE_SAVE_INTERVAL,
+    MIN_POLL_BUDGET,
+    PERMANENT_EXCEPTION_CODES,
+    WRITE_DEBOUNCE_DELAY,
+)
+from .connection import async_acquire_connection, async_release_connection, modbus_errors
+from .deadband import DeadbandFilter, parse_deadbands
+from .discovery import async_discover_unsupported
+from .history import PollHistory
+from .long_term import MEAN_STATISTICS, SUM_STATISTICS, CompiledHour, HourlyStatistics
+from .metrics import ThermalMetrics
+from .quarantine import RegisterQuarantine
+from .scheduler import CircuitBreaker, PollScheduler
+from .stats import PollStatistics
+from .registers import DEPENDENT_TIERS, REGISTER_FIELDS, ReadBlock, ReadPlanner, decode_block, field_addresses, field_spans, find_field, span_block
+
+if TYPE_CHECKING:
+    from homeassistant.helpers.entity import Entity
+
+    from .profiler import PollProfiler
 
 _LOGGER = logging.getLogger(__name__)
 
+_EntityT = TypeVar("_EntityT", bound="Entity")
+
+
+def _entry_option(entry: ConfigEntry, key: str, default: Any) -> Any:
+    """Return an option value, falling back to the entry data and then the default."""
+    return entry.options.get(key, entry.data.get(key, default))
+
+
+def _deadband_overrides(entry: ConfigEntry) -> dict[str, float]:
+    """Return the per-sensor deadbands configured in the options, ignoring invalid text."""
+    try:
+        return parse_deadbands(_entry_option(entry, CONF_DEADBANDS, DEFAULT_DEADBANDS))
+    except ValueError as err:
+        _LOGGER.warning("Ignoring configured deadbands: %s", err)
+        return {}
+
+
+def metrics_storage_key(entry_id: str) -> str:
+    """Return the storage key of an entry's energy accumulators."""
+    return f"{DOMAIN}.{entry_id}.metrics"
+
+
+def snapshot_storage_key(entry_id: str) -> str:
+    """Return the storage key of an entry's last good snapshot."""
+    return f"{DOMAIN}.{entry_id}.snapshot"
+
 
 class WeiderWT16DataUpdateCoordinator(DataUpdateCoordinator):
     """Class to manage fetching data from the Weider WT16 heat pump."""
@@ -27,9 +117,95 @@ class WeiderWT16DataUpdateCoordinator(DataUpdateCoordinator):
         """Initialize."""
         self.host = entry.data[CONF_HOST]
         self.port = entry.data[CONF_PORT]
-        self.modbus_addr = 1  # Hardcoded to 1
+        self.slave_id = entry.data.get(CONF_SLAVE_ID, DEFAULT_SLAVE_ID)
+        # Prefix of entity unique IDs and device identifier, unique per host, port and slave ID
+        self.unique_prefix = entry.unique_id or entry.entry_id
         scan_interval = entry.data.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
         self.error_timeout = entry.data.get(CONF_ERROR_TIMEOUT, DEFAULT_ERROR_TIMEOUT)
+        max_read_gap = _entry_option(entry, CONF_MAX_READ_GAP, DEFAULT_MAX_READ_GAP)
+
+        # Per-tier poll intervals, the scan interval is the normal tier and the fast tier adapts to activity
+        self._scheduler = PollScheduler(
+            {
+                "fast": _entry_option(entry, CONF_FAST_SCAN_INTERVAL, DEFAULT_FAST_SCAN_INTERVAL),
+                "normal": scan_interval,
+                "slow": _entry_option(entry, CONF_SLOW_SCAN_INTERVAL, DEFAULT_SLOW_SCAN_INTERVAL),
+                "fault": ERROR_MESSAGE_INTERVAL,
+            },
+            _entry_option(entry, CONF_MIN_SCAN_INTERVAL, DEFAULT_MIN_SCAN_INTERVAL),
+            _entry_option(entry, CONF_MAX_SCAN_INTERVAL, DEFAULT_MAX_SCAN_INTERVAL),
+        )
+
+        # Debounced write-behind queue, last value per register wins
+        self._pending_writes: dict[int, int] = {}
+        self._write_waiters: dict[int, list[asyncio.Future[bool]]] = {}
+        self._write_flush_unsub: CALLBACK_TYPE | None = None
+
+        # Optimistic values of queued writes and the values to restore if they fail
+        self._optimistic: dict[str, Any] = {}
+        self._write_rollback: dict[int, Any] = {}
+
+        # Snapshot and status last pushed to entities, used to notify only changed keys
+        self._notified_data: dict[str, Any] = {}
+        self._notified_success: bool | None = None
+        self._notified_at: dict[str, float] = {}
+        self._deadband = DeadbandFilter(
+            _deadband_overrides(entry), _entry_option(entry, CONF_MAX_STATE_INTERVAL, DEFAULT_MAX_STATE_INTERVAL)
+        )
+
+        # Fields the unit rejected in the last discovery scan, neither read nor exposed as entities
+        self.unsupported: frozenset[str] = frozenset(entry.data.get(CONF_UNSUPPORTED_REGISTERS, ()))
+
+        # Fields the unit keeps rejecting, skipped between re-probes, the ones rejected in the current poll and the
+        # quarantined ones the read plan leaves holes for
+        self.quarantine = RegisterQuarantine()
+        self._rejected_keys: list[str] = []
+        self._planned_quarantine: frozenset[str] = frozenset()
+
+        # Block read planning around unsupported registers and per-poll request accounting
+        self._planner = ReadPlanner(max_read_gap, field_addresses(self.unsupported))
+        self._request_count = 0
+        self.last_request_count = 0
+
+        # Poll deadline, 0 derives it from the tick, and overrun accounting
+        self._poll_deadline = _entry_option(entry, CONF_POLL_DEADLINE, DEFAULT_POLL_DEADLINE)
+        self._dropped_reads = 0
+        self.last_poll_duration: float | None = None
+        self.last_dropped_reads = 0
+        self.overrun_count = 0
+        self.skipped_tick_count = 0
+
+        # Request latencies, retries and raw values collected for diagnostics
+        self.stats = PollStatistics()
+
+        # Recent values of every poll for range and downsample queries
+        self.history = PollHistory(HISTORY_SAMPLES)
+
+        # Thermal power, heat energy and COP, with the energy accumulators persisted across restarts
+        self._metrics = ThermalMetrics()
+        self._metrics_store: Store[dict[str, float]] = Store(hass, 1, metrics_storage_key(entry.entry_id))
+        self._power_sensor: str | None = _entry_option(entry, CONF_POWER_SENSOR, None)
+
+        # Last good snapshot, restored at startup and stale until the first poll succeeds
+        self._snapshot_store: Store[dict[str, Any]] = Store(hass, 1, snapshot_storage_key(entry.entry_id))
+        self.stale = False
+        self._last_saved = time.monotonic()
+
+        # Opt-in hourly statistics pushed to the recorder instead of compiled from state rows
+        self.long_term: HourlyStatistics | None = None
+        if _entry_option(entry, CONF_LONG_TERM_STATISTICS, DEFAULT_LONG_TERM_STATISTICS):
+            self.long_term = HourlyStatistics()
+
+        # Profiler armed by the profile service for the next polls
+        self._profiler: PollProfiler | None = None
+
+        # Long-lived connection shared by polls, writes and all units behind the same gateway
+        self._connection = async_acquire_connection(hass, self.host, self.port)
+        # Opt-in pipelining, units sharing a connection use the largest configured window
+        self._connection.set_pipeline_window(self.slave_id, _entry_option(entry, CONF_PIPELINE_WINDOW, DEFAULT_PIPELINE_WINDOW))
+
+        # Stop full polls of an unreachable heat pump
+        self._breaker = CircuitBreaker()
 
         # Track error state
         self.first_error_time = None
@@ -39,9 +215,114 @@ class WeiderWT16DataUpdateCoordinator(DataUpdateCoordinator):
             hass,
             _LOGGER,
             name="Weider WT16",
-            update_interval=timedelta(seconds=scan_interval),
+            update_interval=timedelta(seconds=self._scheduler.tick),
         )
 
+        # Keep the idle connection alive between polls
+        entry.async_on_unload(async_track_time_interval(hass, self._async_keepalive, timedelta(seconds=KEEPALIVE_INTERVAL)))
+
+    async def _async_keepalive(self, _now) -> None:
+        """Send a keep-alive read if the connection has been idle."""
+        await self._connection.async_keepalive(KEEPALIVE_INTERVAL, self.slave_id)
+
+    async def async_close(self) -> None:
+        """Send queued writes, then release the connection, closing it if no other unit uses it."""
+        if self._write_flush_unsub:
+            self._write_flush_unsub()
+            self._write_flush_unsub = None
+        await self._async_flush_writes()
+        if self._profiler is not None:
+            self._async_write_profile(self._profiler)
+            self._profiler = None
+        await self._metrics_store.async_save(self._metrics.as_dict())
+        if self.last_successful_update is not None and self.data:
+            await self._snapshot_store.async_save(self._snapshot(self.last_successful_update, self.data))
+        await async_release_connection(self.hass, self._connection, self.slave_id)
+
+    @property
+    def has_power_sensor(self) -> bool:
+        """Return true if an electrical power sensor is configured for the COP."""
+        return bool(self._power_sensor)
+
+    async def async_load_metrics(self) -> None:
+        """Restore the energy accumulators saved before the last restart."""
+        if stored := await self._metrics_store.async_load():
+            self._metrics.restore(stored)
+
+    async def async_restore_snapshot(self) -> bool:
+        """Restore the snapshot saved before the last restart as stale data, return true if there was one."""
+        stored = await self._snapshot_store.async_load()
+        if not stored or not stored.get("data"):
+            return False
+
+        self.data = stored["data"]
+        self.last_successful_update = stored["timestamp"]
+        self.stale = True
+        _LOGGER.debug("Restored snapshot from %.0f seconds ago", self.data_age)
+        return True
+
+    @staticmethod
+    def _snapshot(timestamp: float, data: dict[str, Any]) -> dict[str, Any]:
+        """Return a snapshot to persist."""
+        return {"timestamp": timestamp, "data": data}
+
+    def _electric_power(self) -> float | None:
+        """Return the configured electrical power sensor's value in kW."""
+        if not self._power_sensor or (state := self.hass.states.get(self._power_sensor)) is None:
+            return None
+        try:
+            return PowerConverter.convert(float(state.state), state.attributes.get(ATTR_UNIT_OF_MEASUREMENT), UnitOfPower.KILO_WATT)
+        except (ValueError, HomeAssistantError):
+            # Unavailable, unknown or not a power unit
+            return None
+
+    @property
+    def device_info(self) -> dict[str, Any]:
+        """Return the device info shared by the entities of this unit."""
+        name = DEVICE_INFO["name"] if self.slave_id == DEFAULT_SLAVE_ID else f"{DEVICE_INFO['name']} {self.slave_id}"
+        return {**DEVICE_INFO, "identifiers": {(DOMAIN, self.unique_prefix)}, "name": name}
+
+    def supports(self, *keys: str) -> bool:
+        """Return true if none of the keys was rejected by the unit in the discovery scan."""
+        return self.unsupported.isdisjoint(keys)
+
+    @callback
+    def async_supported(self, platform: str, entities: Iterable[_EntityT], keys: Callable[[_EntityT], Iterable[str]]) -> list[_EntityT]:
+        """Return the entities whose keys the unit supports and remove the others from the entity registry.
+
+        Entities of registers a later discovery scan found unsupported were
+        registered before it, so they are removed instead of left orphaned.
+        """
+        supported = []
+        entity_registry = er.async_get(self.hass)
+        for entity in entities:
+            if self.supports(*keys(entity)):
+                supported.append(entity)
+            elif entity_id := entity_registry.async_get_entity_id(platform, DOMAIN, entity.unique_id):
+                entity_registry.async_remove(entity_id)
+        return supported
+
+    async def async_discover(self) -> list[str]:
+        """Scan which registers the unit answers and return the keys of those it rejects."""
+        async with self._connection.lock:
+            try:
+                async with asyncio.timeout(DISCOVERY_TIMEOUT):
+                    client = await self._connection.async_get_client()
+                    unsupported = await async_discover_unsupported(client, self.slave_id, self._planner.max_gap)
+            except Exception:
+                self._connection.close()
+                raise
+            self._connection.touch()
+        return unsupported
+
+    def unique_id(self, key: str) -> str:
+        """Return the entity unique ID for a key."""
+        return f"{self.unique_prefix}_{key}"
+
+    def object_id(self, slug: str) -> str:
+        """Return the entity object ID for a slug, suffixed with the slave ID for additional units."""
+        return slug if self.slave_id == DEFAULT_SLAVE_ID else f"{slug}_{self.slave_id}"
+
     async def async_update_config(self, entry: ConfigEntry) -> None:
         """Update coordinator configuration from config entry."""
         # Update scan interval
@@ -54,29 +335,229 @@ class WeiderWT16DataUpdateCoordinator(DataUpdateCoordinator):
         if entry.options:
             error_timeout = entry.options.get(CONF_ERROR_TIMEOUT, error_timeout)
 
+        # Update block read gap threshold and tier intervals
+        max_read_gap = _entry_option(entry, CONF_MAX_READ_GAP, DEFAULT_MAX_READ_GAP)
+        self._scheduler.configure(
+            {
+                "fast": _entry_option(entry, CONF_FAST_SCAN_INTERVAL, DEFAULT_FAST_SCAN_INTERVAL),
+                "normal": scan_interval,
+                "slow": _entry_option(entry, CONF_SLOW_SCAN_INTERVAL, DEFAULT_SLOW_SCAN_INTERVAL),
+                "fault": ERROR_MESSAGE_INTERVAL,
+            },
+            _entry_option(entry, CONF_MIN_SCAN_INTERVAL, DEFAULT_MIN_SCAN_INTERVAL),
+            _entry_option(entry, CONF_MAX_SCAN_INTERVAL, DEFAULT_MAX_SCAN_INTERVAL),
+        )
+
         # Apply new settings
+        self._poll_deadline = _entry_option(entry, CONF_POLL_DEADLINE, DEFAULT_POLL_DEADLINE)
+        self._connection.set_pipeline_window(self.slave_id, _entry_option(entry, CONF_PIPELINE_WINDOW, DEFAULT_PIPELINE_WINDOW))
+        self._power_sensor = _entry_option(entry, CONF_POWER_SENSOR, None)
+        self._deadband.configure(_deadband_overrides(entry), _entry_option(entry, CONF_MAX_STATE_INTERVAL, DEFAULT_MAX_STATE_INTERVAL))
+        if not _entry_option(entry, CONF_LONG_TERM_STATISTICS, DEFAULT_LONG_TERM_STATISTICS):
+            self.long_term = None
+        elif self.long_term is None:
+            self.long_term = HourlyStatistics()
         self.error_timeout = error_timeout
-        self.update_interval = timedelta(seconds=scan_interval)
+        self.update_interval = timedelta(seconds=self._scheduler.tick)
+        self._planner.reset(max_read_gap)
 
         # Reset error state when config changes
         self.first_error_time = None
 
-        _LOGGER.info("Updated configuration: scan_interval=%d, error_timeout=%d", scan_interval, error_timeout)
+        _LOGGER.info(
+            "Updated configuration: tier_intervals=%s, error_timeout=%d, max_read_gap=%d",
+            self._scheduler.tier_intervals,
+            error_timeout,
+            max_read_gap,
+        )
+
+    def statistic_id(self, key: str) -> str:
+        """Return the external statistic ID of a key."""
+        return f"{DOMAIN}:{slugify(self.unique_prefix)}_{key}"
+
+    @callback
+    def _async_add_statistics(self, hours: list[CompiledHour]) -> None:
+        """Queue the compiled hours in the recorder, one import per statistic."""
+        if "recorder" not in self.hass.config.components:
+            return
+
+        # Imported on first use, the recorder is only needed with the option enabled
+        from homeassistant.components.recorder.models import StatisticData, StatisticMeanType, StatisticMetaData
+        from homeassistant.components.recorder.statistics import async_add_external_statistics
+
+        name = self.device_info["name"]
+        for key, unit in MEAN_STATISTICS.items():
+            statistics = [
+                StatisticData(start=dt_util.utc_from_timestamp(hour.start), **hour.means[key])
+                for hour in hours
+                if key in hour.means
+            ]
+            if statistics:
+                metadata = StatisticMetaData(
+                    has_mean=True,
+                    mean_type=StatisticMeanType.ARITHMETIC,
+                    has_sum=False,
+                    name=f"{name} {key}",
+                    source=DOMAIN,
+                    statistic_id=self.statistic_id(key),
+                    unit_of_measurement=unit,
+                )
+                async_add_external_statistics(self.hass, metadata, statistics)
+
+        for key, unit in SUM_STATISTICS.items():
+            statistics = [
+                StatisticData(start=dt_util.utc_from_timestamp(hour.start), state=hour.sums[key], sum=hour.sums[key])
+                for hour in hours
+                if key in hour.sums
+            ]
+            if statistics:
+                metadata = StatisticMetaData(
+                    has_mean=False,
+                    mean_type=StatisticMeanType.NONE,
+                    has_sum=True,
+                    name=f"{name} {key}",
+                    source=DOMAIN,
+                    statistic_id=self.statistic_id(key),
+                    unit_of_measurement=unit,
+                )
+                async_add_external_statistics(self.hass, metadata, statistics)
+
+        _LOGGER.debug("Compiled long-term statistics for %d hours", len(hours))
+
+    @callback
+    def async_start_profile(self, polls: int) -> Path:
+        """Profile the next polls and return the path the report will be written to."""
+        if self._profiler is not None:
+            # Restarting reports the unfinished capture, stopped before the new one starts tracing
+            self._async_write_profile(self._profiler)
+
+        # cProfile, pstats and tracemalloc are only imported when a profile is requested
+        from .profiler import PollProfiler  # pylint: disable=import-outside-toplevel
+
+        # Named per unit, the profile service starts a capture on every unit at once
+        path = Path(self.hass.config.path(f"{DOMAIN}_profile_{slugify(self.unique_prefix)}_{datetime.now():%Y%m%d_%H%M%S}.txt"))
+        self._profiler = PollProfiler(polls, path)
+        self._profiler.start()
+        _LOGGER.info("Profiling the next %d polls, report will be written to %s", polls, path)
+        return path
+
+    def _profile_phase(self, name: str) -> AbstractContextManager[None]:
+        """Return a context manager measuring a poll phase while profiling."""
+        if self._profiler is None:
+            return nullcontext()
+        return self._profiler.phase(name)
+
+    @callback
+    def _async_end_profiled_poll(self) -> None:
+        """Close the profiled poll and write the report once all polls are captured."""
+        profiler = self._profiler
+        if profiler is None or not profiler.fetched:
+            # Not a poll, e.g. an optimistic write while the poll waits for I/O
+            return
+        profiler.end_poll()
+        if profiler.done:
+            self._profiler = None
+            self._async_write_profile(profiler)
+
+    @callback
+    def _async_write_profile(self, profiler: PollProfiler) -> None:
+        """Stop a capture in the event loop and write its report in the executor."""
+        profiler.stop()
+        self.hass.async_add_executor_job(profiler.write_report)
+
+    @property
+    def data_age(self) -> float | None:
+        """Return seconds since the last successful poll, or None before the first one."""
+        if self.last_successful_update is None:
+            return None
+        return time.time() - self.last_successful_update
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Notify only the listeners whose data keys changed significantly since the last notification.
+
+        Entities register with their data key (or a tuple of keys) as context.
+        A numeric change smaller than the key's deadband is held back until
+        it grows or the maximum state interval passes. Listeners without a
+        context, and all listeners when availability changes, are always
+        notified.
+        """
+        data = self.data or {}
+        now = time.monotonic()
+        notify_all = self.last_update_success != self._notified_success
+
+        # Values within their deadband keep the last notified value, so drift adds up until it is significant
+        changed = set()
+        for key in data.keys() | self._notified_data.keys():
+            age = now - self._notified_at.get(key, -math.inf)
+            if notify_all or self._deadband.significant(key, self._notified_data.get(key), data.get(key), age):
+                changed.add(key)
+                self._notified_data[key] = data.get(key)
+                self._notified_at[key] = now
+        self._notified_success = self.last_update_success
+
+        with self._profile_phase("state_writes"):
+            for update_callback, context in list(self._listeners.values()):
+                if notify_all or context is None:
+                    update_callback()
+                elif isinstance(context, str):
+                    if context in changed:
+                        update_callback()
+                elif not changed.isdisjoint(context):
+                    update_callback()
+
+        self._async_end_profiled_poll()
 
     async def _async_update_data(self) -> dict[str, Any]:
         """Fetch data from the heat pump with retry mechanism."""
+        if self._profiler is not None:
+            self._profiler.begin_poll()
+
         try:
-            data = await self.hass.async_add_executor_job(self._fetch_data)
+            if self._breaker.is_open:
+                # Only a single cheap read until the heat pump answers again
+                await self._connection.async_probe(self.slave_id)
+
+            # Tiers that are not due keep their previous values, queued writes keep their optimistic values
+            data = {**(self.data or {}), **await self._fetch_data(), **self._optimistic}
+            self._breaker.record_success()
+
+            # Quarantined fields are unknown rather than frozen at their last value
+            for key in self.quarantine.quarantined:
+                data.pop(key, None)
+
+            # Derived metrics, integrated from poll to poll
+            data.update(self._metrics.update(data, time.monotonic(), self._electric_power()))
+
+            # Adapt the poll rate to what the plant is doing
+            self._scheduler.observe(data, time.monotonic())
+            self.update_interval = timedelta(seconds=self._scheduler.tick)
 
             # Reset error tracking on successful update
             self.first_error_time = None
             self.last_successful_update = time.time()
+            self.history.append(self.last_successful_update, data)
+            if self.long_term is not None and (hours := self.long_term.add(self.last_successful_update, data)):
+                self._async_add_statistics(hours)
+
+            self.stale = False
+            if time.monotonic() - self._last_saved >= STORAGE_SAVE_INTERVAL:
+                # Not a delayed save per poll, polls faster than the delay would postpone it forever
+                timestamp = self.last_successful_update
+                self._metrics_store.async_delay_save(self._metrics.as_dict)
+                self._snapshot_store.async_delay_save(lambda: self._snapshot(timestamp, data))
+                self._last_saved = time.monotonic()
 
             return data
 
         except Exception as err:
             current_time = time.time()
 
+            # Probe on the breaker's backoff schedule instead of the poll interval
+            self._breaker.record_failure()
+            if self._breaker.is_open:
+                self.update_interval = timedelta(seconds=self._breaker.retry_delay)
+
             # Track first error time
             if self.first_error_time is None:
                 self.first_error_time = current_time
@@ -99,227 +580,391 @@ class WeiderWT16DataUpdateCoordinator(DataUpdateCoordinator):
             else:
                 return {}
 
-    def _read_register_with_retry(self, client, reg_type: str, address: int, count: int = 1, retries: int = 2):
-        """Read a register with retry logic for unstable connections."""
+        finally:
+            if self._profiler is not None:
+                self._profiler.fetched = True
+
+    async def _read_register_with_retry(self, reg_type: str, address: int, count: int = 1, retries: int = 2):
+        """Read a register with retry logic for unstable connections.
+
+        Returns the response, the last exception response if the unit kept
+        answering with one, or None if the read failed on the connection.
+        """
+        response = None
         for attempt in range(retries + 1):
+            self._request_count += 1
+            started = time.monotonic()
             try:
+                # Fetched per attempt, a reconnect or pipelining fallback may replace the client
+                client = await self._connection.async_get_client()
                 if reg_type == "discrete":
-                    result = client.read_discrete_inputs(address=address, count=count)
+                    result = await client.read_discrete_inputs(address=address, count=count, device_id=self.slave_id)
                 elif reg_type == "input":
-                    result = client.read_input_registers(address=address, count=count)
+                    result = await client.read_input_registers(address=address, count=count, device_id=self.slave_id)
                 elif reg_type == "holding":
-                    result = client.read_holding_registers(address=address, count=count)
+                    result = await client.read_holding_registers(address=address, count=count, device_id=self.slave_id)
                 else:
                     return None
 
+                self.stats.record_request(reg_type, address, count, time.monotonic() - started, not result.isError(), attempt)
                 if not result.isError():
                     return result
-                else:
-                    _LOGGER.debug("Register %d read attempt %d failed: %s", address, attempt + 1, result)
+                _LOGGER.debug("Register %d read attempt %d failed: %s", address, attempt + 1, result)
+                response = result
+                if result.exception_code in PERMANENT_EXCEPTION_CODES:
+                    # The unit rejects the request itself, asking again gets the same answer
+                    break
 
-            except (OSError, ConnectionError, ModbusException) as err:
+            except modbus_errors() as err:
+                self.stats.record_request(reg_type, address, count, time.monotonic() - started, False, attempt)
                 if "broken pipe" in str(err).lower() or "connection" in str(err).lower():
                     _LOGGER.debug("Connection issue reading register %d (attempt %d): %s", address, attempt + 1, err)
                     if attempt < retries:
                         # Try to reconnect
-                        try:
-                            client.close()
-                            time.sleep(0.1)  # Brief pause before retry
-                            if not client.connect():
-                                _LOGGER.debug("Reconnection failed for register %d", address)
-                                continue
-                        except Exception:
-                            pass
+                        await asyncio.sleep(0.1)  # Brief pause before retry
+                        if not await self._connection.async_reconnect():
+                            _LOGGER.debug("Reconnection failed for register %d", address)
+                            continue
                     else:
                         _LOGGER.warning("Failed to read register %d after %d attempts: %s", address, retries + 1, err)
                 else:
                     _LOGGER.warning("Error reading register %d: %s", address, err)
                     break
-        return None
+        return response
 
-    def _fetch_data(self) -> dict[str, Any]:
-        """Fetch data from Modbus TCP with improved error handling."""
-        data = {}
+    async def _read_blocks(self, reg_type: str, spans: list[tuple[int, int]], deadline: float) -> list[tuple[ReadBlock, list[Any]]]:
+        """Read register spans using the planned block reads, splitting rejected blocks.
 
-        try:
-            client = ModbusTcpClient(host=self.host, port=self.port, timeout=10)
-
-            if not client.connect():
-                raise ModbusException(f"Unable to connect to {self.host}:{self.port}")
-
-            _LOGGER.debug("Connected to heat pump, reading registers...")
-            successful_reads = 0
-
-            # Read discrete inputs (binary sensors) - with German keys
-            discrete_registers = [
-                (45, "stroemungswaechter_wp1"),
-                (679, "verdichter_wp1"),
-                (680, "up_heizen_wp1"),
-                (681, "up_sole_wasser_wp1"),
-                (682, "up_mischer_1"),
-                (685, "up_warmwasser"),
-                (686, "fernstoerung"),
-                (703, "sperre_warmwasser"),
-                (704, "sperre_heizen"),
-                (705, "evu_sperre"),
-                (706, "sgready_1"),
-                (707, "sgready_2"),
-            ]
+        Reads still pending at the loop time deadline are dropped and counted.
+        """
+        buffers: list[tuple[ReadBlock, list[Any]]] = []
+        pending = self._planner.plan(reg_type, spans)
 
-            for address, key in discrete_registers:
-                result = self._read_register_with_retry(client, "discrete", address)
-                if result and hasattr(result, "bits"):
-                    data[key] = result.bits[0]
-                    successful_reads += 1
-
-            # Read input registers (sensors) - with German keys
-            input_registers = [
-                # Verified working range 12-44
-                (12, "raum_ist_temperatur", 0.1),
-                (13, "warmwasser_ist_temperatur", 0.1),
-                (14, "vorlauf_soll_temperatur", 0.1),
-                (15, "aussentemperatur", 0.1),
-                (16, "puffer_ist_temperatur", 0.1),
-                (17, "mischer_ist_temperatur", 0.1),
-                (18, "reservefuehler_1_temperatur", 0.1),
-                (19, "reservefuehler_2_temperatur", 0.1),
-                (20, "reservefuehler_3_temperatur", 0.1),
-                (21, "abtaufuehler_ist_temperatur", 0.1),
-                (25, "wp1_vorlauf_ist_temperatur", 0.1),
-                (26, "wp1_ruecklauf_ist_temperatur", 0.1),
-                (27, "wp1_quelle_eintritt_temperatur", 0.1),
-                (28, "wp1_quelle_austritt_temperatur", 0.1),
-                (29, "wp1_ueberhitzung", 0.1),
-                (31, "wp1_verdampfungstemperatur", 0.1),
-                (33, "wp1_verfluessigungstemperatur", 0.1),
-                (35, "wp1_verdampfer_temperatur", 0.1),
-                (36, "wp1_sauggas_temperatur", 0.1),
-                (37, "wp1_heissgas_temperatur", 0.1),
-                (38, "wp1_sauggas_evi_temperatur", 0.1),
-                (40, "wp1_verdampfungstemperatur_evi", 0.1),
-                (42, "wp1_verfluessigungstemperatur_evi", 0.1),
-                (43, "wp1_verfluessigungsdruck_evi", 0.01),
-                (44, "wp1_volumenstrom", 1),
-                (46, "wp1_ueberhitzung_evi", 0.1),
-                (726, "mlt1_vorlauf_soll_temperatur", 0.1),
-                (727, "mlt1_vorlauf_ist_temperatur", 0.1),
-                (736, "mlt1_mischerposition", 1),
-                (1008, "aktuelle_schritte_cl1", 1),
-                (1048, "aktuelle_schritte_cl2", 1),
-            ]
+        if self._connection.pipelining and len(pending) > 1:
+            pending = await self._read_blocks_pipelined(reg_type, pending, buffers, deadline)
 
-            # Registers that should NOT be converted to signed (unsigned values)
-            unsigned_registers = {
-                "wp1_volumenstrom",
-                "aktuelle_schritte_cl1",
-                "aktuelle_schritte_cl2",
-            }
-
-            for address, key, scale in input_registers:
-                result = self._read_register_with_retry(client, "input", address)
-                if result and hasattr(result, "registers"):
-                    raw_value = result.registers[0]
-                    # Convert unsigned 16-bit to signed 16-bit for temperature values
-                    # According to Weider documentation, temperature values are "2 Byte signed"
-                    if key not in unsigned_registers:
-                        if raw_value > 32767:
-                            raw_value = raw_value - 65536
-                    data[key] = raw_value * scale
-                    successful_reads += 1
-
-            # Read holding registers (setpoints) - with German keys
-            holding_registers = [
-                (1, "warmwasser_soll_temperatur", 0.1),
-                (723, "raum_soll_temperatur", 0.1),
-            ]
+        while pending:
+            if self.hass.loop.time() >= deadline:
+                self._dropped_reads += len(pending)
+                break
+
+            block = pending.pop(0)
+            try:
+                async with asyncio.timeout_at(deadline):
+                    result = await self._read_register_with_retry(reg_type, block.address, block.count)
+            except TimeoutError:
+                # The cancelled request may still be answered, so start over with a fresh socket
+                self._connection.close()
+                self._dropped_reads += len(pending) + 1
+                break
 
-            for address, key, scale in holding_registers:
-                result = self._read_register_with_retry(client, "holding", address)
-                if result and hasattr(result, "registers"):
-                    data[key] = result.registers[0] * scale
-                    successful_reads += 1
+            if result is None or result.isError():
+                if parts := self._reject(reg_type, block, result):
+                    pending[:0] = parts
+                continue
 
-            # Read runtime data (32-bit values) - with German keys
-            runtime_registers = [
-                (60164, "wp1_letzte_laufzeit_pumpe"),
-                (60168, "wp1_letzte_laufzeit_warmwasser"),
-            ]
+            buffers.append((block, result.bits if reg_type == "discrete" else result.registers))
 
-            for address, key in runtime_registers:
-                result = self._read_register_with_retry(client, "input", address, count=2)
-                if result and hasattr(result, "registers") and len(result.registers) >= 2:
-                    # Combine two 16-bit registers into 32-bit value (high word first)
-                    raw_value = (result.registers[0] << 16) | result.registers[1]
-                    # Raw value is already in minutes
-                    data[key] = raw_value
-                    successful_reads += 1
-
-            # Read error message register (string - 16 registers)
-            result = self._read_register_with_retry(client, "input", 63000, count=16)
-            if result and hasattr(result, "registers") and len(result.registers) >= 16:
-                # Convert registers to string (2 bytes per register)
-                text_bytes = []
-                for reg in result.registers:
-                    text_bytes.append((reg >> 8) & 0xFF)  # High byte
-                    text_bytes.append(reg & 0xFF)  # Low byte
-
-                # Convert bytes to string, removing null terminators
-                try:
-                    error_text = bytes(text_bytes).decode("utf-8", errors="ignore").rstrip("\x00")
-                    data["aktive_fehlermeldung"] = error_text if error_text else "Keine Fehlermeldung"
-                except:
-                    data["aktive_fehlermeldung"] = "Fehler beim Lesen"
-                successful_reads += 1
+        return buffers
 
-            client.close()
+    async def _read_blocks_pipelined(
+        self, reg_type: str, blocks: list[ReadBlock], buffers: list[tuple[ReadBlock, list[Any]]], deadline: float
+    ) -> list[ReadBlock]:
+        """Send all planned block reads at once and return the blocks left for sequential reads.
 
-            # Raise error if we couldn't read any critical registers
-            if successful_reads == 0:
-                raise ModbusException("Failed to read any registers from heat pump")
+        Rejected blocks come back split. If the gateway keeps dropping the
+        connection with requests in flight, or keeps answering one request
+        per round trip, the connection falls back to sequential requests for
+        a while.
+        """
+        loop = self.hass.loop
+        started = loop.time()
+        completed: list[float] = []
 
-            return data
+        async def read(block: ReadBlock):
+            """Read one block without retries, recording when its response arrived."""
+            result = await self._read_register_with_retry(reg_type, block.address, block.count, retries=0)
+            completed.append(loop.time() - started)
+            return result
 
-        except Exception as err:
+        try:
+            async with asyncio.timeout_at(deadline):
+                results = await asyncio.gather(*(read(block) for block in blocks))
+        except TimeoutError:
+            self._connection.close()
+            self._dropped_reads += len(blocks)
+            return []
+
+        if not self._connection.connected:
+            self._connection.pipeline_dropped(len(blocks))
+            # Unanswered blocks are read again one at a time
+            return [block for block, result in zip(blocks, results) if result is None or result.isError()]
+
+        self._connection.record_pipeline_batch(len(blocks), min(completed), max(completed))
+
+        remaining: list[ReadBlock] = []
+        for block, result in zip(blocks, results):
+            if result is None or result.isError():
+                remaining.extend(self._reject(reg_type, block, result))
+                continue
+            buffers.append((block, result.bits if reg_type == "discrete" else result.registers))
+
+        return remaining
+
+    def _reject(self, reg_type: str, block: ReadBlock, result: Any) -> list[ReadBlock]:
+        """Handle a failed block read and return the parts to read instead.
+
+        Only a block the unit rejected with an illegal function or address is
+        split, and the split is kept in the cached plans. A block lost to a
+        timeout or connection error keeps its plan and is read whole again in
+        the next poll.
+        """
+        if result is not None and result.exception_code in PERMANENT_EXCEPTION_CODES:
+            if parts := self._planner.reject(block):
+                _LOGGER.debug("Block %s %d+%d rejected, splitting into %d reads", reg_type, block.address, block.count, len(parts))
+                return parts
+            # A single field the unit rejects counts towards its quarantine, lost reads do not
+            if (field := find_field(reg_type, block.address)) is not None:
+                self._rejected_keys.append(field.key)
+        self.stats.record_failed(reg_type, block.address, block.count)
+        return []
+
+    def _poll_budget(self) -> float:
+        """Return the time budget of one poll in seconds."""
+        if self._poll_deadline:
+            return self._poll_deadline
+        # Derived budget leaves a fifth of the tick free so polls never overlap
+        return max(MIN_POLL_BUDGET, self._scheduler.tick * 0.8)
+
+    async def _fetch_data(self) -> dict[str, Any]:
+        """Fetch data over the persistent connection within the poll budget."""
+        budget = self._poll_budget()
+        self._dropped_reads = 0
+        self.stats.start_poll()
+
+        async with self._connection.lock:
+            # The budget, the poll duration and the tier schedule start once the units polled before this one are done
+            now = time.monotonic()
+            tiers = self._scheduler.due_tiers(now)
+            deadline = self.hass.loop.time() + budget
             try:
-                client.close()
-            except:
-                pass
-            raise
+                async with asyncio.timeout_at(deadline):
+                    await self._connection.async_get_client()
+                data = await self._read_all_registers(tiers, deadline)
+            except Exception:
+                # Drop the socket so the next poll starts with a fresh connection
+                self._connection.close()
+                raise
+            finally:
+                self.stats.finish_poll()
+
+        self.last_poll_duration = time.monotonic() - now
+        if self.last_poll_duration > self._scheduler.tick:
+            self.skipped_tick_count += int(self.last_poll_duration // self._scheduler.tick)
+
+        if self._dropped_reads:
+            self.overrun_count += 1
+            self.last_dropped_reads = self._dropped_reads
+            _LOGGER.warning(
+                "Poll exceeded its %.1f second budget, dropped %d reads and returned partial data (%d overruns so far)",
+                budget,
+                self._dropped_reads,
+                self.overrun_count,
+            )
+            # Tiers with dropped reads stay due for the next tick
+            skipped = self.unsupported | self.quarantine.quarantined
+            tiers = {tier for tier in tiers if all(field.key in data for field in REGISTER_FIELDS if field.tier == tier and field.key not in skipped)}
+
+        self._scheduler.mark_read(tiers, now)
+
+        return data
+
+    async def _read_all_registers(self, tiers: set[str], deadline: float) -> dict[str, Any]:
+        """Read and decode the registers of the given tiers with improved error handling.
+
+        Dependent tiers are added to tiers, in place, as soon as a value they
+        depend on is read with a changed value, so they are read in the same
+        poll and marked as read with it.
+        """
+        data = {}
+        self._request_count = 0
+        self._rejected_keys = []
+        # Quarantined fields are only read again once their re-probe is due
+        exclude = (self.unsupported | self.quarantine.excluded(time.monotonic())) if self.quarantine else self.unsupported
+        if (quarantined := self.quarantine.quarantined) != self._planned_quarantine:
+            # Kept out of merged blocks like unsupported fields, so a probe reads the field on its own
+            self._planned_quarantine = quarantined
+            self._planner.holes = field_addresses(self.unsupported | quarantined)
+
+        _LOGGER.debug("Connected to heat pump, reading tiers %s...", sorted(tiers))
+
+        # Discrete inputs come first, so a changed fault bit pulls in the error text of the same poll
+        for reg_type in ("discrete", "input", "holding"):
+            for key, tier in DEPENDENT_TIERS.items():
+                if tier not in tiers and key in data and data[key] != (self.data or {}).get(key):
+                    _LOGGER.debug("%s changed to %s, reading %s tier", key, data[key], tier)
+                    tiers.add(tier)
+                    # Stays due until it was read, even if this poll runs out of budget before it
+                    self._scheduler.forced_tiers.add(tier)
+            spans = field_spans(reg_type, tiers, exclude)
+            if not spans:
+                continue
+            with self._profile_phase("io"):
+                buffers = await self._read_blocks(reg_type, spans, deadline)
+            with self._profile_phase("decode"):
+                for block, raw in buffers:
+                    self.stats.record_raw(reg_type, block.address, raw[: block.count])
+                    data.update(decode_block(block, raw))
+
+        self._connection.touch()
+
+        self.last_request_count = self._request_count
+        _LOGGER.debug("Poll used %d Modbus requests", self.last_request_count)
+
+        # Raise error if we couldn't read any critical registers
+        if not data:
+            raise UpdateFailed("Failed to read any registers from heat pump")
+
+        # Only a poll the unit answered counts towards quarantines, an outage of the whole unit does not
+        now = time.monotonic()
+        for key in self._rejected_keys:
+            self.quarantine.record_failure(key, now)
+        if self.quarantine:
+            self.quarantine.record_read(data)
+
+        return data
 
     async def async_write_register(self, address: int, value: int) -> bool:
-        """Write to a holding register."""
+        """Queue a holding register write and wait for the flush that carries it.
+
+        The snapshot is updated optimistically right away. Writes are debounced
+        and coalesced per register, so only the last value queued for an
+        address is sent. Every caller receives the result of the write that
+        finally went out for its register.
+        """
+        future: asyncio.Future[bool] = self.hass.loop.create_future()
+        self._pending_writes[address] = value
+        self._write_waiters.setdefault(address, []).append(future)
+        self._apply_optimistic_write(address, value)
+
+        # Restart the debounce timer on every queued write
+        if self._write_flush_unsub:
+            self._write_flush_unsub()
+        self._write_flush_unsub = async_call_later(self.hass, WRITE_DEBOUNCE_DELAY, self._async_flush_writes)
+
+        return await future
+
+    @callback
+    def _apply_optimistic_write(self, address: int, value: int) -> None:
+        """Show a queued write in the snapshot before the device confirms it."""
+        field = find_field("holding", address)
+        if field is None or self.data is None:
+            return
+
+        self._write_rollback.setdefault(address, self.data.get(field.key))
+        optimistic = decode_block(span_block("holding", address), [value])
+        self._optimistic.update(optimistic)
+        self.data = {**self.data, **optimistic}
+        self.async_update_listeners()
+
+    async def _async_flush_writes(self, _now=None) -> None:
+        """Send all queued writes in one pass over the connection and resolve their callers."""
+        self._write_flush_unsub = None
+        writes, waiters = self._pending_writes, self._write_waiters
+        self._pending_writes, self._write_waiters = {}, {}
+        if not writes:
+            return
+
+        results: dict[int, bool] = {}
         try:
-            return await self.hass.async_add_executor_job(self._write_register, address, value)
-        except Exception as err:
-            _LOGGER.error("Error writing to register %d: %s", address, err)
-            return False
+            results, read_back = await self._write_registers(writes)
+            results = self._confirm_writes(writes, results, read_back)
+        finally:
+            for address, futures in waiters.items():
+                for future in futures:
+                    if not future.done():
+                        future.set_result(results.get(address, False))
+
+    async def _write_registers(self, writes: dict[int, int]) -> tuple[dict[int, bool], dict[int, int]]:
+        """Write several holding registers and read each one back while holding the connection once."""
+        results: dict[int, bool] = {}
+        read_back: dict[int, int] = {}
+        async with self._connection.lock:
+            for address, value in writes.items():
+                try:
+                    results[address] = await self._write_register(address, value)
+                    if results[address]:
+                        result = await self._read_register_with_retry("holding", address)
+                        if result is not None and not result.isError():
+                            read_back[address] = result.registers[0]
+                except Exception as err:
+                    _LOGGER.error("Error writing to register %d: %s", address, err)
+                    results.setdefault(address, False)
+        return results, read_back
+
+    @callback
+    def _confirm_writes(self, writes: dict[int, int], results: dict[int, bool], read_back: dict[int, int]) -> dict[int, bool]:
+        """Replace optimistic values with the read-back values, rolling back failed writes."""
+        confirmed: dict[str, Any] = {}
+        for address, value in writes.items():
+            success = results.get(address, False)
+            field = find_field("holding", address)
+            if field is None:
+                continue
+
+            if address in read_back:
+                if read_back[address] != value:
+                    _LOGGER.warning("Register %d reads back %d after writing %d", address, read_back[address], value)
+                    success = False
+                confirmed.update(decode_block(span_block("holding", address), [read_back[address]]))
+            elif success:
+                # Write was acknowledged but not read back, confirm it on the next poll of its tier
+                self._scheduler.forced_tiers.add(field.tier)
+            else:
+                confirmed[field.key] = self._write_rollback.get(address)
+
+            results[address] = success
+            if address not in self._pending_writes:
+                # A newer queued write keeps its own optimistic value and rollback point
+                self._write_rollback.pop(address, None)
+                self._optimistic.pop(field.key, None)
+            else:
+                confirmed.pop(field.key, None)
+
+        if confirmed and self.data is not None:
+            self.data = {**self.data, **confirmed}
+            self.async_update_listeners()
 
-    def _write_register(self, address: int, value: int) -> bool:
-        """Write to a holding register synchronously with retry logic."""
+        return results
+
+    async def _write_register(self, address: int, value: int) -> bool:
+        """Write to a holding register with retry logic; caller must hold the connection lock."""
         retries = 2
         for attempt in range(retries + 1):
             try:
-                client = ModbusTcpClient(host=self.host, port=self.port, timeout=5)
-                if not client.connect():
-                    _LOGGER.debug("Write connection attempt %d failed", attempt + 1)
-                    if attempt < retries:
-                        time.sleep(0.1)
-                        continue
-                    return False
+                client = await self._connection.async_get_client()
+            except modbus_errors() as err:
+                _LOGGER.debug("Write connection attempt %d failed: %s", attempt + 1, err)
+                if attempt < retries:
+                    await asyncio.sleep(0.1)
+                    continue
+                return False
 
-                result = client.write_register(address=address, value=value)
-                client.close()
+            try:
+                result = await client.write_register(address=address, value=value, device_id=self.slave_id)
+                self._connection.touch()
 
                 if not result.isError():
                     return True
                 else:
                     _LOGGER.debug("Write attempt %d failed: %s", attempt + 1, result)
 
-            except (OSError, ConnectionError, ModbusException) as err:
+            except modbus_errors() as err:
                 if "broken pipe" in str(err).lower() or "connection" in str(err).lower():
                     _LOGGER.debug("Connection issue writing register %d (attempt %d): %s", address, attempt + 1, err)
+                    self._connection.close()
                     if attempt < retries:
-                        time.sleep(0.1)
+                        await asyncio.sleep(0.1)
                         continue
                 else:
                     _LOGGER.error("Error writing register %d: %s", address, err)
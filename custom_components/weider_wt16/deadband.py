@@ -0,0 +1,82 @@
+"""Deadband filtering of state writes for Weider WT16 Heat Pump."""
+
+from __future__ import annotations
+
+import math
+from typing import Any
+
+from .metrics import COP_KEY, HEAT_ENERGY_KEY, SEASONAL_COP_KEY, THERMAL_POWER_KEY
+from .registers import REGISTER_FIELDS
+
+# Change in Kelvin below which a measured temperature is not written again
+TEMPERATURE_DEADBAND = 0.2
+
+# Sensors that jitter more than one resolution step, plus the non-temperature values
+DEADBAND_OVERRIDES = {
+    "wp1_ueberhitzung": 0.5,
+    "wp1_ueberhitzung_evi": 0.5,
+    "wp1_sauggas_temperatur": 0.5,
+    "wp1_sauggas_evi_temperatur": 0.5,
+    "wp1_verdampfer_temperatur": 0.5,
+    "wp1_heissgas_temperatur": 0.5,
+    "wp1_verfluessigungsdruck_evi": 0.05,
+    "wp1_volumenstrom": 1,
+    THERMAL_POWER_KEY: 0.1,
+    HEAT_ENERGY_KEY: 0.1,
+    COP_KEY: 0.1,
+    SEASONAL_COP_KEY: 0.01,
+}
+
+# Measured temperatures get the common deadband, setpoints and states are written on every change
+SENSOR_DEADBANDS = {
+    **{field.key: TEMPERATURE_DEADBAND for field in REGISTER_FIELDS if field.reg_type == "input" and field.data_type == "int16" and field.scale == 0.1},
+    **DEADBAND_OVERRIDES,
+}
+
+# Tolerance for float representation, 21.5 - 21.3 is slightly below 0.2
+EPSILON = 1e-6
+
+
+def parse_deadbands(text: str) -> dict[str, float]:
+    """Parse 'key=0.5, other_key=1' into deadbands, raising ValueError on bad input."""
+    deadbands: dict[str, float] = {}
+    for part in text.replace("\n", ",").split(","):
+        part = part.strip()
+        if not part:
+            continue
+        key, separator, value = part.partition("=")
+        key = key.strip()
+        if not separator or (key not in SENSOR_DEADBANDS and not any(field.key == key for field in REGISTER_FIELDS)):
+            raise ValueError(f"Invalid deadband entry: {part}")
+        deadbands[key] = float(value)
+        if deadbands[key] < 0 or math.isnan(deadbands[key]):
+            raise ValueError(f"Invalid deadband entry: {part}")
+    return deadbands
+
+
+class DeadbandFilter:
+    """Decide whether a changed value is worth a state write.
+
+    A numeric value is written when it moved by at least its deadband since
+    the last written value, or when max_interval seconds passed since that
+    write. A max_interval of 0 disables the filter.
+    """
+
+    def __init__(self, overrides: dict[str, float] | None = None, max_interval: float = 0) -> None:
+        """Initialize the filter."""
+        self.configure(overrides, max_interval)
+
+    def configure(self, overrides: dict[str, float] | None, max_interval: float) -> None:
+        """Apply per-key deadband overrides and the maximum write interval."""
+        self.deadbands = {**SENSOR_DEADBANDS, **(overrides or {})}
+        self.max_interval = max_interval
+
+    def significant(self, key: str, old: Any, new: Any, age: float) -> bool:
+        """Return true if new differs enough from the last written value old, written age seconds ago."""
+        if new == old:
+            return False
+        if self.max_interval <= 0 or age >= self.max_interval:
+            return True
+        if isinstance(old, bool) or isinstance(new, bool) or not isinstance(old, (int, float)) or not isinstance(new, (int, float)):
+            return True
+        return abs(new - old) >= self.deadbands.get(key, 0) - EPSILON
@@ -0,0 +1,66 @@
+"""Diagnostics support for Weider WT16 Heat Pump."""
+
+from __future__ import annotations
+
+import time
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN, CONF_HOST
+
+TO_REDACT = {CONF_HOST}
+
+
+async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: ConfigEntry) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    scheduler = coordinator._scheduler  # pylint: disable=protected-access
+    breaker = coordinator._breaker  # pylint: disable=protected-access
+
+    return {
+        "entry": {
+            "data": async_redact_data(dict(entry.data), TO_REDACT),
+            "options": async_redact_data(dict(entry.options), TO_REDACT),
+        },
+        "unit": {
+            "slave_id": coordinator.slave_id,
+            "shared_connection_users": coordinator._connection.users,  # pylint: disable=protected-access
+            "unsupported_registers": sorted(coordinator.unsupported),
+        },
+        "poll": {
+            "last_update_success": coordinator.last_update_success,
+            "last_poll_duration": coordinator.last_poll_duration,
+            "last_request_count": coordinator.last_request_count,
+            "data_age": coordinator.data_age,
+            "stale": coordinator.stale,
+            "overrun_count": coordinator.overrun_count,
+            "skipped_tick_count": coordinator.skipped_tick_count,
+            "last_dropped_reads": coordinator.last_dropped_reads,
+            **coordinator.stats.as_dict(),
+        },
+        "scheduler": {
+            "tick": scheduler.tick,
+            "active": scheduler.active,
+            "tier_intervals": {tier: scheduler.interval(tier) for tier in scheduler.tier_intervals},
+        },
+        "circuit_breaker": {
+            "is_open": breaker.is_open,
+            "failures": breaker.failures,
+            "retry_delay": breaker.retry_delay,
+        },
+        "quarantine": coordinator.quarantine.as_dict(time.monotonic()),
+        "history": {
+            "samples": coordinator.history.size,
+            "capacity": coordinator.history.capacity,
+            "memory_bytes": coordinator.history.memory_usage,
+        },
+        "long_term_statistics": {
+            "enabled": coordinator.long_term is not None,
+            "last_compiled_hour": coordinator.long_term.last_compiled if coordinator.long_term is not None else None,
+        },
+        "raw_registers": coordinator.stats.register_dump(),
+        "data": coordinator.data,
+    }
@@ -0,0 +1,53 @@
+"""Register capability discovery for Weider WT16 Heat Pump."""
+
+from __future__ import annotations
+
+import logging
+from typing import Any
+
+from .const import PERMANENT_EXCEPTION_CODES
+from .registers import field_spans, find_field, plan_block_reads, split_block
+
+_LOGGER = logging.getLogger(__name__)
+
+# Client methods reading each register type
+READ_METHODS = {
+    "discrete": "read_discrete_inputs",
+    "input": "read_input_registers",
+    "holding": "read_holding_registers",
+}
+
+
+async def async_discover_unsupported(client: Any, device_id: int, max_gap: int) -> list[str]:
+    """Probe which fields a unit answers and return the keys of those it rejects.
+
+    Every register type is read in planned blocks. A block answered with a
+    Modbus exception is split at its widest gap until single fields remain,
+    so a variant without the EVI block costs a few extra requests, not one
+    per field. Only an illegal function or address response marks a field
+    unsupported. Connection errors and timeouts propagate, and any other
+    exception response, e.g. a gateway whose unit does not answer or a busy
+    unit, aborts the scan with ConnectionError.
+    """
+    unsupported: list[str] = []
+    requests = 0
+    for reg_type, method in READ_METHODS.items():
+        pending = plan_block_reads(reg_type, field_spans(reg_type), max_gap)
+        while pending:
+            block = pending.pop(0)
+            requests += 1
+            result = await getattr(client, method)(address=block.address, count=block.count, device_id=device_id)
+            if not result.isError():
+                continue
+            if result.exception_code not in PERMANENT_EXCEPTION_CODES:
+                raise ConnectionError(f"Unit {device_id} answered {reg_type} {block.address}+{block.count} with {result}, scan aborted")
+
+            parts = split_block(block)
+            if parts:
+                pending[:0] = parts
+            elif (field := find_field(reg_type, block.address)) is not None:
+                _LOGGER.debug("Unit %d rejects %s register %d (%s): %s", device_id, reg_type, block.address, field.key, result)
+                unsupported.append(field.key)
+
+    _LOGGER.debug("Discovery of unit %d took %d requests, %d fields unsupported", device_id, requests, len(unsupported))
+    return sorted(unsupported)
@@ -0,0 +1,112 @@
+"""In-memory poll history for Weider WT16 Heat Pump."""
+
+from __future__ import annotations
+
+import math
+from array import array
+from typing import Any
+
+from .registers import REGISTER_FIELDS
+
+# Keys with a numeric or binary value, strings are not kept
+HISTORY_KEYS = tuple(field.key for field in REGISTER_FIELDS if field.data_type != "string")
+
+
+class PollHistory:
+    """Fixed-size ring buffer of every polled value.
+
+    Timestamps are kept in one array of doubles and each key in its own
+    array of 32-bit floats, with NaN for a value missing from a poll, so
+    memory is allocated once and stays at capacity * (8 + 4 * keys) bytes.
+    Range queries use binary search on the timestamps.
+    """
+
+    def __init__(self, capacity: int, keys: tuple[str, ...] = HISTORY_KEYS) -> None:
+        """Initialize the buffers."""
+        self.capacity = capacity
+        self.keys = keys
+        self._times = array("d", bytes(8 * capacity))
+        self._values = {key: array("f", [math.nan]) * capacity for key in keys}
+        self._start = 0
+        self.size = 0
+
+    @property
+    def memory_usage(self) -> int:
+        """Return the bytes held by the buffers."""
+        return self._times.itemsize * len(self._times) + sum(values.itemsize * len(values) for values in self._values.values())
+
+    def append(self, timestamp: float, data: dict[str, Any]) -> None:
+        """Store one poll, overwriting the oldest when full; timestamps must not decrease."""
+        if self.size < self.capacity:
+            index = (self._start + self.size) % self.capacity
+            self.size += 1
+        else:
+            index = self._start
+            self._start = (self._start + 1) % self.capacity
+
+        self._times[index] = timestamp
+        for key, values in self._values.items():
+            value = data.get(key)
+            values[index] = math.nan if value is None else float(value)
+
+    def clear(self) -> None:
+        """Drop all samples."""
+        self._start = 0
+        self.size = 0
+
+    def _physical(self, position: int) -> int:
+        """Return the array index of the sample at a chronological position."""
+        return (self._start + position) % self.capacity
+
+    def _bisect(self, timestamp: float) -> int:
+        """Return the chronological position of the first sample at or after timestamp."""
+        low, high = 0, self.size
+        while low < high:
+            middle = (low + high) // 2
+            if self._times[self._physical(middle)] < timestamp:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def _positions(self, start: float | None, end: float | None) -> range:
+        """Return the chronological positions within [start, end]."""
+        first = 0 if start is None else self._bisect(start)
+        last = self.size if end is None else self._bisect(math.nextafter(end, math.inf))
+        return range(first, last)
+
+    def range(self, key: str, start: float | None = None, end: float | None = None) -> list[tuple[float, float]]:
+        """Return (timestamp, value) pairs of a key between start and end, skipping missing values."""
+        values = self._values[key]
+        samples = []
+        for position in self._positions(start, end):
+            index = self._physical(position)
+            value = values[index]
+            if not math.isnan(value):
+                # Undo float32 representation noise such as 21.399999618
+                samples.append((self._times[index], round(value, 4)))
+        return samples
+
+    def downsample(self, key: str, start: float, end: float, buckets: int) -> list[dict[str, float]]:
+        """Return min, mean and max of a key in equal time buckets between start and end, omitting empty ones."""
+        if buckets <= 0 or end <= start:
+            return []
+
+        width = (end - start) / buckets
+        counts = [0] * buckets
+        sums = [0.0] * buckets
+        minimums = [math.inf] * buckets
+        maximums = [-math.inf] * buckets
+
+        for timestamp, value in self.range(key, start, end):
+            bucket = min(buckets - 1, int((timestamp - start) / width))
+            counts[bucket] += 1
+            sums[bucket] += value
+            minimums[bucket] = min(minimums[bucket], value)
+            maximums[bucket] = max(maximums[bucket], value)
+
+        return [
+            {"time": start + (bucket + 0.5) * width, "min": minimums[bucket], "mean": round(sums[bucket] / counts[bucket], 4), "max": maximums[bucket]}
+            for bucket in range(buckets)
+            if counts[bucket]
+        ]
@@ -0,0 +1,128 @@
+"""Hourly long-term statistics compiled from the polled values of Weider WT16 Heat Pump."""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass, field
+from typing import Any
+
+from homeassistant.const import UnitOfEnergy, UnitOfPower, UnitOfPressure, UnitOfTemperature, UnitOfVolumeFlowRate
+
+from .metrics import COP_KEY, HEAT_ENERGY_KEY, MAX_INTEGRATION_GAP, THERMAL_POWER_KEY
+from .registers import REGISTER_FIELDS
+
+HOUR = 3600
+
+# Keys compiled to hourly mean, min and max, with their units
+MEAN_STATISTICS: dict[str, str | None] = {
+    **{field.key: UnitOfTemperature.CELSIUS for field in REGISTER_FIELDS if field.reg_type == "input" and field.data_type == "int16" and field.scale == 0.1},
+    "wp1_verfluessigungsdruck_evi": UnitOfPressure.BAR,
+    "wp1_volumenstrom": UnitOfVolumeFlowRate.LITERS_PER_MINUTE,
+    THERMAL_POWER_KEY: UnitOfPower.KILO_WATT,
+    COP_KEY: None,
+}
+
+# Increasing totals compiled to their hourly state and sum
+SUM_STATISTICS: dict[str, str | None] = {
+    HEAT_ENERGY_KEY: UnitOfEnergy.KILO_WATT_HOUR,
+}
+
+
+@dataclass
+class _MeanAccumulator:
+    """Time-weighted running mean, min and max of one key within an hour."""
+
+    weighted_sum: float = 0.0
+    seconds: float = 0.0
+    minimum: float = math.inf
+    maximum: float = -math.inf
+
+    def add(self, value: float, seconds: float) -> None:
+        """Hold value for seconds."""
+        self.weighted_sum += value * seconds
+        self.seconds += seconds
+        self.minimum = min(self.minimum, value)
+        self.maximum = max(self.maximum, value)
+
+
+@dataclass
+class CompiledHour:
+    """Statistics of one completed hour, keyed like the recorder's statistic rows."""
+
+    start: float
+    means: dict[str, dict[str, float]] = field(default_factory=dict)
+    sums: dict[str, float] = field(default_factory=dict)
+
+
+class HourlyStatistics:
+    """Compile hourly statistics incrementally from each poll.
+
+    Every value is held from its poll until the next one, as the recorder
+    does for state rows, and a value spanning an hour boundary is split
+    between both hours. Gaps longer than MAX_INTEGRATION_GAP, e.g. while
+    the heat pump is unreachable, are not counted. The hour in progress is
+    kept in memory only and is dropped on restart.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the accumulators."""
+        self._hour: float | None = None
+        self._last_time: float | None = None
+        self._last: dict[str, float] = {}
+        self._means: dict[str, _MeanAccumulator] = {}
+        self._sums: dict[str, float] = {}
+        self.last_compiled: float | None = None
+
+    def add(self, timestamp: float, data: dict[str, Any]) -> list[CompiledHour]:
+        """Add one poll at a UNIX timestamp and return the hours it completed."""
+        completed: list[CompiledHour] = []
+        hour = timestamp - timestamp % HOUR
+
+        if self._hour is None or self._last_time is None or timestamp - self._last_time > MAX_INTEGRATION_GAP:
+            # First poll or after a gap: the held values are stale, only close the hour they belong to
+            if self._hour is not None and self._hour < hour:
+                completed.append(self._compile())
+        else:
+            elapsed_from = self._last_time
+            while self._hour < hour:
+                # Held values cover the rest of the open hour, then that hour is complete
+                self._hold(self._hour + HOUR - elapsed_from)
+                elapsed_from = self._hour + HOUR
+                completed.append(self._compile())
+                self._hour += HOUR
+            self._hold(timestamp - elapsed_from)
+
+        self._hour = hour
+        self._last_time = timestamp
+        self._last = {key: float(data[key]) for key in MEAN_STATISTICS if data.get(key) is not None}
+        for key, value in self._last.items():
+            # The new value is part of the extremes even before it has been held
+            self._means.setdefault(key, _MeanAccumulator()).add(value, 0)
+        for key in SUM_STATISTICS:
+            if data.get(key) is not None:
+                self._sums[key] = float(data[key])
+
+        if completed:
+            self.last_compiled = completed[-1].start
+        return [hour for hour in completed if hour.means or hour.sums]
+
+    def _hold(self, seconds: float) -> None:
+        """Add the last polled values for seconds to the open hour."""
+        if seconds <= 0:
+            return
+        for key, value in self._last.items():
+            self._means.setdefault(key, _MeanAccumulator()).add(value, seconds)
+
+    def _compile(self) -> CompiledHour:
+        """Return the statistics of the open hour and start a new one."""
+        compiled = CompiledHour(self._hour)
+        for key, accumulator in self._means.items():
+            if accumulator.seconds > 0:
+                compiled.means[key] = {
+                    "mean": round(accumulator.weighted_sum / accumulator.seconds, 3),
+                    "min": accumulator.minimum,
+                    "max": accumulator.maximum,
+                }
+        compiled.sums = dict(self._sums)
+        self._means = {}
+        return compiled
@@ -0,0 +1,84 @@
+"""Derived thermal metrics for Weider WT16 Heat Pump."""
+
+from __future__ import annotations
+
+from typing import Any
+
+# Heat carried by one litre of heating water per kelvin, at typical flow temperatures (kJ)
+VOLUMETRIC_HEAT_CAPACITY = 4.16
+
+# Longest gap between two polls that is still integrated, longer gaps are skipped (seconds)
+MAX_INTEGRATION_GAP = 900
+
+# Electrical power below which no instantaneous COP is reported, e.g. standby (W)
+MIN_COP_POWER = 50
+
+FLOW_KEY = "wp1_volumenstrom"
+SUPPLY_KEY = "wp1_vorlauf_ist_temperatur"
+RETURN_KEY = "wp1_ruecklauf_ist_temperatur"
+
+# Keys added to the coordinator data
+THERMAL_POWER_KEY = "thermische_leistung"
+HEAT_ENERGY_KEY = "waermemenge"
+COP_KEY = "cop"
+SEASONAL_COP_KEY = "cop_gesamt"
+
+
+class ThermalMetrics:
+    """Thermal power, heat energy and COP, updated incrementally from each poll.
+
+    Energies are integrated with the trapezoidal rule between consecutive
+    polls, so a poll costs a constant amount of work. Only positive thermal
+    power counts as produced heat, defrost cycles do not reduce the total.
+    The seasonal COP uses its own heat total, integrated only over polls
+    with an electrical power reading, so it compares like with like.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the accumulators."""
+        self.heat_energy = 0.0
+        self.electric_energy = 0.0
+        self.cop_heat_energy = 0.0
+        self._last: tuple[float, float, float | None] | None = None
+
+    def restore(self, stored: dict[str, Any]) -> None:
+        """Restore the accumulators saved before a restart."""
+        self.heat_energy = float(stored.get("heat_energy", 0.0))
+        self.electric_energy = float(stored.get("electric_energy", 0.0))
+        self.cop_heat_energy = float(stored.get("cop_heat_energy", 0.0))
+
+    def as_dict(self) -> dict[str, float]:
+        """Return the accumulators to persist."""
+        return {"heat_energy": self.heat_energy, "electric_energy": self.electric_energy, "cop_heat_energy": self.cop_heat_energy}
+
+    def update(self, data: dict[str, Any], now: float, electric_power: float | None) -> dict[str, Any]:
+        """Integrate one poll and return the derived values in kW, kWh and as ratios."""
+        flow, supply, ret = data.get(FLOW_KEY), data.get(SUPPLY_KEY), data.get(RETURN_KEY)
+        if flow is None or supply is None or ret is None:
+            self._last = None
+            return {}
+
+        thermal_power = flow / 60 * VOLUMETRIC_HEAT_CAPACITY * (supply - ret)
+
+        if self._last is not None:
+            last_time, last_thermal, last_electric = self._last
+            elapsed = now - last_time
+            if 0 < elapsed <= MAX_INTEGRATION_GAP:
+                hours = elapsed / 3600
+                heat = (max(0.0, last_thermal) + max(0.0, thermal_power)) / 2 * hours
+                self.heat_energy += heat
+                if electric_power is not None and last_electric is not None:
+                    self.electric_energy += (last_electric + electric_power) / 2 * hours
+                    self.cop_heat_energy += heat
+        self._last = (now, thermal_power, electric_power)
+
+        cop = None
+        if electric_power is not None and electric_power * 1000 >= MIN_COP_POWER:
+            cop = round(max(0.0, thermal_power) / electric_power, 2)
+
+        return {
+            THERMAL_POWER_KEY: round(thermal_power, 2),
+            HEAT_ENERGY_KEY: round(self.heat_energy, 3),
+            COP_KEY: cop,
+            SEASONAL_COP_KEY: round(self.cop_heat_energy / self.electric_energy, 2) if self.electric_energy > 0 else None,
+        }
@@ -0,0 +1,165 @@
+"""Pipelined Modbus TCP client for Weider WT16 Heat Pump."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import struct
+
+_LOGGER = logging.getLogger(__name__)
+
+MBAP_HEADER = struct.Struct(">HHHB")
+
+# Function codes used by the integration
+READ_DISCRETE_INPUTS = 0x02
+READ_HOLDING_REGISTERS = 0x03
+READ_INPUT_REGISTERS = 0x04
+WRITE_SINGLE_REGISTER = 0x06
+
+
+class PipelineResponse:
+    """Decoded response PDU with the attributes the coordinator uses from pymodbus responses."""
+
+    def __init__(self, function_code: int, registers: list[int] | None = None, bits: list[bool] | None = None, exception_code: int | None = None) -> None:
+        """Initialize the response."""
+        self.function_code = function_code
+        self.registers = registers or []
+        self.bits = bits or []
+        self.exception_code = exception_code
+
+    def isError(self) -> bool:  # noqa: N802 - mirrors the pymodbus response API
+        """Return true for a Modbus exception response."""
+        return self.exception_code is not None
+
+    def __str__(self) -> str:
+        """Return a short description."""
+        if self.exception_code is not None:
+            return f"Exception response {self.function_code | 0x80} / {self.exception_code}"
+        return f"Response {self.function_code}"
+
+
+class PipelinedModbusTcpClient:
+    """Modbus TCP client keeping up to window requests in flight on one socket.
+
+    Requests are sent without waiting for earlier responses and responses are
+    matched to their requests by MBAP transaction ID, so a poll of several
+    blocks costs about one round trip instead of one per block. It implements
+    the subset of the pymodbus client API the integration uses.
+    """
+
+    def __init__(self, host: str, port: int, timeout: float, window: int) -> None:
+        """Initialize the client."""
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.window = window
+        self._slots = asyncio.Semaphore(window)
+        self._reader: asyncio.StreamReader | None = None
+        self._writer: asyncio.StreamWriter | None = None
+        self._read_task: asyncio.Task | None = None
+        self._pending: dict[int, asyncio.Future[bytes]] = {}
+        self._next_tid = 0
+
+    @property
+    def connected(self) -> bool:
+        """Return true if the socket is open."""
+        return self._writer is not None and not self._writer.is_closing()
+
+    async def connect(self) -> bool:
+        """Open the socket and start reading responses."""
+        self.close()
+        try:
+            self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+        except OSError as err:
+            _LOGGER.debug("Pipelined connection to %s:%d failed: %s", self.host, self.port, err)
+            return False
+        self._read_task = asyncio.get_running_loop().create_task(self._read_responses(self._reader))
+        return True
+
+    def close(self) -> None:
+        """Close the socket and fail all requests in flight."""
+        if self._read_task is not None:
+            self._read_task.cancel()
+            self._read_task = None
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        self._reader = None
+        self._fail_pending(ConnectionError("Connection closed"))
+
+    async def read_discrete_inputs(self, address: int, *, count: int = 1, device_id: int = 1) -> PipelineResponse:
+        """Read discrete inputs (code 0x02)."""
+        return await self._execute(device_id, struct.pack(">BHH", READ_DISCRETE_INPUTS, address, count))
+
+    async def read_holding_registers(self, address: int, *, count: int = 1, device_id: int = 1) -> PipelineResponse:
+        """Read holding registers (code 0x03)."""
+        return await self._execute(device_id, struct.pack(">BHH", READ_HOLDING_REGISTERS, address, count))
+
+    async def read_input_registers(self, address: int, *, count: int = 1, device_id: int = 1) -> PipelineResponse:
+        """Read input registers (code 0x04)."""
+        return await self._execute(device_id, struct.pack(">BHH", READ_INPUT_REGISTERS, address, count))
+
+    async def write_register(self, address: int, value: int, *, device_id: int = 1) -> PipelineResponse:
+        """Write a single holding register (code 0x06)."""
+        return await self._execute(device_id, struct.pack(">BHH", WRITE_SINGLE_REGISTER, address, value))
+
+    async def _execute(self, device_id: int, pdu: bytes) -> PipelineResponse:
+        """Send a request once a window slot is free and wait for its response."""
+        async with self._slots:
+            if not self.connected:
+                raise ConnectionError("Connection lost")
+
+            self._next_tid = self._next_tid % 0xFFFF + 1
+            tid = self._next_tid
+            future: asyncio.Future[bytes] = asyncio.get_running_loop().create_future()
+            self._pending[tid] = future
+            try:
+                self._writer.write(MBAP_HEADER.pack(tid, 0, len(pdu) + 1, device_id) + pdu)
+                await self._writer.drain()
+                async with asyncio.timeout(self.timeout):
+                    response = await future
+            except TimeoutError as err:
+                from pymodbus.exceptions import ModbusIOException  # pylint: disable=import-outside-toplevel
+
+                raise ModbusIOException(f"No response to transaction {tid} within {self.timeout} seconds") from err
+            finally:
+                self._pending.pop(tid, None)
+
+        return self._decode(pdu[0], response)
+
+    async def _read_responses(self, reader: asyncio.StreamReader) -> None:
+        """Resolve the pending request of every response by transaction ID."""
+        try:
+            while True:
+                tid, protocol_id, length, _device_id = MBAP_HEADER.unpack(await reader.readexactly(MBAP_HEADER.size))
+                response = await reader.readexactly(length - 1)
+                future = self._pending.get(tid)
+                if protocol_id != 0 or future is None or future.done():
+                    _LOGGER.debug("Dropping response with unknown transaction ID %d", tid)
+                    continue
+                future.set_result(response)
+        except (asyncio.IncompleteReadError, OSError) as err:
+            _LOGGER.debug("Pipelined connection to %s:%d lost: %s", self.host, self.port, err)
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+            self._fail_pending(ConnectionError("Connection lost"))
+
+    def _fail_pending(self, err: Exception) -> None:
+        """Fail every request still waiting for a response."""
+        for future in self._pending.values():
+            if not future.done():
+                future.set_exception(err)
+        self._pending.clear()
+
+    @staticmethod
+    def _decode(function_code: int, response: bytes) -> PipelineResponse:
+        """Decode a response PDU."""
+        if response[0] & 0x80:
+            return PipelineResponse(function_code, exception_code=response[1])
+        if function_code == READ_DISCRETE_INPUTS:
+            bits = [bool(byte >> bit & 1) for byte in response[2 : 2 + response[1]] for bit in range(8)]
+            return PipelineResponse(function_code, bits=bits)
+        if function_code in (READ_HOLDING_REGISTERS, READ_INPUT_REGISTERS):
+            return PipelineResponse(function_code, registers=list(struct.unpack_from(f">{response[1] // 2}H", response, 2)))
+        return PipelineResponse(function_code, registers=[struct.unpack_from(">H", response, 3)[0]])
@@ -0,0 +1,172 @@
+"""On-demand poll profiling for Weider WT16 Heat Pump."""
+
+from __future__ import annotations
+
+import cProfile
+import io
+import logging
+import pstats
+import time
+import tracemalloc
+from collections.abc import Iterator
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import ClassVar
+
+_LOGGER = logging.getLogger(__name__)
+
+# Stack depth recorded per allocation
+TRACEMALLOC_FRAMES = 5
+
+# Rows listed in the function and allocation tables of the report
+REPORT_ROWS = 30
+
+
+class PhaseStats:
+    """Accumulated wall time and memory of one poll phase."""
+
+    def __init__(self) -> None:
+        """Initialize the phase."""
+        self.calls = 0
+        self.seconds = 0.0
+        self.net_bytes = 0
+        self.peak_bytes = 0
+
+
+class PollProfiler:
+    """Capture cProfile and tracemalloc data for the next few polls.
+
+    The coordinator calls begin_poll and end_poll around every refresh and
+    wraps its I/O, decode and state write phases in phase(). cProfile runs
+    from the start of a poll until its entity updates went out, so it also
+    sees other event loop work interleaved with the poll's I/O waits.
+
+    Several captures may run at once, e.g. one per unit or a restarted one.
+    Allocation tracing started by a capture keeps running until the last
+    of them is stopped.
+    """
+
+    # Captures between start and stop, and whether one of them started allocation tracing
+    _active: ClassVar[int] = 0
+    _started_tracing: ClassVar[bool] = False
+
+    def __init__(self, polls: int, path: Path) -> None:
+        """Initialize the profiler."""
+        self.polls = polls
+        self.path = path
+        self.remaining = polls
+        self.phases: dict[str, PhaseStats] = {}
+        self.poll_seconds: list[float] = []
+        self._profile: cProfile.Profile | None = cProfile.Profile()
+        self.fetched = False
+        self._poll_started: float | None = None
+        self._start_snapshot: tracemalloc.Snapshot | None = None
+        self._end_snapshot: tracemalloc.Snapshot | None = None
+        self._stopped = False
+        self._started_at = datetime.now()
+
+    @property
+    def done(self) -> bool:
+        """Return true once all requested polls were captured."""
+        return self.remaining <= 0
+
+    def start(self) -> None:
+        """Start allocation tracing and take the baseline snapshot."""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+            PollProfiler._started_tracing = True
+        PollProfiler._active += 1
+        self._start_snapshot = tracemalloc.take_snapshot()
+
+    def stop(self) -> None:
+        """End the capture and take the final allocation snapshot; runs in the event loop."""
+        if self._stopped:
+            return
+        self._stopped = True
+        self.end_poll()
+        if self._start_snapshot is not None and tracemalloc.is_tracing():
+            self._end_snapshot = tracemalloc.take_snapshot().filter_traces((tracemalloc.Filter(False, tracemalloc.__file__),))
+        PollProfiler._active -= 1
+        if not PollProfiler._active and PollProfiler._started_tracing:
+            tracemalloc.stop()
+            PollProfiler._started_tracing = False
+
+    def begin_poll(self) -> None:
+        """Start profiling a poll."""
+        if self._poll_started is not None:
+            # The previous poll failed without notifying entities
+            self.end_poll()
+        if self.done:
+            return
+
+        self.fetched = False
+        self._poll_started = time.perf_counter()
+        if self._profile is not None:
+            try:
+                self._profile.enable()
+            except ValueError as err:
+                _LOGGER.warning("cProfile unavailable, reporting phase timings only: %s", err)
+                self._profile = None
+
+    def end_poll(self) -> None:
+        """Stop profiling the current poll."""
+        if self._poll_started is None:
+            return
+        if self._profile is not None:
+            self._profile.disable()
+        self.poll_seconds.append(time.perf_counter() - self._poll_started)
+        self._poll_started = None
+        self.remaining -= 1
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Measure wall time and memory of a poll phase."""
+        if self._poll_started is None:
+            yield
+            return
+
+        stats = self.phases.setdefault(name, PhaseStats())
+        current_before = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            stats.seconds += time.perf_counter() - started
+            current, peak = tracemalloc.get_traced_memory()
+            stats.calls += 1
+            stats.net_bytes += current - current_before
+            stats.peak_bytes = max(stats.peak_bytes, peak - current_before)
+
+    def write_report(self) -> None:
+        """Write the report file of a stopped capture; runs in the executor."""
+        report = self._build_report()
+        self.path.write_text(report, encoding="utf-8")
+        _LOGGER.info("Wrote profile of %d polls to %s", len(self.poll_seconds), self.path)
+
+    def _build_report(self) -> str:
+        """Return the report text."""
+        out = io.StringIO()
+        out.write(f"Weider WT16 poll profile, {len(self.poll_seconds)} polls starting {self._started_at:%Y-%m-%d %H:%M:%S}\n\n")
+
+        if self.poll_seconds:
+            out.write(f"Poll wall time: total {sum(self.poll_seconds):.4f} s, max {max(self.poll_seconds):.4f} s\n\n")
+
+        out.write("Phases (wall time includes I/O waits)\n")
+        out.write(f"{'phase':14} {'calls':>6} {'seconds':>10} {'net KiB':>10} {'peak KiB':>10}\n")
+        for name, stats in self.phases.items():
+            out.write(f"{name:14} {stats.calls:6d} {stats.seconds:10.4f} {stats.net_bytes / 1024:10.1f} {stats.peak_bytes / 1024:10.1f}\n")
+
+        if self._profile is not None and self.poll_seconds:
+            out.write(f"\nFunctions by cumulative time (top {REPORT_ROWS})\n")
+            pstats.Stats(self._profile, stream=out).sort_stats(pstats.SortKey.CUMULATIVE).print_stats(REPORT_ROWS)
+            out.write(f"\nFunctions by own time (top {REPORT_ROWS})\n")
+            pstats.Stats(self._profile, stream=out).sort_stats(pstats.SortKey.TIME).print_stats(REPORT_ROWS)
+
+        if self._start_snapshot is not None and self._end_snapshot is not None:
+            out.write(f"\nMemory growth by line since the profile started (top {REPORT_ROWS})\n")
+            for stat in self._end_snapshot.compare_to(self._start_snapshot, "lineno")[:REPORT_ROWS]:
+                out.write(f"{stat}\n")
+
+        return out.getvalue()
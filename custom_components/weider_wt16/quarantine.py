@@ -0,0 +1,94 @@
+"""Negative cache of persistently failing registers for Weider WT16 Heat Pump."""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from typing import Any
+
+_LOGGER = logging.getLogger(__name__)
+
+# Consecutive polls in which the unit must reject a field before it is quarantined
+QUARANTINE_THRESHOLD = 3
+
+# Delay before the first re-probe, doubled after every failed re-probe up to the maximum (seconds)
+REPROBE_BASE_DELAY = 300
+REPROBE_MAX_DELAY = 86400
+
+
+@dataclass
+class QuarantineEntry:
+    """Failure state of one field."""
+
+    failures: int = 0
+    since: float | None = None
+    delay: float = 0.0
+    next_probe: float = 0.0
+
+
+class RegisterQuarantine:
+    """Stop reading fields that keep failing and re-probe them with backoff.
+
+    A field the unit rejects with an illegal function or address response in
+    QUARANTINE_THRESHOLD consecutive polls is quarantined: it is left out of
+    the read plan until its next probe time. Timeouts, lost connections and
+    gateway errors are not counted, they say nothing about the field.
+    The delay before a probe starts at REPROBE_BASE_DELAY and doubles with
+    every failed probe up to REPROBE_MAX_DELAY. A successful read releases
+    the field.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the cache."""
+        self._entries: dict[str, QuarantineEntry] = {}
+
+    def __bool__(self) -> bool:
+        """Return true if any field is failing or quarantined."""
+        return bool(self._entries)
+
+    @property
+    def quarantined(self) -> frozenset[str]:
+        """Return the keys of all quarantined fields, due for a probe or not."""
+        return frozenset(key for key, entry in self._entries.items() if entry.since is not None)
+
+    def excluded(self, now: float) -> frozenset[str]:
+        """Return the keys of quarantined fields that are not due for a probe."""
+        return frozenset(key for key, entry in self._entries.items() if entry.since is not None and now < entry.next_probe)
+
+    def record_failure(self, key: str, now: float) -> None:
+        """Record a poll in which the unit rejected the field."""
+        entry = self._entries.setdefault(key, QuarantineEntry())
+        entry.failures += 1
+        if entry.since is None:
+            if entry.failures < QUARANTINE_THRESHOLD:
+                return
+            entry.since = now
+            entry.delay = REPROBE_BASE_DELAY
+            _LOGGER.warning("%s rejected in %d consecutive polls, skipping it and probing again in %d seconds", key, entry.failures, entry.delay)
+        else:
+            entry.delay = min(REPROBE_MAX_DELAY, entry.delay * 2)
+            _LOGGER.debug("%s still rejected, probing again in %d seconds", key, entry.delay)
+        entry.next_probe = now + entry.delay
+
+    def record_success(self, key: str) -> None:
+        """Release a field after a successful read."""
+        entry = self._entries.pop(key, None)
+        if entry is not None and entry.since is not None:
+            _LOGGER.info("%s answers again after %d rejected polls, reading it again", key, entry.failures)
+
+    def record_read(self, data: dict[str, Any]) -> None:
+        """Release every failing field read in this poll."""
+        for key in [key for key in self._entries if key in data]:
+            self.record_success(key)
+
+    def as_dict(self, now: float) -> dict[str, Any]:
+        """Return the failing and quarantined fields for diagnostics."""
+        return {
+            key: {
+                "failures": entry.failures,
+                "quarantined_for": round(now - entry.since, 1) if entry.since is not None else None,
+                "next_probe_in": round(max(0.0, entry.next_probe - now), 1) if entry.since is not None else None,
+                "probe_delay": entry.delay or None,
+            }
+            for key, entry in sorted(self._entries.items())
+        }
@@ -0,0 +1,315 @@
+"""Register map and block-read planning for Weider WT16 Heat Pump."""
+
+from __future__ import annotations
+
+import struct
+from dataclasses import dataclass
+from decimal import Decimal
+from functools import lru_cache
+from typing import Any
+
+# Modbus protocol limits for a single read request
+MAX_READ_REGISTERS = 125
+MAX_READ_BITS = 2000
+
+# Struct codes for fixed-size data types (big-endian register order)
+STRUCT_CODES = {
+    "int16": "h",
+    "uint16": "H",
+    "uint32": "I",
+}
+
+# Value shown when the error message registers are empty
+NO_ERROR_MESSAGE = "Keine Fehlermeldung"
+
+
+@dataclass(frozen=True)
+class RegisterField:
+    """A value decoded from one or more consecutive registers."""
+
+    key: str
+    reg_type: str
+    address: int
+    data_type: str
+    scale: float = 1
+    count: int = 1
+    tier: str = "normal"
+
+    @property
+    def decimals(self) -> int:
+        """Return the number of decimals the scale resolves to."""
+        return max(0, -Decimal(str(self.scale)).as_tuple().exponent)
+
+
+# Poll tiers: fast for operating states and refrigerant circuit values that change
+# within seconds, normal for slow-moving temperatures, slow for setpoints and runtime
+# counters, which rarely change, fault for the error text, read when fernstoerung
+# changes and otherwise only on a long fallback interval
+TIERS = ("fast", "normal", "slow", "fault")
+
+# Tiers read in the same poll whenever a value of the key they depend on changes
+DEPENDENT_TIERS = {"fernstoerung": "fault"}
+
+# Register map - with German keys
+REGISTER_FIELDS = (
+    # Discrete inputs (binary sensors)
+    RegisterField("stroemungswaechter_wp1", "discrete", 45, "bit", tier="fast"),
+    RegisterField("verdichter_wp1", "discrete", 679, "bit", tier="fast"),
+    RegisterField("up_heizen_wp1", "discrete", 680, "bit", tier="fast"),
+    RegisterField("up_sole_wasser_wp1", "discrete", 681, "bit", tier="fast"),
+    RegisterField("up_mischer_1", "discrete", 682, "bit", tier="fast"),
+    RegisterField("up_warmwasser", "discrete", 685, "bit", tier="fast"),
+    RegisterField("fernstoerung", "discrete", 686, "bit", tier="fast"),
+    RegisterField("sperre_warmwasser", "discrete", 703, "bit", tier="fast"),
+    RegisterField("sperre_heizen", "discrete", 704, "bit", tier="fast"),
+    RegisterField("evu_sperre", "discrete", 705, "bit", tier="fast"),
+    RegisterField("sgready_1", "discrete", 706, "bit", tier="fast"),
+    RegisterField("sgready_2", "discrete", 707, "bit", tier="fast"),
+    # Input registers (sensors), temperatures are "2 Byte signed" according to Weider documentation
+    # Verified working range 12-44
+    RegisterField("raum_ist_temperatur", "input", 12, "int16", 0.1),
+    RegisterField("warmwasser_ist_temperatur", "input", 13, "int16", 0.1),
+    RegisterField("vorlauf_soll_temperatur", "input", 14, "int16", 0.1),
+    RegisterField("aussentemperatur", "input", 15, "int16", 0.1),
+    RegisterField("puffer_ist_temperatur", "input", 16, "int16", 0.1),
+    RegisterField("mischer_ist_temperatur", "input", 17, "int16", 0.1),
+    RegisterField("reservefuehler_1_temperatur", "input", 18, "int16", 0.1),
+    RegisterField("reservefuehler_2_temperatur", "input", 19, "int16", 0.1),
+    RegisterField("reservefuehler_3_temperatur", "input", 20, "int16", 0.1),
+    RegisterField("abtaufuehler_ist_temperatur", "input", 21, "int16", 0.1),
+    RegisterField("wp1_vorlauf_ist_temperatur", "input", 25, "int16", 0.1, tier="fast"),
+    RegisterField("wp1_ruecklauf_ist_temperatur", "input", 26, "int16", 0.1, tier="fast"),
+    RegisterField("wp1_quelle_eintritt_temperatur", "input", 27, "int16", 0.1, tier="fast"),
+    RegisterField("wp1_quelle_austritt_temperatur", "input", 28, "int16", 0.1, tier="fast"),
+    RegisterField("wp1_ueberhitzung", "input", 29, "int16", 0.1, tier="fast"),
+    RegisterField("wp1_verdampfungstemperatur", "input", 31, "int16", 0.1, tier="fast"),
+    RegisterField("wp1_verfluessigungstemperatur", "input", 33, "int16", 0.1, tier="fast"),
+    RegisterField("wp1_verdampfer_temperatur", "input", 35, "int16", 0.1, tier="fast"),
+    RegisterField("wp1_sauggas_temperatur", "input", 36, "int16", 0.1, tier="fast"),
+    RegisterField("wp1_heissgas_temperatur", "input", 37, "int16", 0.1, tier="fast"),
+    RegisterField("wp1_sauggas_evi_temperatur", "input", 38, "int16", 0.1, tier="fast"),
+    RegisterField("wp1_verdampfungstemperatur_evi", "input", 40, "int16", 0.1, tier="fast"),
+    RegisterField("wp1_verfluessigungstemperatur_evi", "input", 42, "int16", 0.1, tier="fast"),
+    RegisterField("wp1_verfluessigungsdruck_evi", "input", 43, "int16", 0.01, tier="fast"),
+    RegisterField("wp1_volumenstrom", "input", 44, "uint16", tier="fast"),
+    RegisterField("wp1_ueberhitzung_evi", "input", 46, "int16", 0.1, tier="fast"),
+    RegisterField("mlt1_vorlauf_soll_temperatur", "input", 726, "int16", 0.1),
+    RegisterField("mlt1_vorlauf_ist_temperatur", "input", 727, "int16", 0.1),
+    RegisterField("mlt1_mischerposition", "input", 736, "int16"),
+    RegisterField("aktuelle_schritte_cl1", "input", 1008, "uint16"),
+    RegisterField("aktuelle_schritte_cl2", "input", 1048, "uint16"),
+    # Holding registers (setpoints)
+    RegisterField("warmwasser_soll_temperatur", "holding", 1, "uint16", 0.1, tier="slow"),
+    RegisterField("raum_soll_temperatur", "holding", 723, "uint16", 0.1, tier="slow"),
+    # Runtime data in minutes (32-bit, high word first)
+    RegisterField("wp1_letzte_laufzeit_pumpe", "input", 60164, "uint32", count=2, tier="slow"),
+    RegisterField("wp1_letzte_laufzeit_warmwasser", "input", 60168, "uint32", count=2, tier="slow"),
+    # Error message (string, 2 characters per register)
+    RegisterField("aktive_fehlermeldung", "input", 63000, "string", count=16, tier="fault"),
+)
+
+
+@dataclass(frozen=True)
+class ReadBlock:
+    """A single Modbus read request covering one or more register spans."""
+
+    reg_type: str
+    address: int
+    count: int
+    spans: tuple[tuple[int, int], ...]
+
+
+def max_read_count(reg_type: str) -> int:
+    """Return the largest count allowed in one read of the given register type."""
+    return MAX_READ_BITS if reg_type == "discrete" else MAX_READ_REGISTERS
+
+
+def plan_block_reads(reg_type: str, spans: list[tuple[int, int]], max_gap: int, holes: frozenset[int] = frozenset()) -> list[ReadBlock]:
+    """Merge (address, count) spans into the fewest block reads.
+
+    Neighbouring spans are merged when the number of unused addresses between
+    them is at most max_gap, none of them is a hole the device does not
+    implement, and the block stays within the protocol limit.
+    """
+    limit = max_read_count(reg_type)
+    blocks: list[ReadBlock] = []
+    current: list[tuple[int, int]] = []
+
+    for address, count in sorted(set(spans)):
+        if current:
+            start = current[0][0]
+            end = max(a + c for a, c in current)
+            if address - end <= max_gap and max(end, address + count) - start <= limit and not any(end <= hole < address for hole in holes):
+                current.append((address, count))
+                continue
+            blocks.append(_make_block(reg_type, current))
+        current = [(address, count)]
+
+    if current:
+        blocks.append(_make_block(reg_type, current))
+
+    return blocks
+
+
+def split_block(block: ReadBlock) -> list[ReadBlock]:
+    """Split a rejected block at its widest gap, or return [] for a single span."""
+    if len(block.spans) < 2:
+        return []
+
+    split_at = 1
+    widest_gap = -1
+    for index in range(1, len(block.spans)):
+        prev_address, prev_count = block.spans[index - 1]
+        gap = block.spans[index][0] - (prev_address + prev_count)
+        if gap > widest_gap:
+            widest_gap = gap
+            split_at = index
+
+    # Without any gap, halve the block so each part can be retried on its own
+    if widest_gap <= 0:
+        split_at = len(block.spans) // 2
+
+    return [
+        _make_block(block.reg_type, list(block.spans[:split_at])),
+        _make_block(block.reg_type, list(block.spans[split_at:])),
+    ]
+
+
+def span_block(reg_type: str, address: int, count: int = 1) -> ReadBlock:
+    """Build a block reading a single span."""
+    return _make_block(reg_type, [(address, count)])
+
+
+def find_field(reg_type: str, address: int) -> RegisterField | None:
+    """Return the field starting at the given address, if any."""
+    return next((field for field in REGISTER_FIELDS if field.reg_type == reg_type and field.address == address), None)
+
+
+def _make_block(reg_type: str, spans: list[tuple[int, int]]) -> ReadBlock:
+    """Build a block covering all given spans."""
+    start = spans[0][0]
+    end = max(address + count for address, count in spans)
+    return ReadBlock(reg_type, start, end - start, tuple(spans))
+
+
+class ReadPlanner:
+    """Compile register spans into block reads and remember rejected blocks."""
+
+    def __init__(self, max_gap: int, holes: dict[str, frozenset[int]] | None = None) -> None:
+        """Initialize the planner, holes are the addresses per register type that blocks must not cover."""
+        self.max_gap = max_gap
+        self.holes = holes or {}
+        self._plans: dict[tuple[str, tuple[tuple[int, int], ...], frozenset[int]], list[ReadBlock]] = {}
+
+    def plan(self, reg_type: str, spans: list[tuple[int, int]]) -> list[ReadBlock]:
+        """Return the cached block plan for the given spans and the current holes."""
+        holes = self.holes.get(reg_type, frozenset())
+        plan_key = (reg_type, tuple(sorted(set(spans))), holes)
+        if plan_key not in self._plans:
+            self._plans[plan_key] = plan_block_reads(reg_type, spans, self.max_gap, holes)
+        return list(self._plans[plan_key])
+
+    def reject(self, block: ReadBlock) -> list[ReadBlock]:
+        """Replace a block the device rejected with its split parts in all plans."""
+        parts = split_block(block)
+        if not parts:
+            return []
+
+        for blocks in self._plans.values():
+            if block in blocks:
+                index = blocks.index(block)
+                blocks[index : index + 1] = parts
+
+        return parts
+
+    def reset(self, max_gap: int | None = None) -> None:
+        """Forget all plans, optionally with a new gap threshold."""
+        if max_gap is not None:
+            self.max_gap = max_gap
+        self._plans.clear()
+
+
+def field_spans(reg_type: str, tiers: set[str] | None = None, exclude: frozenset[str] = frozenset()) -> list[tuple[int, int]]:
+    """Return the (address, count) spans of all fields of a register type, optionally limited to some tiers and without excluded keys."""
+    return [
+        (field.address, field.count)
+        for field in REGISTER_FIELDS
+        if field.reg_type == reg_type and (tiers is None or field.tier in tiers) and field.key not in exclude
+    ]
+
+
+def field_addresses(keys: frozenset[str]) -> dict[str, frozenset[int]]:
+    """Return every address covered by the fields with the given keys, per register type."""
+    addresses: dict[str, set[int]] = {}
+    for field in REGISTER_FIELDS:
+        if field.key in keys:
+            addresses.setdefault(field.reg_type, set()).update(range(field.address, field.address + field.count))
+    return {reg_type: frozenset(values) for reg_type, values in addresses.items()}
+
+
+@lru_cache(maxsize=None)
+def compile_block_decoder(block: ReadBlock) -> tuple[struct.Struct, tuple[tuple[str, str, float, int], ...]]:
+    """Compile a block into one struct layout and the fields it yields, in order.
+
+    Unused registers between fields become pad bytes, so a whole block is
+    unpacked with a single unpack_from call.
+    """
+    end = block.address + block.count
+    fields = sorted(
+        (field for field in REGISTER_FIELDS if field.reg_type == block.reg_type and block.address <= field.address and field.address + field.count <= end),
+        key=lambda field: field.address,
+    )
+
+    layout = ">"
+    position = block.address
+    decoded = []
+    for field in fields:
+        if field.address < position:
+            # Overlapping fields cannot share one layout
+            continue
+        if field.address > position:
+            layout += f"{(field.address - position) * 2}x"
+        if field.data_type == "string":
+            layout += f"{field.count * 2}s"
+        else:
+            layout += STRUCT_CODES[field.data_type]
+        position = field.address + field.count
+        decoded.append((field.key, field.data_type, field.scale, field.decimals))
+
+    return struct.Struct(layout), tuple(decoded)
+
+
+@lru_cache(maxsize=32)
+def decode_string(raw: bytes) -> str:
+    """Decode string registers, cached by raw content as the error text rarely changes."""
+    # Remove null terminators
+    text = raw.decode("utf-8", errors="ignore").rstrip("\x00")
+    return text if text else NO_ERROR_MESSAGE
+
+
+def decode_block(block: ReadBlock, raw: list[Any]) -> dict[str, Any]:
+    """Decode all fields covered by a block from the raw bits or registers it returned."""
+    if len(raw) < block.count:
+        return {}
+
+    if block.reg_type == "discrete":
+        return {
+            field.key: bool(raw[field.address - block.address])
+            for field in REGISTER_FIELDS
+            if field.reg_type == "discrete" and block.address <= field.address < block.address + block.count
+        }
+
+    layout, fields = compile_block_decoder(block)
+    buffer = struct.pack(f">{block.count}H", *raw[: block.count])
+
+    data: dict[str, Any] = {}
+    for (key, data_type, scale, decimals), value in zip(fields, layout.unpack_from(buffer)):
+        if data_type == "string":
+            data[key] = decode_string(value)
+        elif scale != 1:
+            # Round to the real resolution of the register
+            data[key] = round(value * scale, decimals)
+        else:
+            data[key] = value
+
+    return data
@@ -0,0 +1,170 @@
+"""Poll scheduling for Weider WT16 Heat Pump."""
+
+from __future__ import annotations
+
+import logging
+import random
+from typing import Any
+
+_LOGGER = logging.getLogger(__name__)
+
+# Binary states that mean the plant is running (compressor and circulation pumps)
+ACTIVITY_KEYS = (
+    "verdichter_wp1",
+    "up_heizen_wp1",
+    "up_sole_wasser_wp1",
+    "up_mischer_1",
+    "up_warmwasser",
+)
+
+# Temperatures whose rate of change marks a transient (flow, hot gas, defrost, hot water)
+RATE_KEYS = (
+    "wp1_vorlauf_ist_temperatur",
+    "wp1_heissgas_temperatur",
+    "abtaufuehler_ist_temperatur",
+    "warmwasser_ist_temperatur",
+)
+
+# Temperature change in Kelvin per minute above which the plant counts as active
+ACTIVE_RATE_THRESHOLD = 0.5
+
+# Factor the fast tier interval grows by on every idle poll
+IDLE_BACKOFF_FACTOR = 1.5
+
+# Consecutive failed polls after which full polling stops and probing starts
+CIRCUIT_BREAKER_THRESHOLD = 3
+
+# Delay before the first probe, doubled after every failed probe up to the maximum (seconds)
+PROBE_BASE_DELAY = 30
+PROBE_MAX_DELAY = 900
+
+
+class PollScheduler:
+    """Decide which register tiers are due and adapt the fast tier to plant activity.
+
+    While the compressor or a pump runs, or a watched temperature changes
+    quickly, the fast tier is polled at min_interval. On every idle poll its
+    interval backs off by IDLE_BACKOFF_FACTOR, starting from the configured
+    fast interval, until it reaches max_interval. The fast tier is never
+    polled less often than the normal tier.
+    """
+
+    def __init__(self, tier_intervals: dict[str, float], min_interval: float, max_interval: float) -> None:
+        """Initialize the scheduler."""
+        self.forced_tiers: set[str] = set()
+        self.active = False
+        self._last_read: dict[str, float] = {}
+        self._previous: dict[str, tuple[float, float]] = {}
+        self.configure(tier_intervals, min_interval, max_interval)
+
+    def configure(self, tier_intervals: dict[str, float], min_interval: float, max_interval: float) -> None:
+        """Apply new intervals and start over with every tier due."""
+        self.tier_intervals = dict(tier_intervals)
+        self.min_interval = min(min_interval, max_interval)
+        self.max_interval = max(min_interval, max_interval)
+        self.fast_interval = self._clamp(self.tier_intervals["fast"])
+        self._last_read.clear()
+
+    @property
+    def tick(self) -> float:
+        """Return the coordinator update interval in seconds."""
+        return min(self.interval(tier) for tier in self.tier_intervals)
+
+    def interval(self, tier: str) -> float:
+        """Return the current poll interval of a tier in seconds."""
+        if tier == "fast":
+            return self.fast_interval
+        return self.tier_intervals[tier]
+
+    def due_tiers(self, now: float) -> set[str]:
+        """Return the tiers whose interval has elapsed at this tick."""
+        # Allow half a tick of jitter so a tier is not pushed to the following tick
+        tolerance = self.tick / 2
+        due = set(self.forced_tiers)
+        for tier in self.tier_intervals:
+            last_read = self._last_read.get(tier)
+            if last_read is None or now - last_read >= self.interval(tier) - tolerance:
+                due.add(tier)
+        return due
+
+    def mark_read(self, tiers: set[str], now: float) -> None:
+        """Record that the given tiers were read."""
+        for tier in tiers:
+            self._last_read[tier] = now
+        self.forced_tiers -= tiers
+
+    def observe(self, data: dict[str, Any], now: float) -> None:
+        """Update the activity state and fast tier interval from a new snapshot."""
+        running = any(data.get(key) for key in ACTIVITY_KEYS)
+
+        fastest_rate = 0.0
+        for key in RATE_KEYS:
+            value = data.get(key)
+            if not isinstance(value, (int, float)):
+                continue
+            previous = self._previous.get(key)
+            if previous is not None and previous[1] != value and now > previous[0]:
+                rate = abs(value - previous[1]) / ((now - previous[0]) / 60)
+                fastest_rate = max(fastest_rate, rate)
+            if previous is None or previous[1] != value:
+                self._previous[key] = (now, value)
+
+        active = running or fastest_rate >= ACTIVE_RATE_THRESHOLD
+        if active:
+            fast_interval = self.min_interval
+        else:
+            fast_interval = self._clamp(max(self.tier_intervals["fast"], self.fast_interval * IDLE_BACKOFF_FACTOR))
+
+        if active != self.active or fast_interval != self.fast_interval:
+            _LOGGER.debug(
+                "Plant %s (running=%s, fastest change %.2f K/min), fast tier every %.0f seconds",
+                "active" if active else "idle",
+                running,
+                fastest_rate,
+                fast_interval,
+            )
+
+        self.active = active
+        self.fast_interval = fast_interval
+
+    def _clamp(self, interval: float) -> float:
+        """Limit an interval to the configured bounds and the normal tier interval."""
+        return max(self.min_interval, min(self.max_interval, self.tier_intervals["normal"], interval))
+
+
+class CircuitBreaker:
+    """Stop full polls of an unreachable heat pump and probe it with backoff.
+
+    After CIRCUIT_BREAKER_THRESHOLD consecutive failures the breaker opens.
+    While open, every update is a single probe read. The delay before the
+    next probe doubles with every failure up to PROBE_MAX_DELAY, with equal
+    jitter so several installations do not probe in lockstep.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the breaker."""
+        self.failures = 0
+        self.is_open = False
+        self.retry_delay: float | None = None
+
+    def record_failure(self) -> None:
+        """Record a failed poll or probe."""
+        self.failures += 1
+        if self.failures < CIRCUIT_BREAKER_THRESHOLD:
+            return
+
+        if not self.is_open:
+            _LOGGER.warning("Heat pump unreachable after %d attempts, pausing full polls", self.failures)
+        self.is_open = True
+
+        delay = min(PROBE_MAX_DELAY, PROBE_BASE_DELAY * 2 ** (self.failures - CIRCUIT_BREAKER_THRESHOLD))
+        self.retry_delay = delay / 2 + random.uniform(0, delay / 2)
+        _LOGGER.debug("Next probe in %.0f seconds", self.retry_delay)
+
+    def record_success(self) -> None:
+        """Close the breaker after a successful poll or probe."""
+        if self.is_open:
+            _LOGGER.info("Heat pump reachable again after %d failed attempts, resuming full polls", self.failures)
+        self.failures = 0
+        self.is_open = False
+        self.retry_delay = None
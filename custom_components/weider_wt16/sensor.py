@@ -2,6 +2,9 @@
 
 from __future__ import annotations
 
+from collections.abc import Callable
+from typing import Any
+
 from homeassistant.components.sensor import (
     SensorDeviceClass,
     SensorEntity,
@@ -9,18 +12,24 @@ from homeassistant.components.sensor import (
 )
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import (
+    UnitOfEnergy,
+    UnitOfPower,
     UnitOfTemperature,
     UnitOfPressure,
     UnitOfVolumeFlowRate,
     UnitOfTime,
     PERCENTAGE,
+    EntityCategory,
+    Platform,
 )
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.util import slugify
 
-from .const import DOMAIN, DEVICE_INFO
+from .const import DOMAIN
 from .coordinator import WeiderWT16DataUpdateCoordinator
+from .metrics import FLOW_KEY, SUPPLY_KEY, RETURN_KEY, THERMAL_POWER_KEY, HEAT_ENERGY_KEY, COP_KEY, SEASONAL_COP_KEY
 
 
 async def async_setup_entry(
@@ -255,6 +264,68 @@ async def async_setup_entry(
         ),
     ]
 
+    # Only registers the unit answered in the discovery scan
+    entities = coordinator.async_supported(Platform.SENSOR, entities, lambda entity: (entity._data_key,))  # pylint: disable=protected-access
+
+    # Derived from flow rate and the supply/return temperature spread
+    derived = [
+        WeiderWT16Sensor(
+            coordinator, THERMAL_POWER_KEY, "WP1 Thermische Leistung", UnitOfPower.KILO_WATT, SensorDeviceClass.POWER, SensorStateClass.MEASUREMENT
+        ),
+        WeiderWT16Sensor(
+            coordinator, HEAT_ENERGY_KEY, "WP1 Wärmemenge", UnitOfEnergy.KILO_WATT_HOUR, SensorDeviceClass.ENERGY, SensorStateClass.TOTAL_INCREASING
+        ),
+    ]
+
+    # COP needs the electrical power sensor configured in the options
+    if coordinator.has_power_sensor:
+        derived += [
+            WeiderWT16Sensor(coordinator, COP_KEY, "WP1 COP", None, None, SensorStateClass.MEASUREMENT),
+            WeiderWT16Sensor(coordinator, SEASONAL_COP_KEY, "WP1 COP Gesamt", None, None, SensorStateClass.MEASUREMENT),
+        ]
+
+    entities += coordinator.async_supported(Platform.SENSOR, derived, lambda entity: (FLOW_KEY, SUPPLY_KEY, RETURN_KEY))
+
+    # Poll performance diagnostics
+    entities += [
+        WeiderWT16DiagnosticSensor(
+            coordinator,
+            "poll_duration",
+            "Letzte Abfragedauer",
+            UnitOfTime.SECONDS,
+            lambda c: round(c.last_poll_duration, 3) if c.last_poll_duration is not None else None,
+        ),
+        WeiderWT16DiagnosticSensor(coordinator, "poll_round_trips", "Modbus-Anfragen pro Abfrage", None, lambda c: c.last_request_count),
+        WeiderWT16DiagnosticSensor(coordinator, "poll_retries", "Wiederholungen letzte Abfrage", None, lambda c: c.stats.retries),
+        WeiderWT16DiagnosticSensor(
+            coordinator,
+            "poll_failed_registers",
+            "Fehlgeschlagene Register",
+            None,
+            lambda c: len(c.stats.failed_registers),
+            lambda c: {"registers": c.stats.failed_registers, "quarantined": sorted(c.quarantine.quarantined)},
+        ),
+        WeiderWT16DiagnosticSensor(
+            coordinator,
+            "data_age",
+            "Datenalter",
+            UnitOfTime.SECONDS,
+            lambda c: round(c.data_age) if c.data_age is not None else None,
+            lambda c: {"stale": c.stale},
+        ),
+        WeiderWT16DiagnosticSensor(
+            coordinator, "poll_overruns", "Abfrage-Zeitüberschreitungen", None, lambda c: c.overrun_count, state_class=SensorStateClass.TOTAL_INCREASING
+        ),
+        WeiderWT16DiagnosticSensor(
+            coordinator,
+            "poll_skipped_ticks",
+            "Übersprungene Abfragetakte",
+            None,
+            lambda c: c.skipped_tick_count,
+            state_class=SensorStateClass.TOTAL_INCREASING,
+        ),
+    ]
+
     async_add_entities(entities)
 
 
@@ -271,15 +342,16 @@ class WeiderWT16Sensor(CoordinatorEntity, SensorEntity):
         state_class: SensorStateClass | None,
     ) -> None:
         """Initialize the sensor."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, context=data_key)
         self._data_key = data_key
         self._attr_name = name
         self._attr_native_unit_of_measurement = unit
         self._attr_device_class = device_class
         self._attr_state_class = state_class
-        self._attr_unique_id = f"weider_wt16_{data_key}"
-        self._attr_entity_id = f"sensor.{data_key}"
-        self._attr_device_info = DEVICE_INFO
+        self._attr_unique_id = coordinator.unique_id(data_key)
+        # The platform ignores _attr_entity_id, the slug of the name keeps the IDs it derived for the first unit
+        self.entity_id = f"sensor.{coordinator.object_id(slugify(name))}"
+        self._attr_device_info = coordinator.device_info
 
     @property
     def native_value(self) -> float | int | None:
@@ -297,15 +369,15 @@ class WeiderWT16RuntimeSensor(CoordinatorEntity, SensorEntity):
         name: str,
     ) -> None:
         """Initialize the runtime sensor."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, context=data_key)
         self._data_key = data_key
         self._attr_name = name
         self._attr_native_unit_of_measurement = None  # No unit, we'll format as string
         self._attr_device_class = None
         self._attr_state_class = None
-        self._attr_unique_id = f"weider_wt16_{data_key}"
-        self._attr_entity_id = f"sensor.{data_key}"
-        self._attr_device_info = DEVICE_INFO
+        self._attr_unique_id = coordinator.unique_id(data_key)
+        self.entity_id = f"sensor.{coordinator.object_id(slugify(name))}"
+        self._attr_device_info = coordinator.device_info
 
     @property
     def native_value(self) -> str | None:
@@ -323,3 +395,50 @@ class WeiderWT16RuntimeSensor(CoordinatorEntity, SensorEntity):
             return f"{hours}h {remaining_minutes}min"
         else:
             return f"{remaining_minutes}min"
+
+
+class WeiderWT16DiagnosticSensor(CoordinatorEntity, SensorEntity):
+    """Representation of a Weider WT16 poll performance diagnostic sensor."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+
+    def __init__(
+        self,
+        coordinator: WeiderWT16DataUpdateCoordinator,
+        key: str,
+        name: str,
+        unit: str | None,
+        value_fn: Callable[[WeiderWT16DataUpdateCoordinator], Any],
+        attributes_fn: Callable[[WeiderWT16DataUpdateCoordinator], dict[str, Any]] | None = None,
+        state_class: SensorStateClass = SensorStateClass.MEASUREMENT,
+    ) -> None:
+        """Initialize the diagnostic sensor."""
+        # No context, the poll counters change on every update
+        super().__init__(coordinator)
+        self._value_fn = value_fn
+        self._attributes_fn = attributes_fn
+        self._attr_name = name
+        self._attr_native_unit_of_measurement = unit
+        self._attr_device_class = SensorDeviceClass.DURATION if unit == UnitOfTime.SECONDS else None
+        self._attr_state_class = state_class
+        self._attr_unique_id = coordinator.unique_id(key)
+        # New entities, named after their key rather than their German name
+        self.entity_id = f"sensor.{coordinator.object_id(key)}"
+        self._attr_device_info = coordinator.device_info
+
+    @property
+    def available(self) -> bool:
+        """Return true, diagnostics stay visible while the heat pump is unreachable."""
+        return True
+
+    @property
+    def native_value(self) -> float | int | None:
+        """Return the state of the sensor."""
+        return self._value_fn(self.coordinator)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return additional diagnostic details."""
+        if self._attributes_fn is None:
+            return None
+        return self._attributes_fn(self.coordinator)
@@ -0,0 +1,106 @@
+"""Poll instrumentation for Weider WT16 Heat Pump."""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from typing import Any
+
+# Upper bounds of the request latency histogram buckets (milliseconds), the last bucket is open
+LATENCY_BUCKETS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+class LatencyHistogram:
+    """Cumulative request latency histogram with fixed buckets."""
+
+    def __init__(self) -> None:
+        """Initialize the histogram."""
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.total = 0.0
+        self.maximum = 0.0
+
+    def add(self, latency: float) -> None:
+        """Record one latency in seconds."""
+        milliseconds = latency * 1000
+        self.counts[bisect_left(LATENCY_BUCKETS, milliseconds)] += 1
+        self.total += milliseconds
+        self.maximum = max(self.maximum, milliseconds)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the histogram in a JSON friendly form."""
+        count = sum(self.counts)
+        labels = [f"<={bound}ms" for bound in LATENCY_BUCKETS] + [f">{LATENCY_BUCKETS[-1]}ms"]
+        return {
+            "count": count,
+            "mean_ms": round(self.total / count, 2) if count else None,
+            "max_ms": round(self.maximum, 2),
+            "buckets": dict(zip(labels, self.counts)),
+        }
+
+
+class PollStatistics:
+    """Counters and latencies collected by hooks in the coordinator's read path.
+
+    Requests are grouped by register type and block, for example
+    "input 12-46", so a slow or failing block stands out.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the statistics."""
+        self.histograms: dict[str, LatencyHistogram] = {}
+        self.raw_registers: dict[str, dict[int, Any]] = {}
+        self.total_requests = 0
+        self.total_retries = 0
+        self.total_failed_requests = 0
+        self.poll_count = 0
+        self.retries = 0
+        self.failed_registers: list[str] = []
+        self._poll_retries = 0
+        self._poll_failed: list[str] = []
+
+    def start_poll(self) -> None:
+        """Reset the per-poll counters."""
+        self._poll_retries = 0
+        self._poll_failed = []
+
+    def finish_poll(self) -> None:
+        """Publish the per-poll counters of the poll that just ended."""
+        self.poll_count += 1
+        self.retries = self._poll_retries
+        self.failed_registers = self._poll_failed
+
+    def record_request(self, reg_type: str, address: int, count: int, latency: float, success: bool, attempt: int) -> None:
+        """Record one Modbus request, attempt 0 being the first try."""
+        group = f"{reg_type} {address}-{address + count - 1}"
+        self.histograms.setdefault(group, LatencyHistogram()).add(latency)
+        self.total_requests += 1
+        if attempt:
+            self.total_retries += 1
+            self._poll_retries += 1
+        if not success:
+            self.total_failed_requests += 1
+
+    def record_failed(self, reg_type: str, address: int, count: int) -> None:
+        """Record a register span that could not be read at all in this poll."""
+        self._poll_failed.append(f"{reg_type} {address}" if count == 1 else f"{reg_type} {address}-{address + count - 1}")
+
+    def record_raw(self, reg_type: str, address: int, raw: list[Any]) -> None:
+        """Keep the raw values of a block read for the register dump."""
+        store = self.raw_registers.setdefault(reg_type, {})
+        for offset, value in enumerate(raw):
+            store[address + offset] = value
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the statistics in a JSON friendly form."""
+        return {
+            "poll_count": self.poll_count,
+            "total_requests": self.total_requests,
+            "total_retries": self.total_retries,
+            "total_failed_requests": self.total_failed_requests,
+            "last_poll_retries": self.retries,
+            "last_poll_failed_registers": self.failed_registers,
+            "latency_histograms": {group: histogram.as_dict() for group, histogram in sorted(self.histograms.items())},
+        }
+
+    def register_dump(self) -> dict[str, dict[str, Any]]:
+        """Return the last raw value of every register read, keyed by type and address."""
+        return {reg_type: {str(address): store[address] for address in sorted(store)} for reg_type, store in self.raw_registers.items()}
@@ -0,0 +1,205 @@
+"""Poll benchmark for the Weider WT16 coordinator against the local simulator.
+
+Starts scripts/wt16_simulator.py in a subprocess, so CPU time is the
+coordinator's own, runs a number of coordinator refreshes and reports wall
+time, Modbus round trips and CPU time per poll. Needs a Home Assistant
+development environment:
+
+    python scripts/benchmark_poll.py --polls 50 --latency 0.02 --output bench.json
+    python scripts/benchmark_poll.py --baseline bench.json --tolerance 0.25
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import socket
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+ROOT = Path(__file__).resolve().parent.parent
+SIMULATOR = ROOT / "scripts" / "wt16_simulator.py"
+sys.path.insert(0, str(ROOT))
+
+# pylint: disable=wrong-import-position
+from homeassistant.core import HomeAssistant
+
+from custom_components.weider_wt16.const import CONF_HOST, CONF_PORT, CONF_SCAN_INTERVAL, CONF_SLAVE_ID, CONF_PIPELINE_WINDOW
+from custom_components.weider_wt16.coordinator import WeiderWT16DataUpdateCoordinator
+from custom_components.weider_wt16.registers import TIERS
+
+# Metrics compared against a baseline, all lower is better
+COMPARED_METRICS = ("wall_time", "requests", "cpu_time")
+
+
+class BenchmarkEntry:
+    """Minimal config entry carrying the coordinator settings."""
+
+    def __init__(self, data: dict[str, Any]) -> None:
+        """Initialize the entry."""
+        self.entry_id = f"benchmark_{data[CONF_SLAVE_ID]}"
+        self.unique_id: str | None = None
+        self.data = data
+        self.options: dict[str, Any] = {}
+        self._on_unload: list[Any] = []
+
+    def async_on_unload(self, func: Any) -> None:
+        """Collect unload callbacks."""
+        self._on_unload.append(func)
+
+    def unload(self) -> None:
+        """Run the unload callbacks."""
+        for func in self._on_unload:
+            func()
+
+
+def _free_port() -> int:
+    """Return a free local TCP port."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def _start_simulator(port: int, args: argparse.Namespace) -> asyncio.subprocess.Process:
+    """Start the simulator subprocess and wait until it accepts connections."""
+    command = [sys.executable, str(SIMULATOR), "--port", str(port), "--units", args.units, "--latency", str(args.latency), "--jitter", str(args.jitter)]
+    if args.missing:
+        command += ["--missing", args.missing]
+    if args.concurrent:
+        command.append("--concurrent")
+    process = await asyncio.create_subprocess_exec(*command)
+
+    for _ in range(100):
+        try:
+            _reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        except OSError:
+            await asyncio.sleep(0.05)
+            continue
+        writer.close()
+        return process
+
+    process.terminate()
+    raise RuntimeError("Simulator did not start")
+
+
+def _summary(values: list[float]) -> dict[str, float]:
+    """Return min, median, p95 and max of a series."""
+    ordered = sorted(values)
+    return {
+        "min": ordered[0],
+        "median": statistics.median(ordered),
+        "p95": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))],
+        "max": ordered[-1],
+    }
+
+
+async def run_benchmark(args: argparse.Namespace) -> dict[str, Any]:
+    """Run the polls and return the collected metrics."""
+    port = _free_port()
+    simulator = await _start_simulator(port, args)
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        # One coordinator per unit, all sharing the connection to the simulator
+        entries = [
+            BenchmarkEntry({CONF_HOST: "127.0.0.1", CONF_PORT: port, CONF_SCAN_INTERVAL: 60, CONF_SLAVE_ID: int(unit), CONF_PIPELINE_WINDOW: args.window})
+            for unit in args.units.split(",")
+        ]
+        coordinators = [WeiderWT16DataUpdateCoordinator(hass, entry) for entry in entries]
+
+        samples: dict[str, list[float]] = {metric: [] for metric in COMPARED_METRICS}
+        try:
+            for poll in range(args.warmup + args.polls):
+                if not args.scheduled:
+                    for coordinator in coordinators:
+                        coordinator._scheduler.forced_tiers.update(TIERS)  # pylint: disable=protected-access
+
+                wall_start = time.perf_counter()
+                cpu_start = time.process_time()
+                await asyncio.gather(*(coordinator.async_refresh() for coordinator in coordinators))
+                wall_time = time.perf_counter() - wall_start
+                cpu_time = time.process_time() - cpu_start
+
+                if poll >= args.warmup:
+                    samples["wall_time"].append(wall_time)
+                    samples["cpu_time"].append(cpu_time)
+                    samples["requests"].append(sum(coordinator.last_request_count for coordinator in coordinators))
+        finally:
+            for coordinator, entry in zip(coordinators, entries):
+                await coordinator.async_close()
+                entry.unload()
+            await hass.async_stop(force=True)
+            simulator.terminate()
+            await simulator.wait()
+
+    return {
+        "settings": {
+            "polls": args.polls,
+            "units": args.units,
+            "window": args.window,
+            "concurrent": args.concurrent,
+            "latency": args.latency,
+            "jitter": args.jitter,
+            "missing": args.missing,
+            "scheduled": args.scheduled,
+        },
+        "keys": sum(len(coordinator.data or {}) for coordinator in coordinators),
+        **{metric: _summary(values) for metric, values in samples.items()},
+    }
+
+
+def _compare(results: dict[str, Any], baseline: dict[str, Any], tolerance: float) -> list[str]:
+    """Return a message for every median metric that regressed beyond the tolerance."""
+    regressions = []
+    for metric in COMPARED_METRICS:
+        current = results[metric]["median"]
+        previous = baseline[metric]["median"]
+        if previous > 0 and current > previous * (1 + tolerance):
+            regressions.append(f"{metric}: median {current:.4f} vs baseline {previous:.4f} (+{(current / previous - 1) * 100:.0f}%)")
+    return regressions
+
+
+def main() -> int:
+    """Parse arguments, run the benchmark and report."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--polls", type=int, default=30)
+    parser.add_argument("--warmup", type=int, default=2)
+    parser.add_argument("--latency", type=float, default=0.01, help="simulated seconds per request")
+    parser.add_argument("--jitter", type=float, default=0.0, help="random extra latency in seconds")
+    parser.add_argument("--units", default="1", help="comma separated slave IDs polled over one shared connection")
+    parser.add_argument("--window", type=int, default=1, help="requests in flight per connection, 1 disables pipelining")
+    parser.add_argument("--concurrent", action="store_true", help="let the simulator answer pipelined requests concurrently")
+    parser.add_argument("--missing", help="unsupported addresses in the simulator, e.g. input:38-46")
+    parser.add_argument("--scheduled", action="store_true", help="poll only due tiers instead of every tier")
+    parser.add_argument("--output", type=Path, help="write results as JSON")
+    parser.add_argument("--baseline", type=Path, help="fail if medians regress against this JSON result")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed relative regression")
+    args = parser.parse_args()
+
+    results = asyncio.run(run_benchmark(args))
+
+    print(f"{args.polls} polls, {results['keys']} values, latency {args.latency * 1000:.0f} ms")
+    for metric in COMPARED_METRICS:
+        summary = results[metric]
+        print(f"  {metric:10} " + "  ".join(f"{name} {value:.4f}" for name, value in summary.items()))
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+
+    if args.baseline:
+        regressions = _compare(results, json.loads(args.baseline.read_text(encoding="utf-8")), args.tolerance)
+        for message in regressions:
+            print(f"REGRESSION {message}")
+        if regressions:
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,154 @@
+"""Import time benchmark for the Weider WT16 integration modules.
+
+Imports every module of the integration in a fresh interpreter with
+python -X importtime, after the Home Assistant modules that are loaded
+before any integration, and reports the time each module adds in the
+order Home Assistant loads them. Needs a Home Assistant development
+environment:
+
+    python scripts/import_time.py --runs 5 --output imports.json
+    python scripts/import_time.py --budget 40 --module-budget 20
+
+The script exits with an error if the median total, or the median of any
+module, exceeds its budget. tests/test_import_time.py runs the same check
+with the default budgets when WT16_IMPORT_TIME=1 is set.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any
+
+ROOT = Path(__file__).resolve().parent.parent
+PACKAGE = "custom_components.weider_wt16"
+
+# Loaded by Home Assistant before it sets up the integration, not counted
+PRELOADED = (
+    "homeassistant.core",
+    "homeassistant.config_entries",
+    "homeassistant.helpers.config_validation",
+    "homeassistant.helpers.entity_platform",
+    "homeassistant.helpers.storage",
+    "homeassistant.helpers.update_coordinator",
+    "homeassistant.components.sensor",
+    "homeassistant.components.binary_sensor",
+    "homeassistant.components.climate",
+)
+
+# Integration modules in the order Home Assistant imports them: the package, its
+# preloaded platforms, then the entity platforms
+MODULES = ("", "config_flow", "diagnostics", "sensor", "binary_sensor", "climate")
+
+# Import time budgets in milliseconds, pymodbus alone takes longer than the module budget
+DEFAULT_BUDGET = 50.0
+DEFAULT_MODULE_BUDGET = 25.0
+
+# Marks the end of the preloaded imports in the importtime output
+MARKER = "weider_wt16 import time marker"
+
+
+def _measure(module: str, env: dict[str, str]) -> dict[str, Any]:
+    """Import module after the preloaded and earlier integration modules and return what it added in milliseconds."""
+    earlier = MODULES[: MODULES.index(module)]
+    preload = [*PRELOADED, *(f"{PACKAGE}.{name}" if name else PACKAGE for name in earlier)]
+    target = f"{PACKAGE}.{module}" if module else PACKAGE
+    code = "; ".join(
+        [
+            f"import sys; sys.path.insert(0, {str(ROOT)!r})",
+            *(f"import {name}" for name in preload),
+            f"sys.stderr.write({MARKER!r} + '\\n')",
+            f"import {target}",
+        ]
+    )
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code], capture_output=True, text=True, check=False, env=env)
+    if result.returncode:
+        raise RuntimeError(f"Importing {target} failed:\n{result.stderr.strip().splitlines()[-1]}")
+
+    lines = result.stderr.split(MARKER, 1)[1].splitlines()
+    total = 0
+    imports = []
+    for line in lines:
+        # "import time: <self us> | <cumulative us> | <module>", the header line has no numbers
+        fields = line.removeprefix("import time:").split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue
+        self_time, cumulative = int(fields[0]), int(fields[1])
+        # One space after the separator, then two more per nesting level
+        name = fields[2][1:]
+        if not name.startswith(" "):
+            # Top-level imports, their cumulative time includes everything below them
+            total += cumulative
+        imports.append((self_time, name.strip()))
+
+    heaviest = sorted(imports, reverse=True)[:5]
+    return {"total": total / 1000, "heaviest": [{"module": name, "self": self_time / 1000} for self_time, name in heaviest]}
+
+
+def run(runs_per_module: int) -> dict[str, Any]:
+    """Measure every module runs_per_module times and return the medians."""
+    results: dict[str, Any] = {}
+    with tempfile.TemporaryDirectory() as cache:
+        # Home Assistant imports cached bytecode, so a first import of everything fills a
+        # temporary cache, even with PYTHONDONTWRITEBYTECODE set, and compiling is not measured
+        env = {key: value for key, value in os.environ.items() if key != "PYTHONDONTWRITEBYTECODE"}
+        env["PYTHONPYCACHEPREFIX"] = cache
+        _measure(MODULES[-1], env)
+
+        for module in MODULES:
+            runs = [_measure(module, env) for _ in range(runs_per_module)]
+            median = statistics.median(run["total"] for run in runs)
+            heaviest = min(runs, key=lambda run: abs(run["total"] - median))["heaviest"]
+            results[module or "__init__"] = {"median": round(median, 2), "heaviest": heaviest}
+    results["total"] = round(sum(result["median"] for result in results.values()), 2)
+    return results
+
+
+def over_budget(results: dict[str, Any], budget: float, module_budget: float) -> list[str]:
+    """Return a message for the total and every module whose median exceeds its budget, 0 disables a budget."""
+    messages = []
+    if budget and results["total"] > budget:
+        messages.append(f"Total import time {results['total']:.2f} ms exceeds the budget of {budget:.2f} ms")
+    if module_budget:
+        for module, result in results.items():
+            if module != "total" and result["median"] > module_budget:
+                messages.append(f"Import time of {module} {result['median']:.2f} ms exceeds the budget of {module_budget:.2f} ms")
+    return messages
+
+
+def main() -> int:
+    """Run the benchmark and check the budgets."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="interpreters started per module, the median is reported")
+    parser.add_argument("--budget", type=float, default=DEFAULT_BUDGET, help="maximum median import time of all modules together in milliseconds, 0 disables")
+    parser.add_argument(
+        "--module-budget", type=float, default=DEFAULT_MODULE_BUDGET, help="maximum median import time of any single module in milliseconds, 0 disables"
+    )
+    parser.add_argument("--output", type=Path, help="write the results as JSON")
+    args = parser.parse_args()
+
+    results = run(args.runs)
+    for module, result in results.items():
+        if module == "total":
+            continue
+        heaviest = ", ".join(f"{entry['module']} {entry['self']:.1f}" for entry in result["heaviest"])
+        print(f"{module:20} {result['median']:8.2f} ms   heaviest: {heaviest}")
+    print(f"{'total':20} {results['total']:8.2f} ms")
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2), encoding="utf-8")
+
+    messages = over_budget(results, args.budget, args.module_budget)
+    for message in messages:
+        print(message)
+    return 1 if messages else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
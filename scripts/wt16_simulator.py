@@ -0,0 +1,321 @@
+"""Modbus TCP simulator of the Weider WT16 register map.
+
+Serves the discrete inputs, input registers and holding registers the
+integration polls, with configurable response latency, unsupported or busy
+address ranges per register type and slowly drifting temperatures. Runs
+without Home Assistant:
+
+    python scripts/wt16_simulator.py --port 5020 --latency 0.02 --missing input:38-46
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import importlib.util
+import logging
+import random
+import struct
+import sys
+from pathlib import Path
+from typing import Any
+
+_LOGGER = logging.getLogger("wt16_simulator")
+
+REGISTERS_PATH = Path(__file__).resolve().parent.parent / "custom_components" / "weider_wt16" / "registers.py"
+
+# Modbus exception codes
+ILLEGAL_FUNCTION = 1
+ILLEGAL_DATA_ADDRESS = 2
+ILLEGAL_DATA_VALUE = 3
+SLAVE_DEVICE_BUSY = 6
+GATEWAY_TARGET_FAILED = 11
+
+# Register type read by each function code, used as the prefix of --missing and --busy ranges
+REGISTER_TYPES = {2: "discrete", 3: "holding", 4: "input"}
+
+# Plausible values of a running heat pump, in engineering units
+DEFAULT_VALUES = {
+    "verdichter_wp1": True,
+    "up_heizen_wp1": True,
+    "up_sole_wasser_wp1": True,
+    "stroemungswaechter_wp1": True,
+    "raum_ist_temperatur": 21.4,
+    "warmwasser_ist_temperatur": 47.5,
+    "vorlauf_soll_temperatur": 34.0,
+    "aussentemperatur": 3.2,
+    "puffer_ist_temperatur": 33.1,
+    "mischer_ist_temperatur": 31.8,
+    "abtaufuehler_ist_temperatur": -2.4,
+    "wp1_vorlauf_ist_temperatur": 34.6,
+    "wp1_ruecklauf_ist_temperatur": 29.9,
+    "wp1_quelle_eintritt_temperatur": 8.1,
+    "wp1_quelle_austritt_temperatur": 4.7,
+    "wp1_ueberhitzung": 5.2,
+    "wp1_verdampfungstemperatur": -1.3,
+    "wp1_verfluessigungstemperatur": 37.2,
+    "wp1_verdampfer_temperatur": 0.4,
+    "wp1_sauggas_temperatur": 3.9,
+    "wp1_heissgas_temperatur": 68.4,
+    "wp1_volumenstrom": 24,
+    "warmwasser_soll_temperatur": 48.0,
+    "raum_soll_temperatur": 21.5,
+    "wp1_letzte_laufzeit_pumpe": 135,
+    "wp1_letzte_laufzeit_warmwasser": 42,
+}
+
+
+def load_register_fields() -> tuple[Any, ...]:
+    """Load the integration's register map without importing Home Assistant."""
+    spec = importlib.util.spec_from_file_location("wt16_registers", REGISTERS_PATH)
+    module = importlib.util.module_from_spec(spec)
+    # Dataclasses resolve their module through sys.modules
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module.REGISTER_FIELDS
+
+
+def parse_ranges(text: str | None) -> dict[str, set[int]]:
+    """Parse 'input:38-46,holding:1' into the set of addresses per register type."""
+    addresses: dict[str, set[int]] = {}
+    for part in (text or "").split(","):
+        part = part.strip()
+        if not part:
+            continue
+        reg_type, separator, span = part.partition(":")
+        if not separator or reg_type not in REGISTER_TYPES.values():
+            raise ValueError(f"Expected <discrete|input|holding>:<start>[-<end>], got {part!r}")
+        start, _, end = span.partition("-")
+        addresses.setdefault(reg_type, set()).update(range(int(start), int(end or start) + 1))
+    return addresses
+
+
+class WT16Unit:
+    """Register store of one simulated heat pump."""
+
+    def __init__(self, fields: tuple[Any, ...], missing: dict[str, set[int]], error_text: str = "", busy: dict[str, set[int]] | None = None) -> None:
+        """Initialize the store from the register map."""
+        # Addresses per register type answered with an illegal address or a device busy exception
+        self.missing = missing
+        self.busy = busy or {}
+        self.bits: dict[int, bool] = {}
+        self.input: dict[int, int] = {}
+        self.holding: dict[int, int] = {}
+        self.drifting: list[tuple[int, int]] = []
+
+        for field in fields:
+            value = DEFAULT_VALUES.get(field.key, 0)
+            if field.data_type == "bit":
+                self.bits[field.address] = bool(value)
+                continue
+
+            store = self.holding if field.reg_type == "holding" else self.input
+            if field.data_type == "string":
+                raw = (error_text if field.key == "aktive_fehlermeldung" else "").encode().ljust(field.count * 2, b"\0")
+                for index in range(field.count):
+                    store[field.address + index] = struct.unpack_from(">H", raw, index * 2)[0]
+            elif field.data_type == "uint32":
+                store[field.address] = (int(value) >> 16) & 0xFFFF
+                store[field.address + 1] = int(value) & 0xFFFF
+            else:
+                store[field.address] = round(value / field.scale) & 0xFFFF
+                if field.data_type == "int16" and field.scale != 1:
+                    self.drifting.append((field.address, store[field.address]))
+
+    def drift(self) -> None:
+        """Move temperatures by one resolution step around their start value."""
+        for address, start in self.drifting:
+            current = struct.unpack(">h", struct.pack(">H", self.input[address]))[0]
+            base = struct.unpack(">h", struct.pack(">H", start))[0]
+            step = random.choice((-1, 0, 0, 1))
+            self.input[address] = max(base - 20, min(base + 20, current + step)) & 0xFFFF
+
+    def exception_code(self, reg_type: str, address: int, count: int) -> int | None:
+        """Return the exception code a request for count addresses is answered with, or None."""
+        addresses = range(address, address + count)
+        if any(a in self.missing.get(reg_type, ()) for a in addresses):
+            return ILLEGAL_DATA_ADDRESS
+        if any(a in self.busy.get(reg_type, ()) for a in addresses):
+            return SLAVE_DEVICE_BUSY
+        return None
+
+    def read(self, reg_type: str, address: int, count: int) -> list[Any]:
+        """Return count values of a register type, unset addresses read as 0."""
+        store = {"discrete": self.bits, "input": self.input, "holding": self.holding}[reg_type]
+        return [store.get(a, 0) for a in range(address, address + count)]
+
+
+class WT16Simulator:
+    """Asyncio Modbus TCP server answering requests for one or more units."""
+
+    def __init__(self, units: dict[int, WT16Unit], latency: float = 0.0, jitter: float = 0.0, serialize: bool = True) -> None:
+        """Initialize the simulator."""
+        self.units = units
+        self.latency = latency
+        self.jitter = jitter
+        self.serialize = serialize
+        self.request_count = 0
+        self.connection_count = 0
+        self.port: int | None = None
+        self._server: asyncio.AbstractServer | None = None
+        self._drift_task: asyncio.Task | None = None
+        self._handlers: set[asyncio.Task] = set()
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0, drift_interval: float = 0.0) -> int:
+        """Start listening and return the bound port."""
+        self._server = await asyncio.start_server(self._handle_connection, host, port)
+        if drift_interval > 0:
+            self._drift_task = asyncio.create_task(self._drift(drift_interval))
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self.port
+
+    async def stop(self) -> None:
+        """Stop the server."""
+        if self._drift_task:
+            self._drift_task.cancel()
+        if self._server:
+            self._server.close()
+        for handler in list(self._handlers):
+            handler.cancel()
+        await asyncio.gather(*self._handlers, return_exceptions=True)
+
+    async def _drift(self, interval: float) -> None:
+        """Drift temperatures periodically."""
+        while True:
+            await asyncio.sleep(interval)
+            for unit in self.units.values():
+                unit.drift()
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Serve one client connection."""
+        self.connection_count += 1
+        handler = asyncio.current_task()
+        self._handlers.add(handler)
+        write_lock = asyncio.Lock()
+        tasks: set[asyncio.Task] = set()
+        try:
+            while True:
+                header = await reader.readexactly(7)
+                transaction_id, protocol_id, length, unit_id = struct.unpack(">HHHB", header)
+                pdu = await reader.readexactly(length - 1)
+                if protocol_id != 0:
+                    continue
+                request = self._respond(transaction_id, unit_id, pdu, writer, write_lock)
+                if self.serialize:
+                    # Like most RS485 gateways: one request at a time per connection
+                    await request
+                else:
+                    task = asyncio.create_task(request)
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+        except (asyncio.IncompleteReadError, ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            for task in tasks:
+                task.cancel()
+            writer.close()
+            self._handlers.discard(handler)
+
+    async def _respond(self, transaction_id: int, unit_id: int, pdu: bytes, writer: asyncio.StreamWriter, write_lock: asyncio.Lock) -> None:
+        """Answer one request after the simulated latency."""
+        self.request_count += 1
+        delay = self.latency + random.uniform(0, self.jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        response = self.handle_pdu(unit_id, pdu)
+        async with write_lock:
+            writer.write(struct.pack(">HHHB", transaction_id, 0, len(response) + 1, unit_id) + response)
+            await writer.drain()
+
+    def handle_pdu(self, unit_id: int, pdu: bytes) -> bytes:
+        """Return the response PDU for a request PDU."""
+        function_code = pdu[0]
+        unit = self.units.get(unit_id)
+        if unit is None:
+            return bytes((function_code | 0x80, GATEWAY_TARGET_FAILED))
+
+        if function_code in (2, 3, 4):
+            address, count = struct.unpack_from(">HH", pdu, 1)
+            limit = 2000 if function_code == 2 else 125
+            if not 1 <= count <= limit:
+                return bytes((function_code | 0x80, ILLEGAL_DATA_VALUE))
+            reg_type = REGISTER_TYPES[function_code]
+            if (code := unit.exception_code(reg_type, address, count)) is not None:
+                return bytes((function_code | 0x80, code))
+            values = unit.read(reg_type, address, count)
+            if function_code == 2:
+                packed = bytearray((count + 7) // 8)
+                for index, bit in enumerate(values):
+                    if bit:
+                        packed[index // 8] |= 1 << (index % 8)
+                return bytes((function_code, len(packed))) + bytes(packed)
+            return bytes((function_code, count * 2)) + struct.pack(f">{count}H", *values)
+
+        if function_code == 6:
+            address, value = struct.unpack_from(">HH", pdu, 1)
+            if (code := unit.exception_code("holding", address, 1)) is not None:
+                return bytes((function_code | 0x80, code))
+            unit.holding[address] = value
+            return pdu[:5]
+
+        if function_code == 16:
+            address, count, _byte_count = struct.unpack_from(">HHB", pdu, 1)
+            if (code := unit.exception_code("holding", address, count)) is not None:
+                return bytes((function_code | 0x80, code))
+            for index, value in enumerate(struct.unpack_from(f">{count}H", pdu, 6)):
+                unit.holding[address + index] = value
+            return pdu[:5]
+
+        return bytes((function_code | 0x80, ILLEGAL_FUNCTION))
+
+
+def build_simulator(units: str = "1", missing: str | None = None, error_text: str = "", busy: str | None = None, **kwargs: Any) -> WT16Simulator:
+    """Build a simulator with identical units at the given comma separated slave IDs."""
+    fields = load_register_fields()
+    return WT16Simulator({int(unit_id): WT16Unit(fields, parse_ranges(missing), error_text, parse_ranges(busy)) for unit_id in units.split(",")}, **kwargs)
+
+
+async def _main(args: argparse.Namespace) -> None:
+    """Run the simulator until interrupted."""
+    simulator = build_simulator(
+        args.units,
+        ",".join(args.missing or ()),
+        args.error,
+        ",".join(args.busy or ()),
+        latency=args.latency,
+        jitter=args.jitter,
+        serialize=not args.concurrent,
+    )
+    port = await simulator.start(args.host, args.port, args.drift)
+    _LOGGER.info("WT16 simulator listening on %s:%d (units %s)", args.host, port, args.units)
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await simulator.stop()
+
+
+def main() -> None:
+    """Parse arguments and run the simulator."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5020)
+    parser.add_argument("--units", default="1", help="comma separated slave IDs to answer")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds before each response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="random extra latency in seconds")
+    parser.add_argument("--missing", action="append", help="unsupported addresses per register type, e.g. input:38-46,holding:723, may be repeated")
+    parser.add_argument("--busy", action="append", help="addresses answered with device busy, e.g. input:60164-60165, may be repeated")
+    parser.add_argument("--error", default="", help="active error message text")
+    parser.add_argument("--drift", type=float, default=0.0, help="seconds between temperature drift steps")
+    parser.add_argument("--concurrent", action="store_true", help="answer pipelined requests out of order")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    try:
+        asyncio.run(_main(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+"""Tests for the Weider WT16 Heat Pump integration."""
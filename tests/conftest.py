@@ -0,0 +1,28 @@
+"""Common fixtures for the Weider WT16 Heat Pump tests."""
+
+from __future__ import annotations
+
+import sys
+from collections.abc import AsyncGenerator
+from pathlib import Path
+
+import pytest
+
+# The simulator and the benchmark scripts are imported as modules
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+from wt16_simulator import WT16Simulator, build_simulator  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(enable_custom_integrations: None) -> None:
+    """Load the integration from custom_components in every test."""
+
+
+@pytest.fixture
+async def simulator(socket_enabled: None) -> AsyncGenerator[WT16Simulator]:
+    """Serve a simulated heat pump at slave ID 1 on a free local port."""
+    simulator = build_simulator()
+    await simulator.start()
+    yield simulator
+    await simulator.stop()
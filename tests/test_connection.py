@@ -0,0 +1,106 @@
+"""Tests for the connection shared by the units behind one gateway."""
+
+from __future__ import annotations
+
+from wt16_simulator import WT16Simulator
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.weider_wt16.connection import (
+    DATA_CONNECTIONS,
+    PIPELINE_DROPPED_BATCHES,
+    PIPELINE_RETRY_BASE_DELAY,
+    async_acquire_connection,
+    async_release_connection,
+)
+from custom_components.weider_wt16.pipeline import PipelinedModbusTcpClient
+
+
+async def test_connection_shared_per_gateway(hass: HomeAssistant, simulator: WT16Simulator) -> None:
+    """Units at the same host and port share a connection, closed with the last of them."""
+    first = async_acquire_connection(hass, "127.0.0.1", simulator.port)
+    second = async_acquire_connection(hass, "127.0.0.1", simulator.port)
+    assert first is second
+    other = async_acquire_connection(hass, "127.0.0.1", simulator.port + 1)
+    assert other is not first
+    await async_release_connection(hass, other, 1)
+
+    async with first.lock:
+        await first.async_get_client()
+
+    await async_release_connection(hass, second, 2)
+    assert first.connected
+    await async_release_connection(hass, first, 1)
+    assert not first.connected
+    assert ("127.0.0.1", simulator.port) not in hass.data[DATA_CONNECTIONS]
+
+
+async def test_pipeline_window_is_largest_of_units(hass: HomeAssistant, simulator: WT16Simulator) -> None:
+    """Units sharing a gateway use the largest window, the client is swapped on its next use."""
+    connection = async_acquire_connection(hass, "127.0.0.1", simulator.port)
+    async_acquire_connection(hass, "127.0.0.1", simulator.port)
+
+    connection.set_pipeline_window(1, 1)
+    async with connection.lock:
+        client = await connection.async_get_client()
+    assert not isinstance(client, PipelinedModbusTcpClient)
+
+    connection.set_pipeline_window(2, 8)
+    assert connection.pipeline_window == 8
+    # The client in use by a poll is only replaced by the next one holding the lock
+    assert connection.connected
+    async with connection.lock:
+        assert isinstance(await connection.async_get_client(), PipelinedModbusTcpClient)
+
+    await async_release_connection(hass, connection, 2)
+    assert connection.pipeline_window == 1
+    await async_release_connection(hass, connection, 1)
+
+
+async def test_pipelining_survives_single_drop(hass: HomeAssistant, simulator: WT16Simulator) -> None:
+    """A batch lost with the connection reconnects pipelined, only repeated losses fall back."""
+    connection = async_acquire_connection(hass, "127.0.0.1", simulator.port)
+    connection.set_pipeline_window(1, 8)
+
+    for _ in range(PIPELINE_DROPPED_BATCHES - 1):
+        connection.pipeline_dropped(8)
+        async with connection.lock:
+            assert isinstance(await connection.async_get_client(), PipelinedModbusTcpClient)
+    # A batch that arrived resets the count
+    connection.record_pipeline_batch(8, 0.1, 0.2)
+    connection.pipeline_dropped(8)
+    assert connection.pipelining
+
+    for _ in range(PIPELINE_DROPPED_BATCHES - 1):
+        connection.pipeline_dropped(8)
+    assert connection.pipeline_fallback
+    async with connection.lock:
+        assert not isinstance(await connection.async_get_client(), PipelinedModbusTcpClient)
+
+    await async_release_connection(hass, connection, 1)
+
+
+async def test_pipelining_probed_again_after_backoff(hass: HomeAssistant, simulator: WT16Simulator) -> None:
+    """A fallback ends after its delay, which doubles while the gateway keeps failing the pipeline."""
+    connection = async_acquire_connection(hass, "127.0.0.1", simulator.port)
+    connection.set_pipeline_window(1, 8)
+
+    connection.pipeline_failed("test")
+    assert connection._fallback_delay == PIPELINE_RETRY_BASE_DELAY  # pylint: disable=protected-access
+    connection._fallback_until = 0.0  # pylint: disable=protected-access
+    async with connection.lock:
+        assert isinstance(await connection.async_get_client(), PipelinedModbusTcpClient)
+    assert not connection.pipeline_fallback
+
+    connection.pipeline_failed("test")
+    assert connection._fallback_delay == 2 * PIPELINE_RETRY_BASE_DELAY  # pylint: disable=protected-access
+
+    # Concurrent answers after the next probe start a later fallback from the base delay again
+    connection._fallback_until = 0.0  # pylint: disable=protected-access
+    async with connection.lock:
+        await connection.async_get_client()
+    connection.record_pipeline_batch(8, 0.1, 0.2)
+    connection.pipeline_failed("test")
+    assert connection._fallback_delay == PIPELINE_RETRY_BASE_DELAY  # pylint: disable=protected-access
+
+    await async_release_connection(hass, connection, 1)
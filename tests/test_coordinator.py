@@ -0,0 +1,413 @@
+"""Tests for the poll coordinator against the simulator."""
+
+from __future__ import annotations
+
+import asyncio
+import struct
+from collections.abc import AsyncGenerator
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from freezegun.api import FrozenDateTimeFactory
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+from wt16_simulator import WT16Simulator, build_simulator, parse_ranges
+
+from homeassistant.const import CONF_HOST, CONF_PORT, Platform
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import entity_registry as er
+from homeassistant.util import dt as dt_util
+
+from custom_components.weider_wt16.const import (
+    CONF_LONG_TERM_STATISTICS,
+    CONF_SCAN_INTERVAL,
+    CONF_SLAVE_ID,
+    CONF_UNSUPPORTED_REGISTERS,
+    DOMAIN,
+    SERVICE_DISCOVER,
+    SERVICE_HISTORY,
+    SERVICE_PROFILE,
+)
+from custom_components.weider_wt16.coordinator import WeiderWT16DataUpdateCoordinator
+from custom_components.weider_wt16.metrics import HEAT_ENERGY_KEY, THERMAL_POWER_KEY
+from custom_components.weider_wt16.quarantine import QUARANTINE_THRESHOLD
+from custom_components.weider_wt16.scheduler import CIRCUIT_BREAKER_THRESHOLD
+
+TIERS = ("fast", "normal", "slow", "fault")
+
+EVI_KEYS = frozenset(
+    {
+        "wp1_sauggas_evi_temperatur",
+        "wp1_ueberhitzung_evi",
+        "wp1_verdampfungstemperatur_evi",
+        "wp1_verfluessigungsdruck_evi",
+        "wp1_verfluessigungstemperatur_evi",
+        "wp1_volumenstrom",
+    }
+)
+
+
+async def _async_setup_entry(hass: HomeAssistant, simulator: WT16Simulator, slave_id: int = 1) -> MockConfigEntry:
+    """Set up an entry polling a slave ID of the simulator."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        version=4,
+        unique_id=f"127.0.0.1:{simulator.port}:{slave_id}",
+        data={CONF_HOST: "127.0.0.1", CONF_PORT: simulator.port, CONF_SLAVE_ID: slave_id, CONF_SCAN_INTERVAL: 60},
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    return entry
+
+
+@pytest.fixture
+async def entry(hass: HomeAssistant, simulator: WT16Simulator) -> AsyncGenerator[MockConfigEntry]:
+    """Set up an entry polling slave ID 1 of the simulator."""
+    entry = await _async_setup_entry(hass, simulator)
+    yield entry
+    assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+@pytest.fixture
+def fast_writes(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Shorten the write debounce delay."""
+    monkeypatch.setattr("custom_components.weider_wt16.coordinator.WRITE_DEBOUNCE_DELAY", 0.05)
+
+
+def _record_writes(simulator: WT16Simulator) -> list[tuple[int, int]]:
+    """Return a list the simulator appends the (address, value) of every register write to."""
+    writes: list[tuple[int, int]] = []
+    handle_pdu = simulator.handle_pdu
+
+    def record(unit_id: int, pdu: bytes) -> bytes:
+        if pdu[0] == 6:
+            writes.append(struct.unpack_from(">HH", pdu, 1))
+        return handle_pdu(unit_id, pdu)
+
+    simulator.handle_pdu = record
+    return writes
+
+
+async def _poll(hass: HomeAssistant, entry: MockConfigEntry) -> WeiderWT16DataUpdateCoordinator:
+    """Run a poll of every tier and return the coordinator."""
+    coordinator: WeiderWT16DataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
+    coordinator._scheduler.forced_tiers.update(TIERS)  # pylint: disable=protected-access
+    await coordinator.async_refresh()
+    return coordinator
+
+
+async def test_rejected_block_split_once(hass: HomeAssistant, simulator: WT16Simulator, entry: MockConfigEntry) -> None:
+    """A rejected block is split once, later polls read the split parts directly."""
+    simulator.units[1].missing = parse_ranges("input:38-46")
+
+    first = (await _poll(hass, entry)).last_request_count
+    second = (await _poll(hass, entry)).last_request_count
+    coordinator = await _poll(hass, entry)
+
+    assert second < first
+    assert coordinator.last_request_count == second
+    assert "wp1_heissgas_temperatur" in coordinator.data
+
+
+async def test_busy_block_keeps_plan(hass: HomeAssistant, simulator: WT16Simulator, entry: MockConfigEntry) -> None:
+    """A block the unit is too busy to answer is retried whole instead of split."""
+    clean = (await _poll(hass, entry)).last_request_count
+    simulator.units[1].busy = parse_ranges("holding:723")
+
+    coordinator = await _poll(hass, entry)
+    # Read again by the retries instead of being split into single fields
+    assert coordinator.last_request_count == clean + 2
+
+    simulator.units[1].busy = {}
+    coordinator = await _poll(hass, entry)
+    assert coordinator.last_request_count == clean
+    assert "raum_soll_temperatur" in coordinator.data
+
+
+async def test_breaker_open_until_unit_answers(hass: HomeAssistant, simulator: WT16Simulator, entry: MockConfigEntry) -> None:
+    """An absent unit opens the breaker, which closes once the unit answers again."""
+    unit = simulator.units.pop(1)
+
+    for _ in range(CIRCUIT_BREAKER_THRESHOLD + 1):
+        coordinator = await _poll(hass, entry)
+
+    # The probe of the open breaker gets a gateway exception, which must not close it
+    assert coordinator._breaker.is_open  # pylint: disable=protected-access
+    assert coordinator.data
+
+    simulator.units[1] = unit
+    coordinator = await _poll(hass, entry)
+    assert not coordinator._breaker.is_open  # pylint: disable=protected-access
+
+
+async def test_poll_counters_total_increasing(hass: HomeAssistant, entry: MockConfigEntry) -> None:
+    """Overrun and skipped tick counters are monotonic totals with plain entity IDs."""
+    for key in ("poll_overruns", "poll_skipped_ticks"):
+        state = hass.states.get(f"sensor.{key}")
+        assert state is not None
+        assert state.attributes["state_class"] == "total_increasing"
+
+
+async def test_units_share_connection(hass: HomeAssistant, simulator: WT16Simulator, entry: MockConfigEntry) -> None:
+    """A second unit behind the gateway polls over the same socket, its entity IDs end in its slave ID."""
+    simulator.units[2] = build_simulator().units[1]
+    second = await _async_setup_entry(hass, simulator, slave_id=2)
+
+    assert hass.data[DOMAIN][second.entry_id].data
+    assert simulator.connection_count == 1
+    # The first unit keeps the entity IDs derived from the entity names
+    for entity_id in ("sensor.wp1_rucklauf_ist_temperatur", "binary_sensor.stromungswachter_wp1", "climate.raum_soll_temperatur"):
+        assert hass.states.get(entity_id) is not None
+        assert hass.states.get(f"{entity_id}_2") is not None
+
+    assert await hass.config_entries.async_unload(second.entry_id)
+
+
+async def test_discover_absent_unit_keeps_capabilities(hass: HomeAssistant, simulator: WT16Simulator, entry: MockConfigEntry) -> None:
+    """A discovery scan of an absent unit fails and leaves the stored capabilities alone."""
+    simulator.units.pop(1)
+
+    with pytest.raises(HomeAssistantError):
+        await hass.services.async_call(DOMAIN, SERVICE_DISCOVER, blocking=True, return_response=True)
+
+    assert CONF_UNSUPPORTED_REGISTERS not in entry.data
+
+
+async def test_discover_removes_unsupported_entities(hass: HomeAssistant, simulator: WT16Simulator, entry: MockConfigEntry) -> None:
+    """Entities of rejected fields are removed, including climate and derived sensors."""
+    registry = er.async_get(hass)
+    prefix = entry.unique_id
+    assert registry.async_get_entity_id(Platform.CLIMATE, DOMAIN, f"{prefix}_climate_raum_soll_temperatur")
+    simulator.units[1].missing = parse_ranges("input:38-46,holding:723")
+
+    response = await hass.services.async_call(DOMAIN, SERVICE_DISCOVER, blocking=True, return_response=True)
+    await hass.async_block_till_done()
+
+    assert set(response["unsupported"][entry.entry_id]) == EVI_KEYS | {"raum_soll_temperatur"}
+    assert registry.async_get_entity_id(Platform.CLIMATE, DOMAIN, f"{prefix}_climate_raum_soll_temperatur") is None
+    assert registry.async_get_entity_id(Platform.SENSOR, DOMAIN, f"{prefix}_{THERMAL_POWER_KEY}") is None
+    assert registry.async_get_entity_id(Platform.SENSOR, DOMAIN, f"{prefix}_wp1_sauggas_evi_temperatur") is None
+    assert registry.async_get_entity_id(Platform.CLIMATE, DOMAIN, f"{prefix}_climate_warmwasser_temperatur")
+
+
+async def test_rejected_fields_quarantined(hass: HomeAssistant, simulator: WT16Simulator, entry: MockConfigEntry) -> None:
+    """Fields the unit keeps rejecting are quarantined after the threshold."""
+    simulator.units[1].missing = parse_ranges("input:38-46")
+
+    for _ in range(QUARANTINE_THRESHOLD):
+        coordinator = await _poll(hass, entry)
+
+    assert coordinator.quarantine.quarantined == EVI_KEYS
+    assert EVI_KEYS.isdisjoint(coordinator.data)
+
+
+async def test_lost_reads_not_quarantined(hass: HomeAssistant, simulator: WT16Simulator, entry: MockConfigEntry) -> None:
+    """Neither a busy block nor an outage of the whole unit counts towards quarantines."""
+    simulator.units[1].busy = parse_ranges("holding:723")
+    for _ in range(QUARANTINE_THRESHOLD):
+        coordinator = await _poll(hass, entry)
+    assert not coordinator.quarantine
+
+    simulator.units[1].busy = {}
+    unit = simulator.units.pop(1)
+    for _ in range(QUARANTINE_THRESHOLD):
+        coordinator = await _poll(hass, entry)
+    assert not coordinator.quarantine
+
+    simulator.units[1] = unit
+    coordinator = await _poll(hass, entry)
+    assert not coordinator.quarantine
+
+
+async def test_profile_report_per_unit(hass: HomeAssistant, simulator: WT16Simulator, entry: MockConfigEntry, tmp_path: Path) -> None:
+    """Every unit writes its own profile report."""
+    hass.config.config_dir = str(tmp_path)
+    simulator.units[2] = build_simulator().units[1]
+    second = await _async_setup_entry(hass, simulator, slave_id=2)
+
+    response = await hass.services.async_call(DOMAIN, SERVICE_PROFILE, {"polls": 1}, blocking=True, return_response=True)
+    await _poll(hass, entry)
+    await _poll(hass, second)
+    # Reports are written in the executor
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+    reports = {Path(report) for report in response["reports"]}
+    assert len(reports) == 2
+    assert all(report.read_text().startswith("Weider WT16 poll profile, 1 polls") for report in reports)
+
+    assert await hass.config_entries.async_unload(second.entry_id)
+
+
+async def test_quarantined_fields_not_merged(hass: HomeAssistant, simulator: WT16Simulator, entry: MockConfigEntry) -> None:
+    """New read plans keep clear of quarantined registers instead of splitting blocks around them again."""
+    # Between registers the unit answers, so blocks would merge across it
+    simulator.units[1].missing = parse_ranges("input:38")
+    for _ in range(QUARANTINE_THRESHOLD):
+        coordinator = await _poll(hass, entry)
+    assert coordinator.quarantine.quarantined == {"wp1_sauggas_evi_temperatur"}
+
+    planner = coordinator._planner  # pylint: disable=protected-access
+    rejected = []
+    reject = planner.reject
+    planner.reject = lambda block: rejected.append(block) or reject(block)
+
+    # Only the fast tier, a plan not read before
+    coordinator._scheduler.forced_tiers.add("fast")  # pylint: disable=protected-access
+    await coordinator.async_refresh()
+
+    assert not rejected
+    assert "wp1_verdampfungstemperatur_evi" in coordinator.data
+
+
+async def test_lock_wait_not_counted(hass: HomeAssistant, entry: MockConfigEntry) -> None:
+    """Waiting for another unit's poll on the shared connection is not part of the poll."""
+    coordinator: WeiderWT16DataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
+    coordinator._poll_deadline = 0.2  # pylint: disable=protected-access
+    connection = coordinator._connection  # pylint: disable=protected-access
+
+    async def other_unit_poll() -> None:
+        async with connection.lock:
+            await asyncio.sleep(0.5)
+
+    other = hass.async_create_task(other_unit_poll())
+    await asyncio.sleep(0)
+    await _poll(hass, entry)
+    await other
+
+    assert coordinator.last_poll_duration < 0.5
+    assert coordinator.overrun_count == 0
+    assert coordinator.skipped_tick_count == 0
+
+
+@pytest.mark.usefixtures("fast_writes")
+async def test_writes_debounced_and_coalesced(hass: HomeAssistant, simulator: WT16Simulator, entry: MockConfigEntry) -> None:
+    """Writes queued within the debounce delay go out in one flush, only the last value per register is sent."""
+    coordinator: WeiderWT16DataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
+    writes = _record_writes(simulator)
+
+    results = await asyncio.gather(
+        coordinator.async_write_register(723, 200),
+        coordinator.async_write_register(1, 480),
+        coordinator.async_write_register(723, 225),
+    )
+
+    # Every caller gets the result of the write that went out for its register
+    assert results == [True, True, True]
+    assert writes == [(723, 225), (1, 480)]
+    assert coordinator.data["raum_soll_temperatur"] == 22.5
+    assert coordinator.data["warmwasser_soll_temperatur"] == 48.0
+
+
+@pytest.mark.usefixtures("fast_writes")
+async def test_write_optimistic_until_read_back(hass: HomeAssistant, simulator: WT16Simulator, entry: MockConfigEntry) -> None:
+    """A new setpoint shows at once and is rolled back to the read-back value if the unit does not keep it."""
+    coordinator: WeiderWT16DataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
+    before = hass.states.get("climate.raum_soll_temperatur").attributes["temperature"]
+    # The unit acknowledges writes without storing them
+    handle_pdu = simulator.handle_pdu
+    simulator.handle_pdu = lambda unit_id, pdu: pdu[:5] if pdu[0] == 6 else handle_pdu(unit_id, pdu)
+
+    write = hass.async_create_task(coordinator.async_write_register(723, 235))
+    # Queued, the debounce delay has not passed yet
+    await asyncio.sleep(0)
+    assert hass.states.get("climate.raum_soll_temperatur").attributes["temperature"] == 23.5
+
+    assert not await write
+    await hass.async_block_till_done()
+    assert hass.states.get("climate.raum_soll_temperatur").attributes["temperature"] == before
+
+    # The next poll does not bring the optimistic value back
+    coordinator = await _poll(hass, entry)
+    assert coordinator.data["raum_soll_temperatur"] == before
+
+
+@pytest.mark.usefixtures("fast_writes")
+async def test_failed_write_rolled_back(hass: HomeAssistant, simulator: WT16Simulator, entry: MockConfigEntry) -> None:
+    """A rejected write restores the value from before the first queued write."""
+    before = hass.states.get("climate.raum_soll_temperatur").attributes["temperature"]
+    simulator.units[1].busy = parse_ranges("holding:723")
+
+    with pytest.raises(HomeAssistantError):
+        await hass.services.async_call(
+            Platform.CLIMATE, "set_temperature", {"entity_id": "climate.raum_soll_temperatur", "temperature": 23.5}, blocking=True
+        )
+    await hass.async_block_till_done()
+
+    assert hass.states.get("climate.raum_soll_temperatur").attributes["temperature"] == before
+    assert simulator.units[1].holding[723] == round(before * 10)
+
+
+async def test_history_of_polls(hass: HomeAssistant, entry: MockConfigEntry) -> None:
+    """Every successful poll is kept in the history, the service returns it raw or downsampled."""
+    await _poll(hass, entry)
+    coordinator = await _poll(hass, entry)
+
+    response = await hass.services.async_call(DOMAIN, SERVICE_HISTORY, {"key": "aussentemperatur"}, blocking=True, return_response=True)
+    samples = response["entries"][entry.entry_id]
+    # The first refresh at setup and both polls
+    assert len(samples) == 3
+    assert samples[-1]["value"] == coordinator.data["aussentemperatur"]
+
+    response = await hass.services.async_call(
+        DOMAIN, SERVICE_HISTORY, {"key": "aussentemperatur", "buckets": 1}, blocking=True, return_response=True
+    )
+    assert [bucket["mean"] for bucket in response["entries"][entry.entry_id]] == [coordinator.data["aussentemperatur"]]
+
+
+async def test_heat_energy_survives_reload(hass: HomeAssistant, entry: MockConfigEntry) -> None:
+    """The heat energy total is saved on unload and keeps counting from there after a restart."""
+    coordinator = await _poll(hass, entry)
+    coordinator._metrics.heat_energy = 12.5  # pylint: disable=protected-access
+
+    assert await hass.config_entries.async_reload(entry.entry_id)
+    await hass.async_block_till_done()
+    coordinator = await _poll(hass, entry)
+
+    assert coordinator.data[HEAT_ENERGY_KEY] >= 12.5
+    assert float(hass.states.get("sensor.wp1_warmemenge").state) >= 12.5
+
+
+async def test_hour_compiled_into_statistics(hass: HomeAssistant, entry: MockConfigEntry, freezer: FrozenDateTimeFactory) -> None:
+    """The first poll of a new hour imports the compiled hour into the recorder's external statistics."""
+    hass.config_entries.async_update_entry(entry, options={CONF_LONG_TERM_STATISTICS: True})
+    await hass.async_block_till_done()
+    hass.config.components.add("recorder")
+
+    with patch("homeassistant.components.recorder.statistics.async_add_external_statistics") as add_statistics:
+        freezer.move_to("2026-01-01 10:59:30+00:00")
+        await _poll(hass, entry)
+        assert not add_statistics.called
+
+        freezer.move_to("2026-01-01 11:00:10+00:00")
+        coordinator = await _poll(hass, entry)
+
+    imported = {call.args[1]["statistic_id"]: call.args[2] for call in add_statistics.call_args_list}
+    statistics = imported[coordinator.statistic_id("aussentemperatur")]
+    assert [row["start"] for row in statistics] == [dt_util.parse_datetime("2026-01-01 10:00:00+00:00")]
+    assert statistics[0]["mean"] == coordinator.data["aussentemperatur"]
+
+
+async def test_snapshot_restored_as_stale(hass: HomeAssistant, simulator: WT16Simulator, entry: MockConfigEntry) -> None:
+    """The last good values are saved on unload and restored as stale while the unit does not answer."""
+    coordinator = await _poll(hass, entry)
+    outdoor = coordinator.data["aussentemperatur"]
+    assert not coordinator.stale
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    unit = simulator.units.pop(1)
+    # Setup does not wait for the unit, the first refresh runs in the background
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    assert coordinator.stale
+    assert float(hass.states.get("sensor.aussentemperatur").state) == outdoor
+    assert hass.states.get("sensor.data_age").attributes["stale"] is True
+
+    simulator.units[1] = unit
+    coordinator = await _poll(hass, entry)
+    await hass.async_block_till_done()
+    assert not coordinator.stale
+    assert hass.states.get("sensor.data_age").attributes["stale"] is False
@@ -0,0 +1,62 @@
+"""Tests for the deadband filtering of state writes."""
+
+from __future__ import annotations
+
+import pytest
+
+from custom_components.weider_wt16.deadband import TEMPERATURE_DEADBAND, DeadbandFilter, parse_deadbands
+
+MAX_INTERVAL = 600
+
+
+def test_change_within_deadband_held_back() -> None:
+    """Temperatures are only written once they moved by the deadband."""
+    deadband = DeadbandFilter(max_interval=MAX_INTERVAL)
+
+    assert not deadband.significant("aussentemperatur", 5.0, 5.1, 10)
+    # 21.5 - 21.3 is slightly below 0.2 in floating point
+    assert deadband.significant("aussentemperatur", 21.3, 21.3 + TEMPERATURE_DEADBAND, 10)
+    assert not deadband.significant("aussentemperatur", 5.0, 5.0, MAX_INTERVAL)
+
+
+def test_max_interval_forces_write() -> None:
+    """A change within the deadband is written once the maximum interval passed."""
+    deadband = DeadbandFilter(max_interval=MAX_INTERVAL)
+
+    assert not deadband.significant("aussentemperatur", 5.0, 5.1, MAX_INTERVAL - 1)
+    assert deadband.significant("aussentemperatur", 5.0, 5.1, MAX_INTERVAL)
+
+
+def test_zero_interval_disables_filter() -> None:
+    """Every change is written with a maximum interval of 0."""
+    deadband = DeadbandFilter(max_interval=0)
+
+    assert deadband.significant("aussentemperatur", 5.0, 5.1, 0)
+
+
+def test_states_and_unlisted_keys_always_written() -> None:
+    """Booleans, text, unknown values and keys without a deadband are written on every change."""
+    deadband = DeadbandFilter(max_interval=MAX_INTERVAL)
+
+    assert deadband.significant("verdichter_wp1", False, True, 0)
+    assert deadband.significant("aktive_fehlermeldung", "Keine Fehlermeldung", "Hochdruck", 0)
+    assert deadband.significant("aussentemperatur", None, 5.0, 0)
+    assert deadband.significant("raum_soll_temperatur", 21.0, 21.5, 0)
+
+
+def test_overrides() -> None:
+    """Per-key overrides replace the default deadbands."""
+    deadband = DeadbandFilter({"aussentemperatur": 1.0}, MAX_INTERVAL)
+
+    assert not deadband.significant("aussentemperatur", 5.0, 5.5, 0)
+    deadband.configure(None, MAX_INTERVAL)
+    assert deadband.significant("aussentemperatur", 5.0, 5.5, 0)
+
+
+def test_parse_deadbands() -> None:
+    """Overrides parse from comma or line separated entries of known keys."""
+    assert parse_deadbands("wp1_volumenstrom=0.5,\naussentemperatur = 1") == {"wp1_volumenstrom": 0.5, "aussentemperatur": 1.0}
+    assert parse_deadbands("") == {}
+    for text in ("unknown_key=1", "aussentemperatur", "aussentemperatur=-1", "aussentemperatur=nan"):
+        with pytest.raises(ValueError):
+            parse_deadbands(text)
@@ -0,0 +1,59 @@
+"""Tests for the register capability discovery against the simulator."""
+
+from __future__ import annotations
+
+import pytest
+from pymodbus.client import AsyncModbusTcpClient
+from wt16_simulator import WT16Simulator, parse_ranges
+
+from custom_components.weider_wt16.const import DEFAULT_MAX_READ_GAP
+from custom_components.weider_wt16.discovery import async_discover_unsupported
+from custom_components.weider_wt16.registers import REGISTER_FIELDS
+
+EVI_KEYS = [
+    "wp1_sauggas_evi_temperatur",
+    "wp1_ueberhitzung_evi",
+    "wp1_verdampfungstemperatur_evi",
+    "wp1_verfluessigungsdruck_evi",
+    "wp1_verfluessigungstemperatur_evi",
+    "wp1_volumenstrom",
+]
+
+
+async def _discover(simulator: WT16Simulator, device_id: int = 1) -> list[str]:
+    """Run a discovery scan of a unit of the simulator."""
+    client = AsyncModbusTcpClient("127.0.0.1", port=simulator.port, timeout=5, retries=0)
+    try:
+        assert await client.connect()
+        return await async_discover_unsupported(client, device_id, DEFAULT_MAX_READ_GAP)
+    finally:
+        client.close()
+
+
+async def test_full_unit_supports_everything(simulator: WT16Simulator) -> None:
+    """A unit answering every register has no unsupported fields."""
+    assert await _discover(simulator) == []
+
+
+async def test_missing_registers_found(simulator: WT16Simulator) -> None:
+    """Exactly the fields in rejected ranges are unsupported, found with few requests."""
+    simulator.units[1].missing = parse_ranges("input:38-46")
+
+    assert await _discover(simulator) == EVI_KEYS
+    # Splitting rejected blocks costs fewer requests than reading every field on its own
+    assert simulator.request_count < len(REGISTER_FIELDS)
+
+
+async def test_absent_unit_aborts_scan(simulator: WT16Simulator) -> None:
+    """A gateway error for an absent unit aborts the scan instead of marking every field."""
+    with pytest.raises(ConnectionError):
+        await _discover(simulator, device_id=9)
+
+
+async def test_busy_unit_aborts_scan(simulator: WT16Simulator) -> None:
+    """A busy unit aborts the scan, only illegal address responses mark fields."""
+    simulator.units[1].busy = parse_ranges("holding:723")
+
+    with pytest.raises(ConnectionError):
+        await _discover(simulator)
+
@@ -0,0 +1,51 @@
+"""Tests for the in-memory poll history."""
+
+from __future__ import annotations
+
+from custom_components.weider_wt16.history import PollHistory
+
+KEYS = ("aussentemperatur", "verdichter_wp1")
+
+
+def test_ring_buffer_wraps_around() -> None:
+    """A full buffer overwrites its oldest samples and keeps answering in time order."""
+    history = PollHistory(3, KEYS)
+    memory = history.memory_usage
+
+    for second in range(5):
+        history.append(float(second), {"aussentemperatur": second / 10})
+
+    assert history.size == 3
+    assert history.range("aussentemperatur") == [(2.0, 0.2), (3.0, 0.3), (4.0, 0.4)]
+    # Range bounds are inclusive and work across the wrap point
+    assert history.range("aussentemperatur", 3.0, 4.0) == [(3.0, 0.3), (4.0, 0.4)]
+    assert history.range("aussentemperatur", 0.0, 1.0) == []
+    assert history.memory_usage == memory
+
+
+def test_missing_values_skipped() -> None:
+    """Values missing from a poll are left out of the range instead of read as 0."""
+    history = PollHistory(4, KEYS)
+    history.append(1.0, {"aussentemperatur": 5.0, "verdichter_wp1": True})
+    history.append(2.0, {"verdichter_wp1": False})
+
+    assert history.range("aussentemperatur") == [(1.0, 5.0)]
+    assert history.range("verdichter_wp1") == [(1.0, 1.0), (2.0, 0.0)]
+
+    history.clear()
+    assert history.range("verdichter_wp1") == []
+
+
+def test_downsample() -> None:
+    """Downsampling returns min, mean and max per time bucket and omits empty buckets."""
+    history = PollHistory(8, KEYS)
+    for second, value in ((0, 1.0), (10, 3.0), (20, 2.0), (70, 6.0), (80, 4.0)):
+        history.append(float(second), {"aussentemperatur": value})
+
+    buckets = history.downsample("aussentemperatur", 0.0, 90.0, 3)
+
+    assert buckets == [
+        {"time": 15.0, "min": 1.0, "mean": 2.0, "max": 3.0},
+        {"time": 75.0, "min": 4.0, "mean": 5.0, "max": 6.0},
+    ]
+    assert history.downsample("aussentemperatur", 90.0, 0.0, 3) == []
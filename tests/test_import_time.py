@@ -0,0 +1,24 @@
+"""Import time budget of the Weider WT16 integration modules."""
+
+from __future__ import annotations
+
+import os
+
+import pytest
+
+# Starts a few dozen interpreters and compares wall-clock times, too slow and noisy for every run
+pytestmark = pytest.mark.skipif(not os.environ.get("WT16_IMPORT_TIME"), reason="set WT16_IMPORT_TIME=1 to check the import time budget")
+
+# Every module is imported on top of the Home Assistant modules loaded before it
+pytest.importorskip("homeassistant")
+
+from import_time import DEFAULT_BUDGET, DEFAULT_MODULE_BUDGET, over_budget, run  # noqa: E402
+
+# Interpreters started per module, the median is compared against the budgets
+RUNS = 3
+
+
+def test_import_time_within_budget() -> None:
+    """The integration and each of its modules import within the default budgets."""
+    results = run(RUNS)
+    assert not over_budget(results, DEFAULT_BUDGET, DEFAULT_MODULE_BUDGET), results
@@ -0,0 +1,55 @@
+"""Tests for the hourly long-term statistics."""
+
+from __future__ import annotations
+
+from custom_components.weider_wt16.long_term import HOUR, HourlyStatistics
+from custom_components.weider_wt16.metrics import HEAT_ENERGY_KEY, MAX_INTEGRATION_GAP
+
+START = 100 * HOUR
+
+
+def test_hour_compiled_at_boundary() -> None:
+    """Values are held until the next poll, a value spanning the hour boundary is split between both hours."""
+    statistics = HourlyStatistics()
+
+    assert statistics.add(START + 3000, {"aussentemperatur": 10.0}) == []
+    assert statistics.add(START + 3300, {"aussentemperatur": 20.0}) == []
+    hours = statistics.add(START + 3900, {"aussentemperatur": 30.0})
+
+    assert [hour.start for hour in hours] == [START]
+    # 10 held for 300 seconds and 20 for the 300 seconds up to the boundary
+    assert hours[0].means["aussentemperatur"] == {"mean": 15.0, "min": 10.0, "max": 20.0}
+    assert statistics.last_compiled == START
+
+    # Polled every 900 seconds, the next hour holds 20 for 300 seconds and 30 for the rest
+    for timestamp in range(START + 4800, START + 2 * HOUR, 900):
+        assert statistics.add(timestamp, {"aussentemperatur": 30.0}) == []
+    hours = statistics.add(START + 2 * HOUR + 300, {"aussentemperatur": 0.0})
+
+    assert [hour.start for hour in hours] == [START + HOUR]
+    assert hours[0].means["aussentemperatur"] == {"mean": round((20 * 300 + 30 * 3300) / HOUR, 3), "min": 20.0, "max": 30.0}
+
+
+def test_gap_not_held() -> None:
+    """Values are not held across a gap, the hour before it only counts what was polled."""
+    statistics = HourlyStatistics()
+    statistics.add(START, {"aussentemperatur": 10.0})
+    statistics.add(START + 600, {"aussentemperatur": 20.0})
+
+    hours = statistics.add(START + 600 + MAX_INTEGRATION_GAP + HOUR, {"aussentemperatur": 30.0})
+
+    assert [hour.start for hour in hours] == [START]
+    # 20 was never held, it only counts towards the extremes
+    assert hours[0].means["aussentemperatur"] == {"mean": 10.0, "min": 10.0, "max": 20.0}
+
+
+def test_sum_continues_across_hours() -> None:
+    """The heat energy sum of every hour is the running total, so sums never drop between hours or gaps."""
+    statistics = HourlyStatistics()
+    sums = []
+    for timestamp, total in ((START, 1.0), (START + 1800, 1.5), (START + HOUR, 2.0), (START + HOUR + 1800, 2.5)):
+        sums += [hour.sums[HEAT_ENERGY_KEY] for hour in statistics.add(timestamp, {HEAT_ENERGY_KEY: total})]
+    # After a gap, with no poll reporting the total
+    sums += [hour.sums[HEAT_ENERGY_KEY] for hour in statistics.add(START + 4 * HOUR, {})]
+
+    assert sums == [1.5, 2.5]
@@ -0,0 +1,69 @@
+"""Tests for the derived thermal metrics."""
+
+from __future__ import annotations
+
+import pytest
+
+from custom_components.weider_wt16.metrics import (
+    COP_KEY,
+    FLOW_KEY,
+    HEAT_ENERGY_KEY,
+    MAX_INTEGRATION_GAP,
+    RETURN_KEY,
+    SEASONAL_COP_KEY,
+    SUPPLY_KEY,
+    THERMAL_POWER_KEY,
+    ThermalMetrics,
+)
+
+# 30 l/min heated by 5 K is 10.4 kW
+HEATING = {FLOW_KEY: 30, SUPPLY_KEY: 35.0, RETURN_KEY: 30.0}
+DEFROSTING = {FLOW_KEY: 30, SUPPLY_KEY: 25.0, RETURN_KEY: 30.0}
+
+
+def test_energy_integrated_between_polls() -> None:
+    """Heat and electrical energy are integrated with the trapezoidal rule, giving the COP."""
+    metrics = ThermalMetrics()
+
+    first = metrics.update(HEATING, 0, 2.6)
+    assert first[THERMAL_POWER_KEY] == 10.4
+    assert first[HEAT_ENERGY_KEY] == 0
+    assert first[COP_KEY] == 4.0
+    assert first[SEASONAL_COP_KEY] is None
+
+    # A tenth of an hour later
+    second = metrics.update(HEATING, 360, 2.6)
+    assert second[HEAT_ENERGY_KEY] == pytest.approx(1.04)
+    assert metrics.electric_energy == pytest.approx(0.26)
+    assert second[SEASONAL_COP_KEY] == 4.0
+
+
+def test_defrost_and_gaps_not_counted() -> None:
+    """Negative thermal power adds no heat, and neither do gaps or polls without readings."""
+    metrics = ThermalMetrics()
+    metrics.update(DEFROSTING, 0, None)
+    assert metrics.update(DEFROSTING, 360, None)[HEAT_ENERGY_KEY] == 0
+
+    metrics.update(HEATING, 360 + MAX_INTEGRATION_GAP + 1, None)
+    assert metrics.heat_energy == 0
+
+    assert metrics.update({}, 720 + MAX_INTEGRATION_GAP, None) == {}
+    metrics.update(HEATING, 1080 + MAX_INTEGRATION_GAP, None)
+    assert metrics.heat_energy == 0
+
+
+def test_restore_continues_totals() -> None:
+    """Restored accumulators keep growing instead of starting from zero."""
+    saved = ThermalMetrics()
+    saved.update(HEATING, 0, 2.6)
+    saved.update(HEATING, 360, 2.6)
+
+    metrics = ThermalMetrics()
+    metrics.restore(saved.as_dict())
+    metrics.update(HEATING, 0, 2.6)
+    data = metrics.update(HEATING, 360, 2.6)
+
+    assert data[HEAT_ENERGY_KEY] == pytest.approx(2.08)
+    assert data[SEASONAL_COP_KEY] == 4.0
+    metrics.restore({})
+    assert metrics.as_dict() == {"heat_energy": 0.0, "electric_energy": 0.0, "cop_heat_energy": 0.0}
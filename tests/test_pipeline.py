@@ -0,0 +1,69 @@
+"""Tests for the pipelined Modbus TCP client against the simulator."""
+
+from __future__ import annotations
+
+import asyncio
+
+from wt16_simulator import GATEWAY_TARGET_FAILED, ILLEGAL_DATA_ADDRESS, WT16Simulator, parse_ranges
+
+from custom_components.weider_wt16.pipeline import PipelinedModbusTcpClient
+from custom_components.weider_wt16.registers import REGISTER_FIELDS
+
+# Every single-register input field, each read by its own request
+ADDRESSES = [field.address for field in REGISTER_FIELDS if field.reg_type == "input" and field.count == 1]
+
+
+async def test_responses_matched_by_transaction_id(simulator: WT16Simulator) -> None:
+    """Responses arriving out of order are returned to the request they answer."""
+    simulator.serialize = False
+    simulator.jitter = 0.02
+    client = PipelinedModbusTcpClient("127.0.0.1", simulator.port, timeout=5, window=8)
+    try:
+        assert await client.connect()
+        results = await asyncio.gather(*(client.read_input_registers(address, count=1, device_id=1) for address in ADDRESSES))
+    finally:
+        client.close()
+
+    unit = simulator.units[1]
+    assert [result.registers for result in results] == [unit.read("input", address, 1) for address in ADDRESSES]
+    assert simulator.connection_count == 1
+
+
+async def test_exception_responses(simulator: WT16Simulator) -> None:
+    """Exception responses carry their code and do not disturb other requests."""
+    simulator.serialize = False
+    simulator.units[1].missing = parse_ranges("input:38")
+    client = PipelinedModbusTcpClient("127.0.0.1", simulator.port, timeout=5, window=4)
+    try:
+        assert await client.connect()
+        rejected, answered, absent = await asyncio.gather(
+            client.read_input_registers(38, count=1, device_id=1),
+            client.read_input_registers(37, count=1, device_id=1),
+            client.read_input_registers(37, count=1, device_id=9),
+        )
+    finally:
+        client.close()
+
+    assert rejected.isError()
+    assert rejected.exception_code == ILLEGAL_DATA_ADDRESS
+    assert not answered.isError()
+    assert absent.exception_code == GATEWAY_TARGET_FAILED
+
+
+async def test_lost_connection_fails_requests_in_flight(simulator: WT16Simulator) -> None:
+    """Requests in flight fail with ConnectionError when the gateway drops the connection."""
+    simulator.serialize = False
+    simulator.latency = 0.5
+    client = PipelinedModbusTcpClient("127.0.0.1", simulator.port, timeout=5, window=4)
+    try:
+        assert await client.connect()
+        requests = [asyncio.ensure_future(client.read_input_registers(address, count=1, device_id=1)) for address in ADDRESSES[:3]]
+        await asyncio.sleep(0.1)
+        await simulator.stop()
+        results = await asyncio.gather(*requests, return_exceptions=True)
+    finally:
+        client.close()
+
+    assert all(isinstance(result, ConnectionError) for result in results)
+    assert not client.connected
+
@@ -0,0 +1,73 @@
+"""Tests for the quarantine of registers the unit keeps rejecting."""
+
+from __future__ import annotations
+
+from custom_components.weider_wt16.quarantine import QUARANTINE_THRESHOLD, REPROBE_BASE_DELAY, REPROBE_MAX_DELAY, RegisterQuarantine
+
+KEY = "wp1_sauggas_evi_temperatur"
+
+
+def _quarantine(now: float = 0.0) -> RegisterQuarantine:
+    """Return a quarantine holding KEY, quarantined at now."""
+    quarantine = RegisterQuarantine()
+    for _ in range(QUARANTINE_THRESHOLD):
+        quarantine.record_failure(KEY, now)
+    return quarantine
+
+
+def test_quarantined_after_threshold() -> None:
+    """A field is only skipped after the threshold of rejected polls."""
+    quarantine = RegisterQuarantine()
+    for _ in range(QUARANTINE_THRESHOLD - 1):
+        quarantine.record_failure(KEY, 0.0)
+
+    assert quarantine
+    assert not quarantine.quarantined
+
+    quarantine.record_failure(KEY, 0.0)
+
+    assert quarantine.quarantined == {KEY}
+    assert quarantine.excluded(1.0) == {KEY}
+
+
+def test_reprobe_due_after_delay() -> None:
+    """A quarantined field is read again once its probe is due."""
+    quarantine = _quarantine()
+
+    assert quarantine.excluded(REPROBE_BASE_DELAY - 1) == {KEY}
+    assert not quarantine.excluded(REPROBE_BASE_DELAY)
+    # Still quarantined while the probe is pending, its value stays unknown
+    assert quarantine.quarantined == {KEY}
+
+
+def test_reprobe_delay_doubles_up_to_maximum() -> None:
+    """Every failed probe doubles the delay up to the maximum."""
+    quarantine = _quarantine()
+
+    now = float(REPROBE_BASE_DELAY)
+    quarantine.record_failure(KEY, now)
+    assert quarantine.as_dict(now)[KEY]["probe_delay"] == 2 * REPROBE_BASE_DELAY
+
+    for _ in range(20):
+        quarantine.record_failure(KEY, now)
+    assert quarantine.as_dict(now)[KEY]["probe_delay"] == REPROBE_MAX_DELAY
+    assert quarantine.as_dict(now)[KEY]["next_probe_in"] == REPROBE_MAX_DELAY
+
+
+def test_read_releases_field() -> None:
+    """A successful read releases the field and resets its failures."""
+    quarantine = _quarantine()
+
+    quarantine.record_read({KEY: 21.5, "raum_ist_temperatur": 20.0})
+
+    assert not quarantine
+    assert not quarantine.excluded(0.0)
+
+
+def test_read_of_other_fields_keeps_quarantine() -> None:
+    """Reads of other fields do not release a quarantined one."""
+    quarantine = _quarantine()
+
+    quarantine.record_read({"raum_ist_temperatur": 20.0})
+
+    assert quarantine.quarantined == {KEY}
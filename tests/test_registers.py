@@ -0,0 +1,98 @@
+"""Tests for the block read planning of the Weider WT16 register map."""
+
+from __future__ import annotations
+
+from custom_components.weider_wt16.registers import (
+    ReadPlanner,
+    decode_block,
+    field_addresses,
+    field_spans,
+    plan_block_reads,
+    span_block,
+    split_block,
+)
+
+# EVI registers missing on units without vapour injection
+EVI_KEYS = frozenset(
+    {
+        "wp1_sauggas_evi_temperatur",
+        "wp1_verdampfungstemperatur_evi",
+        "wp1_verfluessigungstemperatur_evi",
+        "wp1_verfluessigungsdruck_evi",
+        "wp1_ueberhitzung_evi",
+    }
+)
+
+
+def test_plan_merges_spans_within_gap() -> None:
+    """Spans up to max_gap apart share a block, wider gaps start a new one."""
+    blocks = plan_block_reads("input", [(12, 1), (13, 1), (25, 1), (60164, 2)], max_gap=11)
+
+    assert [(block.address, block.count) for block in blocks] == [(12, 14), (60164, 2)]
+
+
+def test_plan_respects_protocol_limit() -> None:
+    """A block never exceeds the register count of one request."""
+    blocks = plan_block_reads("input", [(0, 1), (124, 1), (125, 1)], max_gap=200)
+
+    assert [(block.address, block.count) for block in blocks] == [(0, 125), (125, 1)]
+
+
+def test_plan_does_not_bridge_holes() -> None:
+    """Unsupported addresses are never covered by a merged block."""
+    holes = field_addresses(EVI_KEYS)["input"]
+    spans = field_spans("input", exclude=EVI_KEYS)
+
+    blocks = plan_block_reads("input", spans, max_gap=10, holes=holes)
+
+    assert not any(block.address <= hole < block.address + block.count for block in blocks for hole in holes)
+
+
+def test_split_block_at_widest_gap() -> None:
+    """A rejected block is split where the unused gap is widest."""
+    block = plan_block_reads("input", [(12, 1), (13, 1), (20, 1), (21, 1)], max_gap=10)[0]
+
+    assert [(part.address, part.count) for part in split_block(block)] == [(12, 2), (20, 2)]
+    assert split_block(span_block("input", 12)) == []
+
+
+def test_planner_remembers_rejected_blocks() -> None:
+    """Later plans of the same spans use the split parts."""
+    planner = ReadPlanner(10)
+    spans = [(12, 1), (13, 1), (20, 1)]
+    block = planner.plan("input", spans)[0]
+
+    parts = planner.reject(block)
+
+    assert planner.plan("input", spans) == parts
+    planner.reset()
+    assert planner.plan("input", spans) == [block]
+
+
+def test_planner_plans_per_holes() -> None:
+    """Plans follow the current holes, plans for earlier holes stay cached."""
+    planner = ReadPlanner(10)
+    spans = [(12, 1), (13, 1), (20, 1)]
+    block = planner.plan("input", spans)[0]
+    parts = planner.reject(block)
+
+    planner.holes = {"input": frozenset({15})}
+    assert [(part.address, part.count) for part in planner.plan("input", spans)] == [(12, 2), (20, 1)]
+
+    planner.holes = {}
+    assert planner.plan("input", spans) == parts
+
+
+def test_decode_block_with_gaps() -> None:
+    """A block decodes every field it covers, with scaling and signs."""
+    block = plan_block_reads("input", [(12, 1), (15, 1), (44, 1)], max_gap=40)[0]
+    raw = [0] * block.count
+    raw[0] = 214
+    raw[3] = 0xFFCE  # -5.0 degrees
+    raw[32] = 23
+
+    data = decode_block(block, raw)
+
+    assert data["raum_ist_temperatur"] == 21.4
+    assert data["aussentemperatur"] == -5.0
+    assert data["wp1_volumenstrom"] == 23
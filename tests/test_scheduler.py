@@ -0,0 +1,97 @@
+"""Tests for the poll scheduler and circuit breaker."""
+
+from __future__ import annotations
+
+from custom_components.weider_wt16.scheduler import (
+    CIRCUIT_BREAKER_THRESHOLD,
+    IDLE_BACKOFF_FACTOR,
+    PROBE_BASE_DELAY,
+    PROBE_MAX_DELAY,
+    CircuitBreaker,
+    PollScheduler,
+)
+
+INTERVALS = {"fast": 20, "normal": 60, "slow": 300, "fault": 3600}
+
+
+def test_all_tiers_due_at_start() -> None:
+    """Every tier is due before it was read once."""
+    scheduler = PollScheduler(INTERVALS, 10, 120)
+
+    assert scheduler.due_tiers(0.0) == set(INTERVALS)
+
+
+def test_tiers_due_after_their_interval() -> None:
+    """A tier is due again once its interval has elapsed, within half a tick."""
+    scheduler = PollScheduler(INTERVALS, 10, 120)
+    scheduler.mark_read(set(INTERVALS), 0.0)
+
+    assert scheduler.due_tiers(10.0) == {"fast"}
+    assert scheduler.due_tiers(55.0) == {"fast", "normal"}
+
+
+def test_forced_tier_due_until_read() -> None:
+    """A forced tier stays due until it was read."""
+    scheduler = PollScheduler(INTERVALS, 10, 120)
+    scheduler.mark_read(set(INTERVALS), 0.0)
+    scheduler.forced_tiers.add("fault")
+
+    assert "fault" in scheduler.due_tiers(1.0)
+    scheduler.mark_read({"fault"}, 1.0)
+    assert "fault" not in scheduler.due_tiers(2.0)
+
+
+def test_fast_tier_adapts_to_activity() -> None:
+    """The fast tier polls at the minimum while running and backs off while idle."""
+    scheduler = PollScheduler(INTERVALS, 10, 120)
+
+    scheduler.observe({"verdichter_wp1": True}, 0.0)
+    assert scheduler.active
+    assert scheduler.interval("fast") == 10
+
+    # Idle polls start from the configured fast interval
+    scheduler.observe({"verdichter_wp1": False}, 10.0)
+    assert not scheduler.active
+    assert scheduler.interval("fast") == 20
+
+    scheduler.observe({"verdichter_wp1": False}, 20.0)
+    assert scheduler.interval("fast") == 20 * IDLE_BACKOFF_FACTOR
+
+
+def test_fast_tier_not_slower_than_normal() -> None:
+    """Backing off stops at the longest fast interval and at the normal tier interval."""
+    scheduler = PollScheduler(INTERVALS, 10, 120)
+    for step in range(20):
+        scheduler.observe({"verdichter_wp1": False}, float(step))
+    assert scheduler.interval("fast") == INTERVALS["normal"]
+
+    scheduler.configure({**INTERVALS, "normal": 300}, 10, 120)
+    for step in range(20):
+        scheduler.observe({"verdichter_wp1": False}, float(step))
+    assert scheduler.interval("fast") == 120
+
+
+def test_breaker_opens_after_threshold() -> None:
+    """The breaker opens after the threshold of failures and closes on success."""
+    breaker = CircuitBreaker()
+    for _ in range(CIRCUIT_BREAKER_THRESHOLD - 1):
+        breaker.record_failure()
+    assert not breaker.is_open
+
+    breaker.record_failure()
+    assert breaker.is_open
+    assert PROBE_BASE_DELAY / 2 <= breaker.retry_delay <= PROBE_BASE_DELAY
+
+    breaker.record_success()
+    assert not breaker.is_open
+    assert breaker.failures == 0
+    assert breaker.retry_delay is None
+
+
+def test_breaker_backoff_is_bounded() -> None:
+    """Probe delays grow up to the maximum, with jitter of at most half of it."""
+    breaker = CircuitBreaker()
+    for _ in range(CIRCUIT_BREAKER_THRESHOLD + 20):
+        breaker.record_failure()
+
+    assert PROBE_MAX_DELAY / 2 <= breaker.retry_delay <= PROBE_MAX_DELAY
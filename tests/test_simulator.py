@@ -0,0 +1,27 @@
+"""Tests for the WT16 Modbus simulator."""
+
+from __future__ import annotations
+
+import pytest
+from wt16_simulator import ILLEGAL_DATA_ADDRESS, SLAVE_DEVICE_BUSY, build_simulator, parse_ranges
+
+
+def test_missing_ranges_per_register_type() -> None:
+    """Simulated missing ranges only apply to their register type."""
+    assert parse_ranges("input:38-40,holding:723") == {"input": {38, 39, 40}, "holding": {723}}
+    with pytest.raises(ValueError):
+        parse_ranges("38-46")
+
+    unit = build_simulator(missing="input:38-46").units[1]
+    assert unit.exception_code("input", 44, 1) == ILLEGAL_DATA_ADDRESS
+    # The flow switch at discrete 45 is unaffected by the input register range
+    assert unit.exception_code("discrete", 45, 1) is None
+
+
+def test_busy_ranges() -> None:
+    """Busy ranges are answered with a device busy exception, missing ones take precedence."""
+    unit = build_simulator(missing="holding:723", busy="holding:720-725").units[1]
+
+    assert unit.exception_code("holding", 720, 2) == SLAVE_DEVICE_BUSY
+    assert unit.exception_code("holding", 722, 2) == ILLEGAL_DATA_ADDRESS
+    assert unit.exception_code("holding", 1, 1) is None